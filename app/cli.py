@@ -0,0 +1,362 @@
+"""
+Command line maintenance tasks for the InventoLee database.
+
+Usage:
+    python -m app.cli [--db PATH] <command>
+
+Commands:
+    rebuild-rollup   Recompute the daily sales rollup from the sales table
+    check-rollup     Report days/items where the rollup disagrees with the sales table
+    import-items     Bulk import inventory items from a CSV file
+    import-sales     Bulk import historic sales from a CSV file
+    export           Export sales, inventory or the sales summary to CSV/XLSX/Parquet
+    report           Write the PDF sales report for a date range
+    snapshot-stock   Take the missing month-end stock snapshots (or one for --date)
+    reconcile-stock  Report items whose quantity disagrees with the stock ledger or the sales
+    valuation        Print the stock value, in total, per category or per item, as of a date
+    stock            Print stock on hand as of a date, or an item's ledger
+    archive-sales    Move the sales of closed fiscal years into per-year archive files
+    list-archives    List the archived fiscal years
+    backup           Take a verified snapshot of the database while it stays in use
+    list-backups     List the snapshots, newest first
+    verify-backup    Check a snapshot for corruption
+    restore          Replace the database's contents with a snapshot
+"""
+import argparse
+import sys
+from datetime import date
+
+from app import db
+
+
+def cmd_rebuild_rollup(args):
+    from app.models.sales import rebuild_sales_rollup
+    rows = rebuild_sales_rollup()
+    print(f"Rebuilt sales_daily_rollup: {rows} day/item rows")
+    return 0
+
+
+def cmd_check_rollup(args):
+    from app.models.sales import check_sales_rollup
+    problems = check_sales_rollup()
+    if not problems:
+        print("sales_daily_rollup is consistent with the sales table")
+        return 0
+    print(f"{len(problems)} inconsistent rollup rows:")
+    for problem, day, item_id, revenue, profit, units, count in problems:
+        print(f"  {problem:<10} {day} item {item_id}: revenue={revenue} profit={profit} "
+              f"units={units} sales={count}")
+    print("Run 'python -m app.cli rebuild-rollup' to repair it.")
+    return 1
+
+
+def _run_import(args, import_csv):
+    from app.models.importer import default_rejects_path
+
+    def progress(rows, fraction):
+        print(f"\r  {rows} rows read ({fraction:.0%})", end="", file=sys.stderr, flush=True)
+
+    rejects_path = args.rejects or default_rejects_path(args.csv)
+    try:
+        result = import_csv(args.csv, rejects_path=rejects_path, batch_size=args.batch,
+                            progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"\nImport failed: {e}", file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(f"Read {result.rows_read} rows in {result.seconds:.2f}s "
+          f"({result.rows_per_second:.0f} rows/s): {result.inserted} inserted, "
+          f"{result.merged} merged, {result.rejected} rejected")
+    for line, error in result.rejects[:10]:
+        print(f"  line {line}: {error}")
+    if result.rejects_path:
+        print(f"Rejected rows were written to {result.rejects_path}")
+    return 1 if result.rejected else 0
+
+
+def cmd_import_items(args):
+    from app.models.importer import import_items_csv
+    return _run_import(args, import_items_csv)
+
+
+def cmd_import_sales(args):
+    from app.models.importer import import_sales_csv
+    return _run_import(args, import_sales_csv)
+
+
+def cmd_export(args):
+    from app.utils import export
+
+    def progress(rows, fraction):
+        print(f"\r  {rows} rows written", end="", file=sys.stderr, flush=True)
+
+    try:
+        if args.what == "sales":
+            rows = export.export_sales(args.path, args.start, args.end, progress=progress)
+        elif args.what == "inventory":
+            rows = export.export_inventory(args.path, progress=progress)
+        else:
+            rows = export.export_summary(args.path, args.period, args.start, args.end,
+                                         progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"\nExport failed: {e}", file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(f"Exported {rows} rows to {args.path}")
+    return 0
+
+
+def cmd_report(args):
+    from app.models.reports import build_sales_report
+
+    def progress(rows, fraction):
+        print(f"\r  {rows} ledger rows laid out", end="", file=sys.stderr, flush=True)
+
+    result = build_sales_report(args.path, args.period, args.start, args.end,
+                                include_ledger=not args.no_ledger, progress=progress)
+    print(file=sys.stderr)
+    print(f"Wrote {result['pages']} pages to {args.path} in {result['seconds']:.1f}s")
+    return 0
+
+
+def cmd_snapshot_stock(args):
+    from app.models.stock import refresh_stock_snapshots, take_stock_snapshot
+    if args.date:
+        items = take_stock_snapshot(args.date)
+        print(f"Snapshot of {args.date}: {items} items in stock")
+        return 0
+    taken = refresh_stock_snapshots()
+    if taken:
+        print(f"Took {len(taken)} snapshots: {', '.join(taken)}")
+    else:
+        print("Stock snapshots are up to date")
+    return 0
+
+
+def cmd_reconcile_stock(args):
+    from app.models.valuation import reconcile_stock
+    problems = reconcile_stock()
+    if not problems:
+        print("Item quantities are consistent with the stock ledger and the sales")
+        return 0
+    print(f"{len(problems)} items do not reconcile:")
+    for item_id, name, quantity, balance, ledger_sold, sales_sold in problems:
+        print(f"  item {item_id} ({name or 'deleted'}): quantity={quantity} ledger={balance} "
+              f"sold per ledger={ledger_sold} sold per sales={sales_sold}")
+    return 1
+
+
+def cmd_valuation(args):
+    from app.models.valuation import (get_stock_valuation, get_stock_value_by_category,
+                                      get_stock_value_totals)
+    if args.by == "item":
+        for item_id, name, category, size, quantity, price, value in get_stock_valuation(args.as_of):
+            print(f"{item_id}\t{name}\t{size}\t{quantity}\t{price:.2f}\t{value:.2f}")
+    elif args.by == "category":
+        for category, items, units, value in get_stock_value_by_category(args.as_of):
+            print(f"{category or '(none)'}\t{items}\t{units}\t{value:.2f}")
+    items, units, value = get_stock_value_totals(args.as_of)
+    print(f"Stock value{' at the end of ' + args.as_of if args.as_of else ''}: {value:.2f} "
+          f"({units} units of {items} items)")
+    return 0
+
+
+def cmd_stock(args):
+    from app.models.stock import get_stock_as_of, get_stock_ledger
+    if args.item is None:
+        balances = get_stock_as_of(args.as_of)
+        for item_id, quantity in balances:
+            print(f"{item_id}\t{quantity}")
+        print(f"{len(balances)} items, {sum(q for _, q in balances)} units in stock at the end of "
+              f"{args.as_of}", file=sys.stderr)
+        return 0
+    for entry_id, day, kind, quantity, reason, balance in get_stock_ledger(args.item, args.start,
+                                                                           args.as_of):
+        print(f"{day}\t{kind}\t{quantity}\t{balance}\t{reason}")
+    return 0
+
+
+def cmd_archive_sales(args):
+    from app.models.archive import archive_sales_year, closed_years_with_live_sales
+    years = args.years or closed_years_with_live_sales()
+    if not years:
+        print("No closed fiscal year has sales left in the live database")
+        return 0
+    for year in years:
+        try:
+            moved = archive_sales_year(year)
+        except ValueError as e:
+            print(f"Cannot archive {year}: {e}", file=sys.stderr)
+            return 2
+        print(f"Archived {moved} sales of {year}")
+    if args.vacuum:
+        # Gives the freed pages back to the file system
+        db.get_connection().execute("VACUUM")
+        print(f"Vacuumed {db.get_db_path()}")
+    return 0
+
+
+def cmd_list_archives(args):
+    from app.models.archive import get_sales_archives
+    archives = get_sales_archives()
+    if not archives:
+        print("No archived fiscal years")
+    for year, path, first_day, last_day, sales, archived_at in archives:
+        print(f"{year}\t{first_day}..{last_day}\t{sales} sales\t{path}\t(archived {archived_at})")
+    return 0
+
+
+def cmd_backup(args):
+    from app.models.backup import backup_database
+
+    def progress(pages, fraction):
+        print(f"\r  {pages} pages copied ({fraction:.0%})", end="", file=sys.stderr, flush=True)
+
+    try:
+        result = backup_database(args.dir, keep=args.keep, pages=args.pages, progress=progress)
+    except (OSError, ValueError) as e:
+        print(f"\nBackup failed: {e}", file=sys.stderr)
+        return 2
+    print(file=sys.stderr)
+    print(f"Wrote {result.path} ({result.size / 1e6:.1f} MB, {result.pages} pages) "
+          f"in {result.seconds:.1f}s")
+    for path in result.removed:
+        print(f"Removed old snapshot {path}")
+    return 0
+
+
+def cmd_list_backups(args):
+    from app.models.backup import backup_dir, list_backups
+    backups = list_backups(args.dir)
+    if not backups:
+        print(f"No snapshots in {backup_dir(args.dir)}")
+    for path, created, size in backups:
+        print(f"{created:%Y-%m-%d %H:%M:%S}\t{size / 1e6:.1f} MB\t{path}")
+    return 0
+
+
+def cmd_verify_backup(args):
+    from app.models.backup import verify_backup
+    problems = verify_backup(args.path, quick=args.quick)
+    if not problems:
+        print(f"{args.path} is sound")
+        return 0
+    print(f"{args.path} failed verification:")
+    for problem in problems[:20]:
+        print(f"  {problem}")
+    return 1
+
+
+def cmd_restore(args):
+    from app.models.backup import restore_database
+    try:
+        safety = restore_database(args.path, backup_first=not args.no_backup)
+    except (OSError, ValueError) as e:
+        print(f"Restore failed: {e}", file=sys.stderr)
+        return 2
+    if safety:
+        print(f"The previous contents were saved to {safety}")
+    print(f"Restored {db.get_db_path()} from {args.path}")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m app.cli",
+                                     description="InventoLee database maintenance")
+    parser.add_argument("--db", help="Path of the database file (default: %(default)s)",
+                        default=db.get_db_path())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("rebuild-rollup", help="Recompute the daily sales rollup"
+                        ).set_defaults(func=cmd_rebuild_rollup)
+    commands.add_parser("check-rollup", help="Check the daily sales rollup against the sales table"
+                        ).set_defaults(func=cmd_check_rollup)
+    for name, func, what in (("import-items", cmd_import_items, "inventory items"),
+                             ("import-sales", cmd_import_sales, "historic sales")):
+        command = commands.add_parser(name, help=f"Bulk import {what} from a CSV file")
+        command.add_argument("csv", help="CSV file with a header row")
+        command.add_argument("--rejects", help="Where to write rejected rows "
+                             "(default: <csv>.rejects.csv, only created when rows are rejected)")
+        command.add_argument("--batch", type=int, default=10000, help="Rows per transaction")
+        command.set_defaults(func=func)
+
+    command = commands.add_parser("export", help="Export data to a .csv, .xlsx or .parquet file")
+    command.add_argument("what", choices=("sales", "inventory", "summary"))
+    command.add_argument("path", help="Output file; the extension selects the format")
+    command.add_argument("--start", help="First date (YYYY-MM-DD) for sales and summary")
+    command.add_argument("--end", help="Last date (YYYY-MM-DD) for sales and summary")
+    command.add_argument("--period", choices=("daily", "weekly", "monthly"), default="daily",
+                         help="Summary period (default: %(default)s)")
+    command.set_defaults(func=cmd_export)
+
+    command = commands.add_parser("report", help="Write the PDF sales report")
+    command.add_argument("path", help="Output PDF file")
+    command.add_argument("--start", help="First date (YYYY-MM-DD)")
+    command.add_argument("--end", help="Last date (YYYY-MM-DD)")
+    command.add_argument("--period", choices=("daily", "weekly", "monthly"), default="monthly",
+                         help="Summary period (default: %(default)s)")
+    command.add_argument("--no-ledger", action="store_true", help="Leave out the sales ledger")
+    command.set_defaults(func=cmd_report)
+
+    command = commands.add_parser("snapshot-stock", help="Take the missing month-end stock snapshots")
+    command.add_argument("--date", help="Take (or retake) the snapshot of this date (YYYY-MM-DD) instead")
+    command.set_defaults(func=cmd_snapshot_stock)
+    commands.add_parser("reconcile-stock", help="Check item quantities against the stock ledger and sales"
+                        ).set_defaults(func=cmd_reconcile_stock)
+    command = commands.add_parser("valuation", help="Value the stock at item prices")
+    command.add_argument("--as-of", help="Value the stock on hand at the end of this date (YYYY-MM-DD) "
+                         "(default: current quantities)")
+    command.add_argument("--by", choices=("total", "category", "item"), default="total",
+                         help="Breakdown (default: %(default)s)")
+    command.set_defaults(func=cmd_valuation)
+    command = commands.add_parser("stock", help="Stock on hand as of a date, or an item's ledger")
+    command.add_argument("--as-of", default=date.today().isoformat(),
+                         help="Last date (YYYY-MM-DD) (default: today)")
+    command.add_argument("--item", type=int, help="Print this item's ledger up to --as-of instead")
+    command.add_argument("--start", help="First date (YYYY-MM-DD) of the item's ledger")
+    command.set_defaults(func=cmd_stock)
+
+    command = commands.add_parser("archive-sales", help="Move closed fiscal years' sales to archive files")
+    command.add_argument("years", nargs="*", type=int,
+                         help="Fiscal years to archive (default: every closed year with live sales)")
+    command.add_argument("--vacuum", action="store_true", help="Shrink the live database file afterwards")
+    command.set_defaults(func=cmd_archive_sales)
+    commands.add_parser("list-archives", help="List the archived fiscal years"
+                        ).set_defaults(func=cmd_list_archives)
+
+    from app.models.backup import BACKUP_DIR, KEEP_BACKUPS, PAGES_PER_STEP
+    command = commands.add_parser("backup", help="Take a verified snapshot of the database")
+    command.add_argument("--dir", help="Snapshot directory, relative to the database's "
+                         f"(default: {BACKUP_DIR})")
+    command.add_argument("--keep", type=int, default=KEEP_BACKUPS, help="Snapshots to keep (default: %(default)s)")
+    command.add_argument("--pages", type=int, default=PAGES_PER_STEP,
+                         help="Pages copied per step, -1 for all at once (default: %(default)s)")
+    command.set_defaults(func=cmd_backup)
+    command = commands.add_parser("list-backups", help="List the snapshots of the database")
+    command.add_argument("--dir", help=f"Snapshot directory (default: {BACKUP_DIR})")
+    command.set_defaults(func=cmd_list_backups)
+    command = commands.add_parser("verify-backup", help="Check a snapshot for corruption")
+    command.add_argument("path", help="Snapshot file")
+    command.add_argument("--quick", action="store_true", help="Skip checking the index contents")
+    command.set_defaults(func=cmd_verify_backup)
+    command = commands.add_parser("restore", help="Replace the database's contents with a snapshot "
+                                  "(close the app first)")
+    command.add_argument("path", help="Snapshot file")
+    command.add_argument("--no-backup", action="store_true",
+                         help="Do not snapshot the current contents first")
+    command.set_defaults(func=cmd_restore)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    db.set_db_path(args.db)
+    db.init_db()
+    try:
+        return args.func(args)
+    finally:
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,12 +1,339 @@
+import functools
+import os
+import random
 import sqlite3
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 
+# Path to the SQLite database file. Defaults to "inventory.db" in the working
+# directory and can be overridden with the INVENTOLEE_DB environment variable
+# or at runtime with set_db_path().
+DB_PATH = os.environ.get("INVENTOLEE_DB", "inventory.db")
+
+# Each thread gets its own connection, opened on first use and reused for
+# every model call made from that thread afterwards. Connections are keyed by
+# threading.get_ident() rather than kept in a threading.local: threads Python
+# did not start (Qt's thread pool) get fresh thread-local state for every task
+# they run, but keep their thread ID.
+_local = threading.local()
+_registry_lock = threading.Lock()
+_connections = {}  # thread ID -> (weakref to owning thread, connection)
+_last_write = 0.0  # time.monotonic() of the most recent committed write
+
+# Pragmas applied to every connection when it is opened. WAL lets the Sales
+# Book read while the till writes, and synchronous=NORMAL only fsyncs at
+# checkpoints instead of on every commit. Automatic checkpoints are pushed
+# out so the CheckpointScheduler can do that work while the app is idle.
+PERFORMANCE_PROFILE = {
+    "busy_timeout": 5000,            # ms to wait on a locked database
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -16000,            # negative means KiB, i.e. 16 MB page cache
+    "mmap_size": 256 * 1024 * 1024,  # bytes of the file to memory-map
+    "temp_store": "MEMORY",
+    "wal_autocheckpoint": 4000,      # pages; fallback if the scheduler is not running
+}
+
+# Prepared statements kept per connection (sqlite3's cached_statements, an LRU
+# keyed by SQL text). Values are bound rather than formatted into the SQL, so
+# the models issue a fixed set of statements, each prepared once per
+# connection. sqlite3's default of 128 already holds the hot paths' set
+# (benchmarks/statement_cache.py measures no difference at 256); the larger
+# size leaves room for the variants each archived year adds to the date
+# filtered queries.
+STATEMENT_CACHE_SIZE = 256
+
+
+def apply_performance_profile(conn, profile=None):
+    """
+    Applies the pragmas in profile (PERFORMANCE_PROFILE by default) to conn.
+    Entries whose value is None are skipped.
+    """
+    profile = PERFORMANCE_PROFILE if profile is None else profile
+    for pragma, value in profile.items():
+        if value is not None:
+            conn.execute(f"PRAGMA {pragma}={value}")
+
+
+def set_performance_profile(**pragmas):
+    """
+    Overrides entries of PERFORMANCE_PROFILE, e.g. set_performance_profile(synchronous="FULL").
+
+    Existing connections are closed so the new settings apply to every
+    connection opened afterwards.
+    """
+    PERFORMANCE_PROFILE.update(pragmas)
+    close_all_connections()
+
+
+def _open_connection(path):
+    """
+    Opens a new connection to the database at the given path and applies the
+    performance profile.
+
+    The connection is opened in autocommit mode (isolation_level=None) so that
+    transactions are only started explicitly by transaction(), with a
+    statement cache of STATEMENT_CACHE_SIZE. It is created
+    with check_same_thread=False only so close_all_connections() can close it
+    from another thread at shutdown; it is never shared for queries.
+    """
+    conn = sqlite3.connect(path, isolation_level=None, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    apply_performance_profile(conn)
+    return conn
+
+
+def _prune_registry():
+    """
+    Closes connections whose owning thread has exited. Caller holds the lock.
+
+    Threads Python did not start always look alive; their connections are
+    closed by close_all_connections(), or taken over by the next thread that
+    gets the same ID.
+    """
+    for ident, (thread_ref, conn) in list(_connections.items()):
+        thread = thread_ref()
+        if thread is None or not thread.is_alive():
+            conn.close()
+            del _connections[ident]
+
+
+def get_db_path():
+    """Returns the path of the database the connection manager points at."""
+    return DB_PATH
+
+
+def set_db_path(path):
+    """
+    Points the connection manager at a different database file.
+
+    Every existing connection is closed; threads transparently reopen against
+    the new path on their next call to get_connection().
+    """
+    global DB_PATH
+    with _registry_lock:
+        DB_PATH = path
+    close_all_connections()
+
+
+def get_connection():
+    """
+    Returns the calling thread's connection to the database, opening it on
+    first use. The same connection is reused for all subsequent calls from
+    that thread, so model functions no longer pay for a connect (and schema
+    parse) per call.
+    """
+    entry = _connections.get(threading.get_ident())
+    if entry is not None and entry[0]() is threading.current_thread():
+        return entry[1]
+
+    with _registry_lock:
+        _prune_registry()
+        ident = threading.get_ident()
+        entry = _connections.get(ident)
+        # A thread with a connection under its ID has exited (or is a new
+        # Python-side object for the same thread): the connection is idle
+        conn = entry[1] if entry is not None else _open_connection(DB_PATH)
+        _connections[ident] = (weakref.ref(threading.current_thread()), conn)
+    return conn
+
+
+def close_connection():
+    """Closes the calling thread's connection, if it has one."""
+    with _registry_lock:
+        entry = _connections.pop(threading.get_ident(), None)
+    if entry is not None:
+        entry[1].close()
+
+
+def close_all_connections():
+    """
+    Closes every connection opened by the connection manager, in all threads.
+
+    Intended for shutdown and for switching databases; threads reopen a fresh
+    connection the next time they call get_connection().
+    """
+    with _registry_lock:
+        for _, conn in _connections.values():
+            conn.close()
+        _connections.clear()
+
+
+@contextmanager
+def transaction(immediate=False):
+    """
+    Context manager running the enclosed statements in a single transaction
+    on the calling thread's connection.
+
+    Yields a cursor. The transaction is committed when the block exits normally
+    and rolled back if it raises. Nested use joins the outer transaction, so
+    model functions can be composed without committing halfway through.
+    With immediate=True the write lock is taken up front (BEGIN IMMEDIATE), so
+    a read-then-write sequence cannot be interleaved with another writer.
+    """
+    conn = get_connection()
+    if conn.in_transaction:
+        yield conn.cursor()
+        return
+
+    global _last_write
+    conn.execute("BEGIN IMMEDIATE" if immediate else "BEGIN")
+    _local.after_commit = []
+    try:
+        yield conn.cursor()
+    except BaseException:
+        _local.after_commit = None
+        conn.rollback()
+        raise
+    else:
+        conn.commit()
+        _last_write = time.monotonic()
+        callbacks, _local.after_commit = _local.after_commit, None
+        for callback in callbacks:
+            callback()
+
+
+def after_commit(callback):
+    """
+    Calls callback() once the calling thread's current transaction commits,
+    or right away if no transaction() is open. Callbacks registered in a
+    transaction that rolls back are dropped, so caches patched this way never
+    see a change that did not happen.
+    """
+    callbacks = getattr(_local, "after_commit", None)
+    if callbacks is None:
+        callback()
+    else:
+        callbacks.append(callback)
+
+
+def _is_busy_error(error):
+    """True if error is SQLite reporting the database as busy or locked."""
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (sqlite3.SQLITE_BUSY, sqlite3.SQLITE_LOCKED)
+    return "locked" in str(error) or "busy" in str(error)
+
+
+def retry_on_busy(retries=5, backoff=0.05):
+    """
+    Decorator retrying a function that runs its own transaction when SQLite
+    reports SQLITE_BUSY/SQLITE_LOCKED, which can still happen past busy_timeout
+    when several processes (e.g. two tills) write to the same file.
+
+    Retries wait with exponential backoff plus jitter, starting at `backoff`
+    seconds. Calls made inside an already open transaction are not retried,
+    since the outer transaction has to be rolled back by its owner.
+    """
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if get_connection().in_transaction:
+                return fn(*args, **kwargs)
+            for attempt in range(retries + 1):
+                try:
+                    return fn(*args, **kwargs)
+                except sqlite3.OperationalError as e:
+                    if attempt == retries or not _is_busy_error(e):
+                        raise
+                    time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+        return wrapper
+    return decorator
+
+
+class CheckpointScheduler:
+    """
+    Background thread that checkpoints the WAL file while the app is idle.
+
+    Every `interval` seconds it checks whether anything was committed since
+    the last checkpoint and, if no write has happened for `idle_seconds`,
+    runs a PASSIVE checkpoint (which never blocks readers or the writer).
+    When the whole WAL made it into the database the file is truncated so it
+    does not keep its high-water size on disk.
+    """
+
+    def __init__(self, interval=30.0, idle_seconds=5.0):
+        self.interval = interval
+        self.idle_seconds = idle_seconds
+        self.last_result = None
+        self._checkpointed_at = 0.0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Starts the scheduler thread if it is not already running."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="wal-checkpoint", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the scheduler thread and runs one final checkpoint."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def checkpoint(self, mode="PASSIVE"):
+        """
+        Runs a checkpoint on the calling thread's connection.
+
+        Returns the (busy, wal_frames, checkpointed_frames) row reported by SQLite.
+        """
+        self.last_result = get_connection().execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        self._checkpointed_at = time.monotonic()
+        return self.last_result
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            idle_for = time.monotonic() - _last_write
+            if _last_write > self._checkpointed_at and idle_for >= self.idle_seconds:
+                self._idle_checkpoint()
+        self._idle_checkpoint()
+        close_connection()
+
+    def _idle_checkpoint(self):
+        # A failed checkpoint (e.g. the file is briefly locked) is simply
+        # retried on the next tick.
+        try:
+            busy, wal_frames, checkpointed = self.checkpoint()
+            if not busy and wal_frames == checkpointed:
+                self.checkpoint("TRUNCATE")
+        except sqlite3.Error:
+            pass
+
+
+_scheduler = None
+
+
+def start_checkpoint_scheduler(interval=30.0, idle_seconds=5.0):
+    """Starts the process-wide CheckpointScheduler and returns it."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CheckpointScheduler(interval, idle_seconds)
+    _scheduler.start()
+    return _scheduler
+
+
+def stop_checkpoint_scheduler():
+    """Stops the process-wide CheckpointScheduler, if running."""
+    global _scheduler
+    if _scheduler is not None:
+        _scheduler.stop()
+        _scheduler = None
+
+
 # Initialize Database
 def init_db():
     """
     Initializes the database by creating the necessary tables if they do not already exist.
 
-    This function connects to a SQLite database named "inventory.db" and creates three tables:
+    This function uses the shared connection to the configured database (see DB_PATH), which
+    switches the file to WAL journaling via PERFORMANCE_PROFILE, and creates three tables:
     1. `clothing_items`: Stores information about clothing items, including their name, category,
        size, color, quantity, price, supplier, expiry date, and additional notes.
     2. `transactions`: Tracks transactions related to clothing items, including the type of transaction
@@ -17,11 +344,16 @@ def init_db():
        total amount, payment method, profit, and any expense notes. This table also has a foreign key
        relationship with the `clothing_items` table.
 
-    After creating the tables, the function commits the changes and closes the database connection.
+    All tables are created in a single transaction, after which any pending schema
+    migrations (see MIGRATIONS) are applied.
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        _create_tables(cursor)
+    migrate()
+
 
+def _create_tables(cursor):
+    """Creates the base tables if they do not already exist."""
     # Create Clothing Items Table
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS clothing_items (
@@ -67,14 +399,302 @@ def init_db():
     );
     """)
 
-    conn.commit()
-    conn.close()
+
+def _merge_duplicate_items(cursor):
+    """
+    Folds clothing items sharing the same (name, description, size) into the
+    lowest ID, summing their quantities and repointing sales and transactions,
+    the same way add_item_to_db merges a re-added item.
+    """
+    cursor.execute("""
+        CREATE TEMP TABLE item_merge AS
+        SELECT i.id AS old_id, k.keep_id
+        FROM clothing_items i
+        JOIN (
+            SELECT name, description, size, MIN(id) AS keep_id
+            FROM clothing_items
+            GROUP BY name, description, size
+            HAVING COUNT(*) > 1
+        ) k ON i.name = k.name AND i.description = k.description AND i.size = k.size
+        WHERE i.id <> k.keep_id
+    """)
+    cursor.execute("""
+        UPDATE clothing_items
+        SET quantity = quantity + (
+            SELECT SUM(d.quantity) FROM clothing_items d
+            JOIN item_merge m ON d.id = m.old_id
+            WHERE m.keep_id = clothing_items.id
+        )
+        WHERE id IN (SELECT keep_id FROM item_merge)
+    """)
+    for table, column in (("sales", "item_id"), ("transactions", "clothing_item_id")):
+        cursor.execute(f"""
+            UPDATE {table}
+            SET {column} = (SELECT keep_id FROM item_merge WHERE old_id = {table}.{column})
+            WHERE {column} IN (SELECT old_id FROM item_merge)
+        """)
+    cursor.execute("DELETE FROM clothing_items WHERE id IN (SELECT old_id FROM item_merge)")
+    cursor.execute("DROP TABLE item_merge")
+
+
+def _add_core_indexes(cursor):
+    """
+    Migration 1: secondary indexes for the hot query paths.
+
+    - sales(date, total_amount, profit): date range filters and ORDER BY date in
+      get_all_sales, and a covering index for the get_summary aggregation.
+    - sales(item_id, date): the sales/clothing_items join and per-item lookups.
+    - transactions(clothing_item_id, transaction_date): per-item history.
+    - UNIQUE clothing_items(name, description, size): the identity add_item_to_db
+      looks up, which also guarantees it stays unique.
+    """
+    _merge_duplicate_items(cursor)
+    cursor.execute("""
+        CREATE UNIQUE INDEX IF NOT EXISTS ux_clothing_items_identity
+        ON clothing_items(name, description, size)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sales_date
+        ON sales(date, total_amount, profit)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_sales_item
+        ON sales(item_id, date)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_item_date
+        ON transactions(clothing_item_id, transaction_date)
+    """)
+
+
+# Per-day, per-item sales totals computed from the sales table. Used to
+# backfill and rebuild sales_daily_rollup and to check it for drift.
+SALES_ROLLUP_SELECT = """
+    SELECT substr(date, 1, 10) AS day,
+           IFNULL(item_id, 0) AS item_id,
+           SUM(total_amount) AS revenue,
+           SUM(IFNULL(profit, 0)) AS profit,
+           SUM(quantity) AS units,
+           COUNT(*) AS sale_count
+    FROM sales
+    GROUP BY day, IFNULL(item_id, 0)
+"""
+
+
+def _add_sales_daily_rollup(cursor):
+    """
+    Migration 2: materialized per-day, per-item sales totals.
+
+    add_sale and the sale deletions keep this table up to date in the same
+    transaction, so summaries aggregate one row per day and item instead of
+    every sale.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sales_daily_rollup (
+            day TEXT NOT NULL,           -- YYYY-MM-DD
+            item_id INTEGER NOT NULL,
+            revenue REAL NOT NULL DEFAULT 0,
+            profit REAL NOT NULL DEFAULT 0,
+            units INTEGER NOT NULL DEFAULT 0,
+            sale_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, item_id)
+        ) WITHOUT ROWID
+    """)
+    fill_sales_rollup(cursor)
+
+
+def fill_sales_rollup(cursor):
+    """
+    Recomputes sales_daily_rollup from the sales table inside the caller's
+    transaction. Returns the number of rollup rows written.
+    """
+    cursor.execute("DELETE FROM sales_daily_rollup")
+    cursor.execute("""
+        INSERT INTO sales_daily_rollup (day, item_id, revenue, profit, units, sale_count)
+    """ + SALES_ROLLUP_SELECT)
+    return cursor.rowcount
+
+
+def _add_item_search_index(cursor):
+    """
+    Migration 3: FTS5 full-text index over the descriptive item columns.
+
+    clothing_items_fts is an external-content table: it stores only the index
+    and reads the text from clothing_items, keyed by rowid = item ID. Triggers
+    keep it in step with every insert, delete and change of an indexed column
+    (quantity updates from sales do not touch it). Prefix indexes for 1 to 3
+    characters make search-as-you-type prefix queries cheap.
+    """
+    cursor.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS clothing_items_fts USING fts5(
+            name, category, description, supplier, notes,
+            content='clothing_items', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='1 2 3'
+        )
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS clothing_items_fts_insert AFTER INSERT ON clothing_items BEGIN
+            INSERT INTO clothing_items_fts (rowid, name, category, description, supplier, notes)
+            VALUES (new.id, new.name, new.category, new.description, new.supplier, new.notes);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS clothing_items_fts_delete AFTER DELETE ON clothing_items BEGIN
+            INSERT INTO clothing_items_fts (clothing_items_fts, rowid, name, category, description, supplier, notes)
+            VALUES ('delete', old.id, old.name, old.category, old.description, old.supplier, old.notes);
+        END
+    """)
+    cursor.execute("""
+        CREATE TRIGGER IF NOT EXISTS clothing_items_fts_update
+        AFTER UPDATE OF name, category, description, supplier, notes ON clothing_items BEGIN
+            INSERT INTO clothing_items_fts (clothing_items_fts, rowid, name, category, description, supplier, notes)
+            VALUES ('delete', old.id, old.name, old.category, old.description, old.supplier, old.notes);
+            INSERT INTO clothing_items_fts (rowid, name, category, description, supplier, notes)
+            VALUES (new.id, new.name, new.category, new.description, new.supplier, new.notes);
+        END
+    """)
+    # Index the items that already exist
+    cursor.execute("INSERT INTO clothing_items_fts (clothing_items_fts) VALUES ('rebuild')")
+
+
+def _add_stock_ledger(cursor):
+    """
+    Migration 4: the transactions table becomes the stock movement ledger.
+
+    - transactions(clothing_item_id, transaction_date, ...) replaces the per-item
+      history index with a covering one, so balances and the ledger of an item
+      are read from the index alone.
+    - transactions(transaction_date, ...): the entries of a date range, for
+      stock on hand of every item as of a date.
+    - stock_snapshots: per-item balances at the end of a snapshot date.
+
+    Quantities were changed without ledger entries until now, so every item
+    whose ledger does not add up to its quantity gets an 'Opening balance'
+    entry dated today.
+    """
+    cursor.execute("DROP INDEX IF EXISTS idx_transactions_item_date")
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_item_date
+        ON transactions(clothing_item_id, transaction_date, transaction_type, quantity)
+    """)
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_date
+        ON transactions(transaction_date, clothing_item_id, transaction_type, quantity)
+    """)
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS stock_snapshots (
+            snapshot_date TEXT NOT NULL,  -- YYYY-MM-DD, balance at the end of that day
+            item_id INTEGER NOT NULL,
+            quantity INTEGER NOT NULL,
+            PRIMARY KEY (snapshot_date, item_id)
+        ) WITHOUT ROWID
+    """)
+    cursor.execute("""
+        INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
+        SELECT id, CASE WHEN difference > 0 THEN 'in' ELSE 'out' END, ABS(difference), ?, 'Opening balance'
+        FROM (
+            SELECT i.id, IFNULL(i.quantity, 0) - IFNULL(l.balance, 0) AS difference
+            FROM clothing_items i
+            LEFT JOIN (
+                SELECT clothing_item_id,
+                       SUM(CASE transaction_type WHEN 'in' THEN quantity ELSE -quantity END) AS balance
+                FROM transactions GROUP BY clothing_item_id
+            ) l ON l.clothing_item_id = i.id
+        )
+        WHERE difference <> 0
+    """, (datetime.now().strftime('%Y-%m-%d'),))
+
+
+def _add_stock_reconciliation_index(cursor):
+    """
+    Migration 5: covering index over the ledger's sale entries, so
+    reconcile_stock() can total the units sold per item without reading the
+    transactions table (the reason column is only in there to make it covering).
+    """
+    cursor.execute("""
+        CREATE INDEX IF NOT EXISTS idx_transactions_sales
+        ON transactions(clothing_item_id, transaction_type, quantity, reason)
+        WHERE reason LIKE 'Sale #%'
+    """)
+
+
+def _add_sales_archives(cursor):
+    """
+    Migration 6: registry of the fiscal years whose sales were moved to an
+    archive database (see app.models.archive).
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sales_archives (
+            year INTEGER PRIMARY KEY,   -- fiscal year
+            path TEXT NOT NULL,         -- archive file, relative to this database's directory
+            first_day TEXT NOT NULL,    -- YYYY-MM-DD, first and last day of the fiscal year
+            last_day TEXT NOT NULL,
+            sales INTEGER NOT NULL DEFAULT 0,
+            archived_at TEXT
+        )
+    """)
+
+
+def _add_sale_imports(cursor):
+    """
+    Migration 7: the sale IDs written by each sales CSV import. Imported sales
+    are historic and have no stock ledger entries, so reconcile_stock() leaves
+    them out. Sale IDs are never reused (AUTOINCREMENT), so the ranges stay
+    valid when sales are deleted or archived.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sale_imports (
+            first_id INTEGER PRIMARY KEY,  -- first and last sale ID of one import batch
+            last_id INTEGER NOT NULL,
+            imported_at TEXT
+        )
+    """)
+
+
+# Schema migrations, applied in order. The database's PRAGMA user_version
+# records how many have run, so migration N is MIGRATIONS[N - 1]. Only ever
+# append to this list.
+MIGRATIONS = [
+    _add_core_indexes,
+    _add_sales_daily_rollup,
+    _add_item_search_index,
+    _add_stock_ledger,
+    _add_stock_reconciliation_index,
+    _add_sales_archives,
+    _add_sale_imports,
+]
+
+
+def get_schema_version():
+    """Returns the number of migrations applied to the database."""
+    return get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate():
+    """
+    Applies every migration the database has not seen yet.
+
+    Each migration runs in its own IMMEDIATE transaction together with the
+    user_version bump, so a failed migration leaves the schema at the previous
+    version and two processes starting at once cannot apply the same step twice.
+    """
+    while get_schema_version() < len(MIGRATIONS):
+        with transaction(immediate=True) as cursor:
+            version = cursor.execute("PRAGMA user_version").fetchone()[0]
+            if version >= len(MIGRATIONS):
+                break
+            MIGRATIONS[version](cursor)
+            cursor.execute(f"PRAGMA user_version={version + 1}")
+
 
 # Seed sample data
 def seed_data():
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
+    with transaction() as cursor:
+        _insert_sample_data(cursor)
+
 
+def _insert_sample_data(cursor):
+    """Inserts a handful of sample items, transactions and sales."""
     # Sample Inventory Items with updated fields
     cursor.executemany("""
     INSERT INTO clothing_items (name, category, size, description, quantity, price, supplier, entry_date, notes)
@@ -85,14 +705,17 @@ def seed_data():
         ("Jacket", "Clothing", "S", "Black leather with zipper", 3, 59.99, "Supplier C", datetime.now().strftime('%Y-%m-%d'), "Winter wear"),
     ])
 
-    # Sample Transactions
+    # Sample Transactions: the stock movements behind the quantities above and the sales below
     cursor.executemany("""
     INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
     VALUES (?, ?, ?, ?, ?)
     """, [
-        (1, "in", 10, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Restocked"),
-        (2, "out", 2, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Sold"),
-        (3, "out", 1, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Returned by customer"),
+        (1, "in", 12, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Restocked"),
+        (1, "out", 2, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Sale #1"),
+        (2, "in", 6, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Restocked"),
+        (2, "out", 1, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Sale #2"),
+        (3, "in", 4, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Restocked"),
+        (3, "out", 1, datetime.now().strftime('%Y-%m-%d %H:%M:%S'), "Sale #3"),
     ])
 
     # Sample Sales Data
@@ -105,8 +728,8 @@ def seed_data():
         (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), 3, 1, 59.99, 59.99, "Cash", 20.00, "Winter sale"),
     ])
 
-    conn.commit()
-    conn.close()
+    # The sample sales bypass add_sale, so bring the daily rollup up to date
+    fill_sales_rollup(cursor)
 
 if __name__ == "__main__":
     init_db()
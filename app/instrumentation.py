@@ -0,0 +1,275 @@
+"""
+Timing instrumentation for the model functions.
+
+Every public function in app.models is wrapped with @instrumented. Each call
+records its wall time, the number of rows it returned, the SQL it issued
+(captured with the connection's trace callback) and an approximate count of
+SQLite VM steps (from the progress handler). Per-function rolling
+percentiles are kept in memory for the diagnostics panel, and calls slower
+than the threshold are appended to the slow-query log.
+
+The trace callback sees the SQL with the bound values filled in, which
+include customer and price data. The log file keeps the statements with
+their literals replaced by ? unless INVENTOLEE_SLOW_LOG_VALUES is set.
+
+Configuration:
+    INVENTOLEE_SLOW_MS          Slow-query threshold in milliseconds (default 250)
+    INVENTOLEE_SLOW_LOG         Slow-query log file (default slow_queries.log);
+                                set it to an empty string to disable the file
+    INVENTOLEE_SLOW_LOG_VALUES  Set to 1 to log the statements with their values,
+                                for debugging
+"""
+import functools
+import logging
+import os
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from app.db import get_connection
+
+SLOW_QUERY_THRESHOLD_MS = float(os.environ.get("INVENTOLEE_SLOW_MS", "250"))
+SLOW_QUERY_LOG = os.environ.get("INVENTOLEE_SLOW_LOG", "slow_queries.log")
+SLOW_LOG_VALUES = os.environ.get("INVENTOLEE_SLOW_LOG_VALUES", "") == "1"
+WINDOW = 500                 # Calls per function kept for the rolling percentiles
+PROGRESS_STEPS = 1000        # SQLite VM instructions per progress handler call
+RECENT_SLOW = 50             # Slow calls kept in memory for the diagnostics panel
+
+slow_query_logger = logging.getLogger("inventolee.slow_queries")
+_log_configured = False
+
+_local = threading.local()   # Per-thread stack of in-flight calls
+_stats_lock = threading.Lock()
+_stats = {}                  # function name -> QueryStats
+_recent_slow = deque(maxlen=RECENT_SLOW)
+
+# String, blob and numeric literals; numbers that are part of a name (sales_2023) are not
+_LITERAL = re.compile(r"[xX]'[0-9A-Fa-f]*'|'(?:[^']|'')*'|(?<![\w.])\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b")
+
+
+class QueryStats:
+    """
+    Rolling statistics for one model function. Percentiles are computed over
+    the last WINDOW calls; the counters cover every call since the last reset.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.errors = 0
+        self.slow = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.durations = deque(maxlen=WINDOW)
+        self.rows = deque(maxlen=WINDOW)
+        self.last_sql = None
+
+    def add(self, elapsed_ms, rows, sql, failed, slow):
+        self.calls += 1
+        self.errors += failed
+        self.slow += slow
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+        self.durations.append(elapsed_ms)
+        if rows is not None:
+            self.rows.append(rows)
+        if sql:
+            self.last_sql = sql[-1]
+
+    def percentile(self, p):
+        """Returns the p-th percentile (0-100) of the recent durations in ms."""
+        if not self.durations:
+            return 0.0
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+    def snapshot(self):
+        """Returns the statistics as a plain dictionary."""
+        return {
+            "name": self.name,
+            "calls": self.calls,
+            "errors": self.errors,
+            "slow": self.slow,
+            "mean_ms": self.total_ms / self.calls if self.calls else 0.0,
+            "p50_ms": self.percentile(50),
+            "p95_ms": self.percentile(95),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "avg_rows": sum(self.rows) / len(self.rows) if self.rows else None,
+            "last_sql": self.last_sql,
+        }
+
+
+class _Call:
+    """State of one in-flight instrumented call."""
+    __slots__ = ("name", "statements", "steps")
+
+    def __init__(self, name):
+        self.name = name
+        self.statements = []
+        self.steps = 0
+
+
+def _calls():
+    stack = getattr(_local, "calls", None)
+    if stack is None:
+        stack = _local.calls = []
+    return stack
+
+
+def _trace(sql):
+    # Statements belong to the innermost instrumented call on this thread
+    stack = _calls()
+    if stack:
+        stack[-1].statements.append(sql)
+    for sink in getattr(_local, "captures", ()):
+        sink.append(sql)
+
+
+def _progress():
+    stack = _calls()
+    if stack:
+        stack[-1].steps += PROGRESS_STEPS
+    return 0  # Non-zero would abort the statement
+
+
+def _count_rows(result):
+    """Rows returned by a model function: lists and frames count their rows, a single row counts as one."""
+    if isinstance(result, list) or hasattr(result, "shape"):
+        return len(result)
+    if isinstance(result, tuple):
+        return 1
+    if result is None:
+        return 0
+    return None
+
+
+def redact(sql):
+    """Replaces the literals in a statement, the bound values among them, with ?."""
+    return _LITERAL.sub("?", sql)
+
+
+def _configure_log():
+    global _log_configured
+    _log_configured = True
+    if SLOW_QUERY_LOG and not slow_query_logger.handlers:
+        # Imported here: logging.handlers pulls in socket, which slows startup
+        from logging.handlers import RotatingFileHandler
+        handler = RotatingFileHandler(SLOW_QUERY_LOG, maxBytes=1024 * 1024, backupCount=3,
+                                      encoding="utf-8", delay=True)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(message)s"))
+        slow_query_logger.addHandler(handler)
+        slow_query_logger.setLevel(logging.INFO)
+        slow_query_logger.propagate = False
+
+
+def set_slow_query_threshold(threshold_ms):
+    """Changes the duration above which calls are logged as slow."""
+    global SLOW_QUERY_THRESHOLD_MS
+    if threshold_ms < 0:
+        raise ValueError("The slow-query threshold cannot be negative")
+    SLOW_QUERY_THRESHOLD_MS = float(threshold_ms)
+
+
+def _record(call, elapsed_ms, rows, failed):
+    slow = elapsed_ms >= SLOW_QUERY_THRESHOLD_MS
+    with _stats_lock:
+        stats = _stats.get(call.name)
+        if stats is None:
+            stats = _stats[call.name] = QueryStats(call.name)
+        stats.add(elapsed_ms, rows, call.statements, failed, slow)
+        if slow:
+            _recent_slow.append({"time": time.time(), "name": call.name, "ms": elapsed_ms,
+                                 "rows": rows, "steps": call.steps, "failed": failed,
+                                 "sql": list(call.statements)})
+    if slow:
+        if not _log_configured:
+            _configure_log()
+        sql = "; ".join(" ".join(statement.split()) for statement in call.statements)
+        if not SLOW_LOG_VALUES:
+            sql = redact(sql)
+        slow_query_logger.info("%s took %.1f ms rows=%s vm_steps~%d%s sql=%s", call.name, elapsed_ms,
+                               rows, call.steps, " FAILED" if failed else "", sql)
+
+
+def instrumented(fn):
+    """
+    Decorator recording timing, rows and SQL of every call to a model function.
+
+    Nested instrumented calls are recorded separately; the outer call's time
+    includes the inner ones, but each statement is attributed to the
+    innermost call that issued it.
+    """
+    name = f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        stack = _calls()
+        outermost = not stack
+        if outermost:
+            conn = get_connection()
+            conn.set_trace_callback(_trace)
+            conn.set_progress_handler(_progress, PROGRESS_STEPS)
+        call = _Call(name)
+        stack.append(call)
+        failed = False
+        rows = None
+        started = time.perf_counter()
+        try:
+            result = fn(*args, **kwargs)
+            rows = _count_rows(result)
+            return result
+        except Exception:
+            failed = True
+            raise
+        finally:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stack.pop()
+            if outermost:
+                conn.set_trace_callback(None)
+                conn.set_progress_handler(None, 0)
+            _record(call, elapsed_ms, rows, failed)
+
+    return wrapper
+
+
+@contextmanager
+def capture_statements():
+    """
+    Collects the SQL issued by instrumented model calls on this thread while
+    the block runs.
+
+        with capture_statements() as statements:
+            get_summary("daily")
+    """
+    statements = []
+    captures = getattr(_local, "captures", None)
+    if captures is None:
+        captures = _local.captures = []
+    captures.append(statements)
+    try:
+        yield statements
+    finally:
+        captures.remove(statements)
+
+
+def get_stats():
+    """Returns a snapshot dictionary per instrumented function, slowest p95 first."""
+    with _stats_lock:
+        snapshots = [stats.snapshot() for stats in _stats.values()]
+    return sorted(snapshots, key=lambda s: s["p95_ms"], reverse=True)
+
+
+def get_recent_slow_queries():
+    """Returns the most recent slow calls, newest first."""
+    with _stats_lock:
+        return list(reversed(_recent_slow))
+
+
+def reset_stats():
+    """Forgets all recorded statistics and slow calls."""
+    with _stats_lock:
+        _stats.clear()
+        _recent_slow.clear()
@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+from app.db import get_connection
+from app.instrumentation import instrumented
+from app.models.sales import _date_filter, PERIOD_FORMATS
+from app.models.archive import rollup_source
+
+# Periods averaged by the moving average columns
+MOVING_AVERAGE_WINDOWS = {"daily": 7, "weekly": 4, "monthly": 3}
+
+SUMMARY_COLUMNS = ["period", "revenue", "profit", "units", "sales", "margin",
+                   "revenue_ma", "profit_ma", "revenue_growth", "profit_growth"]
+
+
+def load_daily_totals(start_date=None, end_date=None):
+    """
+    Loads the revenue, profit, units and number of sales per day into a
+    DataFrame indexed by day, with a single query over sales_daily_rollup
+    (and the rollups of archived years in the range).
+
+    :param start_date: Optional first day (YYYY-MM-DD)
+    :param end_date: Optional last day (YYYY-MM-DD)
+    :return: DataFrame with float/int columns revenue, profit, units, sales
+    """
+    conn = get_connection()
+    query = f"""
+        SELECT day, SUM(revenue), SUM(profit), SUM(units), SUM(sale_count)
+        FROM {rollup_source(conn, start_date, end_date)}
+    """
+    conditions, params = _date_filter("day", start_date, end_date)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " GROUP BY day ORDER BY day"
+
+    rows = conn.execute(query, params).fetchall()
+    # One pass turning the rows into typed column arrays
+    days, revenue, profit, units, sales = zip(*rows) if rows else ((), (), (), (), ())
+    return pd.DataFrame({
+        "revenue": np.array(revenue, dtype=np.float64),
+        "profit": np.array(profit, dtype=np.float64),
+        "units": np.array(units, dtype=np.int64),
+        "sales": np.array(sales, dtype=np.int64),
+    }, index=pd.DatetimeIndex(pd.to_datetime(days, format="%Y-%m-%d"), name="day"))
+
+
+def _period_labels(days, period_type):
+    """
+    Period label of each day, computed on datetime64 arrays instead of a
+    strftime() call per element. Produces the same labels as PERIOD_FORMATS.
+    """
+    days = days.to_numpy().astype("datetime64[D]")
+    if period_type == "monthly":
+        return days.astype("datetime64[M]").astype(str)
+    if period_type == "weekly":
+        years = days.astype("datetime64[Y]")
+        day_of_year = (days - years.astype("datetime64[D]")).astype(np.int64)
+        weekday = (days.astype(np.int64) + 3) % 7  # Monday = 0; 1970-01-01 was a Thursday
+        week = (day_of_year + 7 - weekday) // 7    # %W: days before the first Monday are week 00
+        return np.char.add(np.char.add(years.astype(str), "-"), np.char.zfill(week.astype(str), 2))
+    return days.astype(str)
+
+
+def _percent(numerator, denominator):
+    """numerator / denominator * 100 element-wise, 0 where the denominator is not positive."""
+    out = np.zeros(len(numerator), dtype=np.float64)
+    np.divide(numerator, denominator, out=out, where=denominator > 0)
+    return out * 100
+
+
+def _growth(values):
+    """Period-over-period change in percent; NaN where the previous period was 0."""
+    previous = np.roll(values, 1)
+    out = np.full(len(values), np.nan)
+    np.divide(values - previous, np.abs(previous), out=out, where=previous != 0)
+    out[:1] = np.nan
+    return out * 100
+
+
+@instrumented
+def get_period_summary(period_type="daily", start_date=None, end_date=None, fill_gaps=True):
+    """
+    Computes the Profit & Loss summary per period, vectorized.
+
+    Columns: period (label as in get_summary), revenue, profit, units, sales
+    (number of sales), margin (profit / revenue in %), revenue_ma and
+    profit_ma (moving averages over MOVING_AVERAGE_WINDOWS periods),
+    revenue_growth and profit_growth (% change on the previous period, NaN
+    when that period had none).
+
+    :param period_type: "daily", "weekly" or "monthly" (unknown values fall back to daily)
+    :param start_date: Optional start date for filtering
+    :param end_date: Optional end date for filtering
+    :param fill_gaps: Include periods without sales as zero rows, so moving
+                      averages and growth compare consecutive periods
+    :return: DataFrame with SUMMARY_COLUMNS, ordered by period
+    """
+    if period_type not in PERIOD_FORMATS:
+        period_type = "daily"
+    window = MOVING_AVERAGE_WINDOWS[period_type]
+    daily = load_daily_totals(start_date, end_date)
+
+    if fill_gaps and (len(daily) or (start_date and end_date)):
+        first = pd.Timestamp(start_date).normalize() if start_date else daily.index[0]
+        last = pd.Timestamp(end_date).normalize() if end_date else daily.index[-1]
+        daily = daily.reindex(pd.date_range(first, last, freq="D", name="day"), fill_value=0)
+
+    # Labels sort chronologically, so grouping on them keeps periods in order
+    totals = daily.groupby(_period_labels(daily.index, period_type)).sum()
+    revenue = totals["revenue"].to_numpy()
+    profit = totals["profit"].to_numpy()
+
+    return pd.DataFrame({
+        "period": totals.index.to_numpy(dtype=object),
+        "revenue": revenue,
+        "profit": profit,
+        "units": totals["units"].to_numpy(),
+        "sales": totals["sales"].to_numpy(),
+        "margin": _percent(profit, revenue),
+        "revenue_ma": totals["revenue"].rolling(window, min_periods=1).mean().to_numpy(),
+        "profit_ma": totals["profit"].rolling(window, min_periods=1).mean().to_numpy(),
+        "revenue_growth": _growth(revenue),
+        "profit_growth": _growth(profit),
+    }, columns=SUMMARY_COLUMNS)
+
+
+def summary_totals(summary):
+    """
+    Totals over a get_period_summary() frame for the summary cards.
+
+    :return: Dictionary with revenue, profit, units, sales and margin (%)
+    """
+    revenue = float(summary["revenue"].sum())
+    profit = float(summary["profit"].sum())
+    return {
+        "revenue": revenue,
+        "profit": profit,
+        "units": int(summary["units"].sum()),
+        "sales": int(summary["sales"].sum()),
+        "margin": profit / revenue * 100 if revenue > 0 else 0.0,
+    }
@@ -0,0 +1,244 @@
+import os
+import sqlite3
+from datetime import date, datetime, timedelta
+from app.db import get_connection, get_db_path, transaction
+from app.instrumentation import instrumented
+
+# Cold storage for the sales of closed fiscal years. archive_sales_year()
+# moves a year's sales, with their daily rollup, out of the live database
+# into a database file of its own, listed in the sales_archives table.
+#
+# Sales queries ask sales_tables() / rollup_source() what to read: the live
+# tables plus those of the archives overlapping the requested date range,
+# which are ATTACHed to the calling thread's connection on first use. Sale
+# IDs are kept, so a sale has the same ID wherever it is stored.
+
+# First month of the fiscal year; fiscal year Y starts on the 1st of this month in Y
+FISCAL_YEAR_START_MONTH = 1
+
+SALES_FIELDS = "id, date, item_id, quantity, unit_price, total_amount, payment_method, profit, expense_notes"
+ROLLUP_FIELDS = "day, item_id, revenue, profit, units, sale_count"
+
+# Daily rollup of the sales in a date range of one sales table
+_ROLLUP_SELECT = """
+    SELECT substr(date, 1, 10) AS day, IFNULL(item_id, 0), SUM(total_amount),
+           SUM(IFNULL(profit, 0)), SUM(quantity), COUNT(*)
+    FROM {table}
+    WHERE date >= ? AND date < ?
+    GROUP BY day, IFNULL(item_id, 0)
+"""
+
+
+def fiscal_year_bounds(year):
+    """First and last day (YYYY-MM-DD) of a fiscal year."""
+    first = date(year, FISCAL_YEAR_START_MONTH, 1)
+    following = date(year + 1, FISCAL_YEAR_START_MONTH, 1)
+    return first.isoformat(), (following - timedelta(days=1)).isoformat()
+
+
+def fiscal_year_of(day):
+    """Fiscal year a date falls in."""
+    return day.year if day.month >= FISCAL_YEAR_START_MONTH else day.year - 1
+
+
+def default_archive_path(year):
+    """archives/<database name>-sales-<year>.db, relative to the database's directory."""
+    name = os.path.splitext(os.path.basename(get_db_path()))[0]
+    return os.path.join("archives", f"{name}-sales-{year}.db")
+
+
+def _full_path(path):
+    """Archive paths are stored relative to the database's directory unless absolute."""
+    return os.path.join(os.path.dirname(os.path.abspath(get_db_path())), path)
+
+
+def _schema(year):
+    return f"sales_{year}"
+
+
+def _attach_limit(conn):
+    # Connection.getlimit() is new in Python 3.11; 10 is SQLite's default
+    getlimit = getattr(conn, "getlimit", None)
+    return getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) if getlimit else 10
+
+
+def _attach(conn, archives):
+    """
+    ATTACH the given (year, path) archives to conn if they are not already,
+    detaching archives not in the list when SQLite's limit would be exceeded.
+    Must run outside a transaction.
+    """
+    attached = {row[1] for row in conn.execute("PRAGMA database_list")} - {"main", "temp"}
+    wanted = {_schema(year): path for year, path in archives}
+    missing = [schema for schema in wanted if schema not in attached]
+    if not missing:
+        return
+    if len(wanted) > _attach_limit(conn):
+        raise ValueError(f"The date range spans {len(wanted)} archived years; "
+                         f"at most {_attach_limit(conn)} can be read at once")
+    spare = sorted(attached - set(wanted))
+    while spare and len(attached) + len(missing) > _attach_limit(conn):
+        schema = spare.pop()
+        conn.execute(f"DETACH DATABASE {schema}")
+        attached.discard(schema)
+    for schema in missing:
+        conn.execute(f"ATTACH DATABASE ? AS {schema}", (_full_path(wanted[schema]),))
+
+
+def _archived_tables(conn, table, start_date, end_date):
+    """Schema-qualified `table` of every archive overlapping the date range, newest first."""
+    archives = conn.execute("""
+        SELECT year, path FROM sales_archives
+        WHERE last_day >= ? AND first_day <= ?
+        ORDER BY year DESC
+    """, (start_date[:10] if start_date else "", end_date or "9999")).fetchall()
+    _attach(conn, archives)
+    return [f"{_schema(year)}.{table}" for year, _ in archives]
+
+
+def sales_tables(conn, start_date=None, end_date=None):
+    """
+    Sales tables holding the sales of a date range: the live table first, then
+    the overlapping archives (attached to conn as needed).
+    :return: List of table names usable in FROM, e.g. ['sales', 'sales_2023.sales']
+    """
+    return ["sales"] + _archived_tables(conn, "sales", start_date, end_date)
+
+
+def rollup_source(conn, start_date=None, end_date=None):
+    """
+    FROM clause source with the daily rollup of a date range across the live
+    database and the overlapping archives: the live sales_daily_rollup table
+    itself when no archive overlaps, a UNION ALL subquery otherwise.
+    """
+    tables = ["sales_daily_rollup"] + _archived_tables(conn, "sales_daily_rollup", start_date, end_date)
+    if len(tables) == 1:
+        return tables[0]
+    return "(" + " UNION ALL ".join(f"SELECT {ROLLUP_FIELDS} FROM {table}" for table in tables) + ")"
+
+
+def _create_archive_tables(cursor, schema):
+    """The live sales tables' layout and sales indexes, in an archive."""
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.sales (
+            id INTEGER PRIMARY KEY,
+            date TEXT NOT NULL,
+            item_id INTEGER,
+            quantity INTEGER NOT NULL,
+            unit_price REAL NOT NULL,
+            total_amount REAL NOT NULL,
+            payment_method TEXT NOT NULL,
+            profit REAL,
+            expense_notes TEXT
+        )
+    """)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_sales_date ON sales(date, total_amount, profit)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {schema}.idx_sales_item ON sales(item_id, date)")
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {schema}.sales_daily_rollup (
+            day TEXT NOT NULL,
+            item_id INTEGER NOT NULL,
+            revenue REAL NOT NULL DEFAULT 0,
+            profit REAL NOT NULL DEFAULT 0,
+            units INTEGER NOT NULL DEFAULT 0,
+            sale_count INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (day, item_id)
+        ) WITHOUT ROWID
+    """)
+
+
+@instrumented
+def archive_sales_year(year, path=None, today=None):
+    """
+    Move the sales of a closed fiscal year, with their daily rollup, from the
+    live database into the year's archive file.
+
+    The sales are first copied into the archive and committed there, then
+    deleted from the live database together with the registry update. An
+    interrupted run leaves the sales in the live database (and possibly a
+    copy in an archive not yet in use); running it again completes it.
+    Sales added to an archived year later stay live until the year is
+    archived again, which moves them into the existing archive.
+
+    :param year: Fiscal year (see FISCAL_YEAR_START_MONTH)
+    :param path: Archive file for a year not archived before; default is
+                 default_archive_path(year). Relative paths are relative to the database.
+    :param today: Date the year must have ended before (default: today)
+    :return: Number of sales moved
+    :raises ValueError: If the fiscal year has not ended yet
+    """
+    first_day, last_day = fiscal_year_bounds(year)
+    if date.fromisoformat(last_day) >= (today or date.today()):
+        raise ValueError(f"Fiscal year {year} has not ended yet")
+    until = (date.fromisoformat(last_day) + timedelta(days=1)).isoformat()
+
+    conn = get_connection()
+    registered = conn.execute("SELECT path FROM sales_archives WHERE year = ?", (year,)).fetchone()
+    path = registered[0] if registered else (path or default_archive_path(year))
+    os.makedirs(os.path.dirname(_full_path(path)), exist_ok=True)
+    schema = _schema(year)
+    _attach(conn, [(year, path)])
+
+    # Copy into the archive (replacing copies left by an interrupted run) and
+    # recompute its rollup from the sales it holds
+    with transaction(immediate=True) as cursor:
+        _create_archive_tables(cursor, schema)
+        cursor.execute(f"""
+            INSERT OR REPLACE INTO {schema}.sales ({SALES_FIELDS})
+            SELECT {SALES_FIELDS} FROM main.sales WHERE date >= ? AND date < ?
+        """, (first_day, until))
+        cursor.execute(f"DELETE FROM {schema}.sales_daily_rollup")
+        cursor.execute(f"INSERT INTO {schema}.sales_daily_rollup ({ROLLUP_FIELDS})"
+                       + _ROLLUP_SELECT.format(table=f"{schema}.sales"), (first_day, until))
+
+    # Then delete what the archive now holds from the live database. Sales
+    # added in between are not in the archive and stay live.
+    with transaction(immediate=True) as cursor:
+        cursor.execute(f"""
+            DELETE FROM main.sales
+            WHERE date >= ? AND date < ? AND id IN (SELECT id FROM {schema}.sales)
+        """, (first_day, until))
+        moved = cursor.rowcount
+        cursor.execute("DELETE FROM main.sales_daily_rollup WHERE day BETWEEN ? AND ?", (first_day, last_day))
+        cursor.execute(f"INSERT INTO main.sales_daily_rollup ({ROLLUP_FIELDS})"
+                       + _ROLLUP_SELECT.format(table="main.sales"), (first_day, until))
+        archived = cursor.execute(f"SELECT COUNT(*) FROM {schema}.sales").fetchone()[0]
+        cursor.execute("""
+            INSERT INTO sales_archives (year, path, first_day, last_day, sales, archived_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            ON CONFLICT (year) DO UPDATE SET sales = excluded.sales, archived_at = excluded.archived_at
+        """, (year, path, first_day, last_day, archived, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+    return moved
+
+
+@instrumented
+def get_sales_archives():
+    """
+    Lists the archived fiscal years.
+    :return: List of (year, path, first_day, last_day, sales, archived_at) tuples, oldest year first
+    """
+    cursor = get_connection().execute("""
+        SELECT year, path, first_day, last_day, sales, archived_at FROM sales_archives ORDER BY year
+    """)
+    return cursor.fetchall()
+
+
+@instrumented
+def closed_years_with_live_sales(today=None):
+    """
+    Fiscal years that have ended and still have sales in the live database,
+    i.e. what archive_sales_year() would move something for.
+    :param today: Reference date (default: today)
+    :return: List of years, oldest first
+    """
+    first_open, _ = fiscal_year_bounds(fiscal_year_of(today or date.today()))
+    conn = get_connection()
+    years = []
+    # One index seek per year instead of grouping every sale
+    day = conn.execute("SELECT MIN(date) FROM sales").fetchone()[0]
+    while day is not None and day < first_open:
+        year = fiscal_year_of(date.fromisoformat(day[:10]))
+        years.append(year)
+        following, _ = fiscal_year_bounds(year + 1)
+        day = conn.execute("SELECT MIN(date) FROM sales WHERE date >= ?", (following,)).fetchone()[0]
+    return years
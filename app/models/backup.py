@@ -0,0 +1,224 @@
+import os
+import re
+import sqlite3
+import time
+from collections import namedtuple
+from datetime import datetime, timedelta
+from urllib.parse import quote
+from app.db import (get_connection, get_db_path, close_all_connections, migrate, MIGRATIONS,
+                    PERFORMANCE_PROFILE)
+from app.instrumentation import instrumented
+from app.models.catalogue import catalogue
+from app.models import changes
+
+# Online backups of the live database with SQLite's backup API. The pages are
+# copied a step at a time on a connection of the backup's own, which holds a
+# read transaction from the first step to the last: in WAL mode that does not
+# hold up the till's writes, and the snapshot stays the one the backup
+# started from (without it, every commit made meanwhile would restart the
+# copy from the first page). Between steps the backup sleeps briefly, giving
+# other threads the GIL and the disk.
+#
+# Snapshots are written next to their final name, checked with
+# PRAGMA integrity_check and only then renamed, so a file with a snapshot's
+# name is always complete. They are named <database>-YYYYMMDD-HHMMSS.db (with
+# a -N suffix for further snapshots within the same second) and rotated: only
+# the newest KEEP_BACKUPS are kept. Archived sales (see app.models.archive)
+# live in files of their own, which are not included.
+
+# Directory of the snapshots, relative to the database's directory unless absolute
+BACKUP_DIR = "backups"
+KEEP_BACKUPS = 7          # Snapshots kept by rotation
+PAGES_PER_STEP = 1024     # Pages copied per backup step (4 MB at the default page size)
+STEP_PAUSE = 0.002        # Seconds slept between steps
+BACKUP_INTERVAL = timedelta(days=1)  # Age of the newest snapshot after which backup_if_due() backs up
+
+# One snapshot file; created is parsed from the name
+Backup = namedtuple("Backup", ["path", "created", "size"])
+# Outcome of backup_database(); removed lists the snapshots rotated out
+BackupResult = namedtuple("BackupResult", ["path", "pages", "size", "seconds", "removed"])
+
+
+def backup_dir(directory=None):
+    """Absolute path of the snapshot directory (default BACKUP_DIR)."""
+    db_dir = os.path.dirname(os.path.abspath(get_db_path()))
+    return os.path.join(db_dir, directory or BACKUP_DIR)
+
+
+def _name_pattern():
+    name = os.path.splitext(os.path.basename(get_db_path()))[0]
+    return re.compile(re.escape(name) + r"-(\d{8}-\d{6})(?:-(\d+))?\.db$")
+
+
+def _open_read_only(path):
+    """Connection to an existing database file (a snapshot) that cannot write to it."""
+    conn = sqlite3.connect(f"file:{quote(os.path.abspath(path))}?mode=ro", uri=True,
+                           isolation_level=None)
+    conn.execute(f"PRAGMA busy_timeout={PERFORMANCE_PROFILE['busy_timeout']}")
+    return conn
+
+
+def list_backups(directory=None):
+    """
+    Lists the snapshots of the database.
+    :param directory: Snapshot directory (default BACKUP_DIR)
+    :return: List of Backup(path, created, size) tuples, newest first
+    """
+    directory = backup_dir(directory)
+    if not os.path.isdir(directory):
+        return []
+    pattern = _name_pattern()
+    backups = []
+    for entry in os.scandir(directory):
+        match = pattern.match(entry.name)
+        if match and entry.is_file():
+            created = datetime.strptime(match.group(1), "%Y%m%d-%H%M%S")
+            backups.append((created, int(match.group(2) or 0),
+                            Backup(entry.path, created, entry.stat().st_size)))
+    return [backup for _, _, backup in sorted(backups, reverse=True)]
+
+
+def verify_backup(path, quick=False):
+    """
+    Checks a snapshot (or any database file) for corruption without changing it.
+    :param path: Database file
+    :param quick: Run PRAGMA quick_check, which skips the index contents, instead of integrity_check
+    :return: List of problems found; empty if the file is sound
+    """
+    try:
+        conn = _open_read_only(path)
+        try:
+            problems = [line for row in conn.execute("PRAGMA quick_check" if quick
+                                                     else "PRAGMA integrity_check")
+                        for line in row[0].splitlines()]
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+        finally:
+            conn.close()
+    except sqlite3.Error as e:
+        return [f"{path}: {e}"]
+    if problems == ["ok"]:
+        problems = []
+    if version > len(MIGRATIONS):
+        problems.append(f"Schema version {version} is newer than this version of the app "
+                        f"({len(MIGRATIONS)})")
+    return problems
+
+
+def _rotate(directory, keep):
+    """Delete all but the newest `keep` snapshots; returns the deleted paths."""
+    removed = []
+    for backup in list_backups(directory)[keep:]:
+        os.remove(backup.path)
+        removed.append(backup.path)
+    return removed
+
+
+@instrumented
+def backup_database(directory=None, keep=KEEP_BACKUPS, pages=PAGES_PER_STEP, pause=STEP_PAUSE,
+                    progress=None):
+    """
+    Take a snapshot of the live database while it stays in use, verify it and
+    rotate the older snapshots out.
+
+    :param directory: Snapshot directory (default BACKUP_DIR)
+    :param keep: Number of snapshots to keep, this one included; None keeps them all
+    :param pages: Pages copied per step; -1 copies everything in one step
+    :param pause: Seconds slept between steps
+    :param progress: Optional callable(pages copied, fraction done) called after each step
+    :return: BackupResult(path, pages, size, seconds, removed)
+    :raises ValueError: If the snapshot fails verification (it is then deleted)
+    """
+    started = time.perf_counter()
+    directory = backup_dir(directory)
+    os.makedirs(directory, exist_ok=True)
+    name = os.path.splitext(os.path.basename(get_db_path()))[0]
+    stem = os.path.join(directory, f"{name}-{datetime.now():%Y%m%d-%H%M%S}")
+    path, n = stem + ".db", 1
+    while os.path.exists(path):
+        path, n = f"{stem}-{n}.db", n + 1
+    partial = path + ".part"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    def step(status, remaining, total):
+        if progress is not None:
+            progress(total - remaining, (total - remaining) / total if total else 1.0)
+        time.sleep(pause)
+
+    source = sqlite3.connect(get_db_path(), isolation_level=None)
+    try:
+        source.execute(f"PRAGMA busy_timeout={PERFORMANCE_PROFILE['busy_timeout']}")
+        # The read transaction pins the snapshot the whole copy is taken from
+        source.execute("BEGIN")
+        source.execute("SELECT COUNT(*) FROM sqlite_master")
+        target = sqlite3.connect(partial, isolation_level=None)
+        try:
+            source.backup(target, pages=pages, progress=step)
+            copied = target.execute("PRAGMA page_count").fetchone()[0]
+            # The copy inherits WAL mode; a snapshot is better off as a single file
+            target.execute("PRAGMA journal_mode=DELETE")
+        finally:
+            target.close()
+        source.execute("COMMIT")
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    finally:
+        source.close()
+
+    problems = verify_backup(partial)
+    if problems:
+        os.remove(partial)
+        raise ValueError(f"The snapshot failed verification: {'; '.join(problems[:5])}")
+    os.replace(partial, path)
+    removed = _rotate(directory, keep) if keep is not None else []
+    return BackupResult(path, copied, os.path.getsize(path), time.perf_counter() - started, removed)
+
+
+@instrumented
+def backup_if_due(directory=None, interval=BACKUP_INTERVAL, progress=None):
+    """
+    Take a snapshot if the newest one is older than interval (or there is none).
+    :return: BackupResult, or None if a recent enough snapshot exists
+    """
+    backups = list_backups(directory)
+    if backups and datetime.now() - backups[0].created < interval:
+        return None
+    return backup_database(directory, progress=progress)
+
+
+def restore_database(path, backup_first=True):
+    """
+    Replace the contents of the live database with a snapshot.
+
+    The snapshot is verified first, and the current contents are backed up
+    (without rotation) unless backup_first is False. The copy is made through
+    SQLite in a single step under the write lock, so the WAL stays consistent;
+    afterwards the migrations the snapshot predates are applied. Every
+    connection is closed, as by set_db_path(), and the item catalogue and
+    the views are reset. Other processes using the database (a running app)
+    should be closed first: their caches would not know about the change.
+
+    :param path: Snapshot file
+    :param backup_first: Snapshot the current contents before overwriting them
+    :return: Path of the snapshot of the contents before the restore, or None
+    :raises ValueError: If the snapshot fails verification
+    """
+    problems = verify_backup(path)
+    if problems:
+        raise ValueError(f"{path} cannot be restored: {'; '.join(problems[:5])}")
+    safety = backup_database(keep=None).path if backup_first else None
+
+    close_all_connections()
+    source = _open_read_only(path)
+    try:
+        source.backup(get_connection())
+    finally:
+        source.close()
+    close_all_connections()
+    migrate()
+    catalogue.clear()
+    changes.publish(changes.ITEMS, changes.RESET)
+    changes.publish(changes.SALES, changes.RESET)
+    return safety
@@ -0,0 +1,196 @@
+import threading
+from collections import namedtuple
+from app import db
+from app.db import get_connection
+from app.instrumentation import instrumented
+
+# One clothing_items row. A namedtuple is a tuple subclass without a per-instance
+# __dict__, so records are as compact as the plain rows and index the same way
+# (record[0] is the ID, record[6] the price) for code written against tuples.
+ItemRecord = namedtuple("ItemRecord", ["id", "name", "category", "size", "description", "quantity",
+                                       "price", "supplier", "entry_date", "notes"])
+
+_ITEM_SELECT = "SELECT id, name, category, size, description, quantity, price, supplier, entry_date, notes FROM clothing_items"
+
+
+@instrumented
+def load_all_items():
+    """
+    Reads every clothing item, ordered by ID.
+    :return: List of ItemRecord
+    """
+    return [ItemRecord._make(row) for row in get_connection().execute(_ITEM_SELECT + " ORDER BY id")]
+
+
+@instrumented
+def load_item(item_id):
+    """
+    Reads one clothing item.
+    :return: ItemRecord, or None if there is no item with this ID
+    """
+    row = get_connection().execute(_ITEM_SELECT + " WHERE id = ?", (item_id,)).fetchone()
+    return ItemRecord._make(row) if row else None
+
+
+class ItemCatalogue:
+    """
+    Process-wide in-memory cache of clothing items, keyed by ID with a
+    secondary index on (name, description, size).
+
+    The first all_items() loads the whole table once; after that dialogs and
+    lookups are served from memory. The inventory and sales functions keep
+    the cache current by patching it through db.after_commit() as they
+    change items (add, update, delete, stock movements), so a rolled back
+    change never reaches it. Bulk changes call clear(), and switching the
+    database file empties it.
+
+    Changes written by other processes sharing the database file are not
+    seen until clear() is called.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._by_id = {}
+        self._by_identity = {}   # (name, description, size) -> ID
+        self._complete = False   # True once every item is loaded
+        self._sorted = None      # all_items() result, rebuilt after a change
+        self._path = None        # Database file the records came from
+        self._generation = 0     # Bumped by every change, to discard loads that raced one
+        self.stats = {"hits": 0, "misses": 0, "patches": 0, "clears": 0}
+
+    def _check_path(self):
+        # Records belong to one database file
+        if self._path != db.get_db_path():
+            self._reset()
+            self._path = db.get_db_path()
+
+    def _reset(self):
+        self._by_id = {}
+        self._by_identity = {}
+        self._complete = False
+        self._sorted = None
+        self._generation += 1
+
+    def _store(self, record):
+        old = self._by_id.get(record.id)
+        if old is not None:
+            self._by_identity.pop((old.name, old.description, old.size), None)
+        self._by_id[record.id] = record
+        self._by_identity[(record.name, record.description, record.size)] = record.id
+
+    def all_items(self):
+        """
+        Returns every item as an ItemRecord, ordered by ID, loading the table
+        on the first call.
+        """
+        with self._lock:
+            self._check_path()
+            if self._complete:
+                self.stats["hits"] += 1
+                if self._sorted is None:
+                    self._sorted = sorted(self._by_id.values())
+                return self._sorted
+            self.stats["misses"] += 1
+            generation = self._generation
+        # Read outside the lock so lookups on other threads are not held up
+        records = load_all_items()
+        with self._lock:
+            if generation == self._generation:
+                self._reset()
+                for record in records:
+                    self._store(record)
+                self._complete = True
+                self._sorted = records
+        return records
+
+    def peek_all(self):
+        """Returns all_items() if it can be answered from memory, else None without querying."""
+        with self._lock:
+            self._check_path()
+            if not self._complete:
+                return None
+        return self.all_items()
+
+    def get(self, item_id):
+        """Returns the ItemRecord with this ID, or None if there is no such item."""
+        with self._lock:
+            self._check_path()
+            record = self._by_id.get(item_id)
+            if record is not None or self._complete:
+                self.stats["hits"] += 1
+                return record
+            self.stats["misses"] += 1
+            generation = self._generation
+        record = load_item(item_id)
+        with self._lock:
+            if record is not None and generation == self._generation:
+                self._store(record)
+        return record
+
+    def peek(self, item_id):
+        """Returns the cached ItemRecord, or None if it is not cached (no query is made)."""
+        with self._lock:
+            self._check_path()
+            record = self._by_id.get(item_id)
+            if record is not None:
+                self.stats["hits"] += 1
+            return record
+
+    def find(self, name, description, size):
+        """Returns the item with this (name, description, size), or None."""
+        self.all_items()
+        with self._lock:
+            item_id = self._by_identity.get((name, description, size))
+            return self._by_id.get(item_id) if item_id is not None else None
+
+    # Patches, called by the model functions after their transaction commits
+
+    def put(self, record):
+        """Adds or replaces an item."""
+        with self._lock:
+            self._check_path()
+            self._generation += 1
+            self.stats["patches"] += 1
+            self._store(record)
+            self._sorted = None
+
+    def remove(self, item_id):
+        """Forgets a deleted item."""
+        with self._lock:
+            self._check_path()
+            self._generation += 1
+            self.stats["patches"] += 1
+            old = self._by_id.pop(item_id, None)
+            if old is not None:
+                self._by_identity.pop((old.name, old.description, old.size), None)
+                self._sorted = None
+
+    def set_quantity(self, item_id, quantity):
+        """
+        Sets a cached item's quantity to the one a stock movement wrote. The
+        absolute value, not the movement's delta: a load racing the commit
+        may already have stored the new quantity.
+        """
+        with self._lock:
+            self._check_path()
+            self._generation += 1
+            self.stats["patches"] += 1
+            old = self._by_id.get(item_id)
+            if old is not None:
+                self._by_id[item_id] = old._replace(quantity=quantity)
+                self._sorted = None
+
+    def clear(self):
+        """Forgets everything; the next lookup reloads from the database."""
+        with self._lock:
+            self.stats["clears"] += 1
+            self._reset()
+
+    def snapshot(self):
+        """Returns the counters and the number of cached items as a dictionary."""
+        with self._lock:
+            return dict(self.stats, items=len(self._by_id), complete=self._complete)
+
+
+# The catalogue shared by every view and worker thread
+catalogue = ItemCatalogue()
@@ -0,0 +1,68 @@
+import logging
+import threading
+from collections import namedtuple
+from app.db import after_commit
+
+# Change notifications for the clothing_items and sales tables. Model functions
+# that write call publish() inside their transaction, and the listeners
+# registered with subscribe() receive a ChangeEvent once it commits (through
+# db.after_commit()), on the committing thread. Events of a transaction that
+# rolls back are never delivered. Views use them to patch the rows that
+# changed instead of reloading whole tables.
+
+ITEMS = "clothing_items"
+SALES = "sales"
+
+INSERTED = "inserted"
+UPDATED = "updated"
+DELETED = "deleted"
+STOCK = "stock"    # Only the item quantities changed (sales, merged additions)
+RESET = "reset"    # Bulk change: anything read from the table must be reloaded; ids is empty
+
+# table: ITEMS or SALES; kind: one of the constants above; ids: tuple of row IDs
+ChangeEvent = namedtuple("ChangeEvent", ["table", "kind", "ids"])
+
+logger = logging.getLogger("inventolee.changes")
+
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def subscribe(callback):
+    """
+    Calls callback(event) for every committed change, on the committing thread.
+    Callbacks must be quick and must not write to the database.
+    """
+    with _listeners_lock:
+        _listeners.append(callback)
+
+
+def unsubscribe(callback):
+    """Stops calling a callback registered with subscribe()."""
+    with _listeners_lock:
+        if callback in _listeners:
+            _listeners.remove(callback)
+
+
+def publish(table, kind, ids=()):
+    """
+    Announces a change to the listeners once the current transaction commits,
+    or right away outside a transaction.
+
+    :param table: ITEMS or SALES
+    :param kind: INSERTED, UPDATED, DELETED, STOCK or RESET
+    :param ids: IDs of the changed rows
+    """
+    event = ChangeEvent(table, kind, tuple(ids))
+    after_commit(lambda: _deliver(event))
+
+
+def _deliver(event):
+    with _listeners_lock:
+        listeners = list(_listeners)
+    for callback in listeners:
+        # The change is already committed: a failing listener must not make the write look failed
+        try:
+            callback(event)
+        except Exception:
+            logger.exception("Change listener failed for %s", event)
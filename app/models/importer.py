@@ -0,0 +1,366 @@
+import csv
+import os
+import time
+from datetime import date, datetime
+from functools import lru_cache
+from app.db import get_connection, transaction, after_commit, retry_on_busy
+from app.models.catalogue import catalogue
+from app.models import changes
+from app.models.sales import _update_rollup
+from app.models.stock import record_movements
+
+# Columns understood by import_items_csv(); header names are case-insensitive
+ITEM_COLUMNS = ("name", "category", "size", "description", "quantity", "price",
+                "supplier", "entry_date", "notes")
+ITEM_REQUIRED = ("name", "size", "quantity", "price")
+
+# Columns understood by import_sales_csv(). The item is given either by
+# item_id or by its identity (name, description, size).
+SALE_COLUMNS = ("date", "item_id", "name", "description", "size", "quantity", "unit_price",
+                "total_amount", "payment_method", "profit", "expense_notes")
+SALE_REQUIRED = ("date", "quantity", "unit_price")
+
+BATCH_SIZE = 10000     # Rows written per transaction
+MAX_KEPT_REJECTS = 1000  # Rejected rows kept in ImportResult.rejects
+
+
+class ImportResult:
+    """
+    Outcome of a CSV import.
+
+    :ivar rows_read: Data rows read from the file
+    :ivar inserted: Rows that created a new record
+    :ivar merged: Item rows added to the quantity of an existing item
+    :ivar rejected: Rows that failed validation and were skipped
+    :ivar rejects: (line number, error) of the first MAX_KEPT_REJECTS rejected rows
+    :ivar rejects_path: CSV file holding every rejected row with its error, if any
+    :ivar seconds: Wall time of the import
+    """
+    def __init__(self):
+        self.rows_read = 0
+        self.inserted = 0
+        self.merged = 0
+        self.rejected = 0
+        self.rejects = []
+        self.rejects_path = None
+        self.seconds = 0.0
+
+    @property
+    def imported(self):
+        return self.inserted + self.merged
+
+    @property
+    def rows_per_second(self):
+        return self.rows_read / self.seconds if self.seconds else 0.0
+
+    def __repr__(self):
+        return (f"ImportResult(rows_read={self.rows_read}, inserted={self.inserted}, "
+                f"merged={self.merged}, rejected={self.rejected}, seconds={self.seconds:.2f})")
+
+
+class _RejectWriter:
+    """Collects rejected rows, writing them to rejects_path (opened on the first reject)."""
+
+    def __init__(self, result, path, fieldnames):
+        self.result = result
+        self.path = path
+        self.fieldnames = list(fieldnames) + ["line", "error"]
+        self._file = None
+        self._writer = None
+
+    def add(self, line, row, error):
+        self.result.rejected += 1
+        if len(self.result.rejects) < MAX_KEPT_REJECTS:
+            self.result.rejects.append((line, error))
+        if self.path is None:
+            return
+        if self._writer is None:
+            self._file = open(self.path, "w", newline="", encoding="utf-8")
+            self._writer = csv.DictWriter(self._file, self.fieldnames, extrasaction="ignore")
+            self._writer.writeheader()
+            self.result.rejects_path = self.path
+        self._writer.writerow(dict(row, line=line, error=error))
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+
+
+def _read_csv(path, known_columns, required, progress):
+    """
+    Yields (line number, row dict with lower-case keys) from a CSV file,
+    reporting progress(rows_read, fraction of the file read) every BATCH_SIZE rows.
+
+    :raises ValueError: If a required column is missing from the header
+    """
+    total = os.path.getsize(path) or 1
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        read = [0]
+
+        def lines():
+            # Count characters as they are read; file.tell() is unavailable while iterating
+            for line in f:
+                read[0] += len(line)
+                yield line
+
+        reader = csv.DictReader(lines())
+        header = {name.strip().lower(): name for name in reader.fieldnames or []}
+        missing = [column for column in required if column not in header]
+        if missing:
+            raise ValueError(f"{os.path.basename(path)} is missing column(s): {', '.join(missing)}")
+        columns = [(column, header[column]) for column in known_columns if column in header]
+
+        count = 0
+        for count, row in enumerate(reader, 1):
+            yield reader.line_num, {column: (row[source] or "").strip() for column, source in columns}
+            if progress is not None and count % BATCH_SIZE == 0:
+                progress(count, min(read[0] / total, 1.0))
+        if progress is not None:
+            progress(count, 1.0)
+
+
+@lru_cache(maxsize=4096)
+def _parse_date(value, with_time=False):
+    """
+    Normalizes YYYY-MM-DD (optionally with a time) and rejects anything else.
+    Cached: an import repeats the same few hundred days many times over.
+    """
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"invalid date {value!r} (expected YYYY-MM-DD)") from None
+    if with_time and len(value) > 10:
+        return parsed.strftime("%Y-%m-%d %H:%M:%S")
+    return parsed.strftime("%Y-%m-%d")
+
+
+def _parse_number(value, name, kind=float, minimum=0):
+    try:
+        number = kind(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a{'n integer' if kind is int else ' number'}, got {value!r}")
+    if number < minimum:
+        raise ValueError(f"{name} cannot be below {minimum}")
+    return number
+
+
+def _validate_item(row):
+    """Turns a CSV row into the item dictionary add_item_to_db() takes, or raises ValueError."""
+    if not row.get("name"):
+        raise ValueError("name is required")
+    if not row.get("size"):
+        raise ValueError("size is required")
+    return {
+        'name': row["name"],
+        'category': row.get("category", ""),
+        'size': row["size"],
+        'description': row.get("description", ""),
+        'quantity': _parse_number(row["quantity"], "quantity", int),
+        'price': _parse_number(row["price"], "price"),
+        'supplier': row.get("supplier", ""),
+        'entry_date': _parse_date(row["entry_date"]) if row.get("entry_date") else date.today().isoformat(),
+        'notes': row.get("notes", ""),
+    }
+
+
+def _item_ids(cursor, identities, chunk_size=300):
+    """
+    Maps (name, description, size) identities to their item IDs, a chunk at a
+    time: each chunk is joined against ux_clothing_items_identity in one query.
+    """
+    identities = list(identities)
+    item_ids = {}
+    for start in range(0, len(identities), chunk_size):
+        chunk = identities[start:start + chunk_size]
+        # CROSS JOIN keeps the chunk the outer loop, looked up in the index
+        cursor.execute(f"""
+            SELECT i.name, i.description, i.size, i.id
+            FROM (VALUES {", ".join(["(?, ?, ?)"] * len(chunk))}) v
+            CROSS JOIN clothing_items i
+                ON i.name = v.column1 AND i.description = v.column2 AND i.size = v.column3
+        """, [value for identity in chunk for value in identity])
+        item_ids.update(((name, description, size), item_id)
+                        for name, description, size, item_id in cursor.fetchall())
+    return item_ids
+
+
+@retry_on_busy()
+def _write_items(batch):
+    """Upserts a batch of items in one transaction; returns the number of new items."""
+    with transaction(immediate=True) as cursor:
+        before = cursor.execute("SELECT COUNT(*) FROM clothing_items").fetchone()[0]
+        # Same rule as add_item_to_db: an existing (name, description, size)
+        # gets the quantity added, anything else is inserted
+        cursor.executemany("""
+            INSERT INTO clothing_items (
+                name, category, size, description, quantity, price,
+                supplier, entry_date, notes
+            ) VALUES (
+                :name, :category, :size, :description, :quantity, :price,
+                :supplier, :entry_date, :notes
+            )
+            ON CONFLICT (name, description, size) DO UPDATE SET
+                quantity = quantity + excluded.quantity
+        """, batch)
+        after = cursor.execute("SELECT COUNT(*) FROM clothing_items").fetchone()[0]
+        # Each row's quantity comes in through the stock ledger
+        stocked = [item for item in batch if item['quantity']]
+        item_ids = _item_ids(cursor, {(item['name'], item['description'], item['size'])
+                                      for item in stocked})
+        today = date.today().isoformat()
+        record_movements(cursor, [(item_ids[item['name'], item['description'], item['size']],
+                                   item['quantity'], today, "CSV import") for item in stocked])
+        after_commit(catalogue.clear)
+        changes.publish(changes.ITEMS, changes.RESET)
+    return after - before
+
+
+def import_items_csv(path, rejects_path=None, batch_size=BATCH_SIZE, progress=None):
+    """
+    Streams inventory items from a CSV file into clothing_items.
+
+    Rows are validated one by one and written in batches of batch_size, each
+    batch in one transaction with a single executemany upsert. Rows matching
+    an existing item (or an earlier row) on (name, description, size) add
+    their quantity to it, exactly like add_item_to_db().
+
+    :param path: CSV file with a header row; see ITEM_COLUMNS and ITEM_REQUIRED
+    :param rejects_path: Optional CSV file receiving rejected rows with their error
+    :param progress: Optional callable(rows_read, fraction) called as the file is read
+    :return: ImportResult
+    :raises ValueError: If a required column is missing
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    rejects = _RejectWriter(result, rejects_path, ITEM_COLUMNS)
+    batch = []
+    try:
+        for line, row in _read_csv(path, ITEM_COLUMNS, ITEM_REQUIRED, progress):
+            result.rows_read += 1
+            try:
+                batch.append(_validate_item(row))
+            except ValueError as e:
+                rejects.add(line, row, str(e))
+                continue
+            if len(batch) >= batch_size:
+                inserted = _write_items(batch)
+                result.inserted += inserted
+                result.merged += len(batch) - inserted
+                batch = []
+        if batch:
+            inserted = _write_items(batch)
+            result.inserted += inserted
+            result.merged += len(batch) - inserted
+    finally:
+        rejects.close()
+        result.seconds = time.perf_counter() - started
+    return result
+
+
+def _load_item_lookup():
+    """Maps item ID and (name, description, size) to (item ID, purchase price) for every item."""
+    by_id = {}
+    by_identity = {}
+    for item_id, name, description, size, price in get_connection().execute(
+            "SELECT id, name, description, size, price FROM clothing_items"):
+        by_id[item_id] = (item_id, price)
+        by_identity[(name, description, size)] = (item_id, price)
+    return by_id, by_identity
+
+
+def _validate_sale(row, by_id, by_identity):
+    """Turns a CSV row into a sale row for the sales table, or raises ValueError."""
+    if row.get("item_id"):
+        item = by_id.get(_parse_number(row["item_id"], "item_id", int, 1))
+        if item is None:
+            raise ValueError(f"item {row['item_id']} not found")
+    elif row.get("name"):
+        key = (row["name"], row.get("description", ""), row.get("size", ""))
+        item = by_identity.get(key)
+        if item is None:
+            raise ValueError(f"item {' / '.join(key)} not found")
+    else:
+        raise ValueError("item_id or name is required")
+
+    item_id, purchase_price = item
+    quantity = _parse_number(row["quantity"], "quantity", int, 1)
+    unit_price = _parse_number(row["unit_price"], "unit_price")
+    # Calculate total amount and profit if not provided, as add_sale does
+    total_amount = (_parse_number(row["total_amount"], "total_amount") if row.get("total_amount")
+                    else quantity * unit_price)
+    profit = (_parse_number(row["profit"], "profit", float, float("-inf")) if row.get("profit")
+              else (unit_price - (purchase_price or 0)) * quantity)
+    return (_parse_date(row["date"], with_time=True), item_id, quantity, unit_price, total_amount,
+            row.get("payment_method") or "Other", profit, row.get("expense_notes", ""))
+
+
+@retry_on_busy()
+def _write_sales(batch):
+    """
+    Inserts a batch of sale rows and their rollup totals in one transaction,
+    and records the batch's sale IDs in sale_imports.
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.executemany("""
+            INSERT INTO sales (
+                date, item_id, quantity, unit_price,
+                total_amount, payment_method, profit, expense_notes
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, batch)
+        # The write lock is held, so the new IDs are consecutive
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        cursor.execute("INSERT INTO sale_imports (first_id, last_id, imported_at) VALUES (?, ?, ?)",
+                       (last_id - len(batch) + 1, last_id, datetime.now().strftime('%Y-%m-%d %H:%M:%S')))
+        _update_rollup(cursor, [(sale_date, item_id, total, profit, quantity)
+                                for sale_date, item_id, quantity, _, total, _, profit, _ in batch])
+        changes.publish(changes.SALES, changes.RESET)
+
+
+def import_sales_csv(path, rejects_path=None, batch_size=BATCH_SIZE, progress=None):
+    """
+    Streams historic sales from a CSV file into the sales table.
+
+    Each row names its item by item_id or by (name, description, size) and
+    must reference an existing item. Missing total_amount and profit are
+    calculated like add_sale() does; payment_method defaults to "Other".
+    The daily sales rollup is kept up to date, but stock quantities are not
+    changed and no ledger entries are written, since historic sales already
+    happened before the stock count; the imported sale IDs are recorded in
+    sale_imports, so reconcile_stock() leaves them out.
+
+    :param path: CSV file with a header row; see SALE_COLUMNS and SALE_REQUIRED
+    :param rejects_path: Optional CSV file receiving rejected rows with their error
+    :param progress: Optional callable(rows_read, fraction) called as the file is read
+    :return: ImportResult
+    :raises ValueError: If a required column is missing
+    """
+    result = ImportResult()
+    started = time.perf_counter()
+    rejects = _RejectWriter(result, rejects_path, SALE_COLUMNS)
+    by_id, by_identity = _load_item_lookup()
+    batch = []
+    try:
+        for line, row in _read_csv(path, SALE_COLUMNS, SALE_REQUIRED, progress):
+            result.rows_read += 1
+            try:
+                batch.append(_validate_sale(row, by_id, by_identity))
+            except ValueError as e:
+                rejects.add(line, row, str(e))
+                continue
+            if len(batch) >= batch_size:
+                _write_sales(batch)
+                result.inserted += len(batch)
+                batch = []
+        if batch:
+            _write_sales(batch)
+            result.inserted += len(batch)
+    finally:
+        rejects.close()
+        result.seconds = time.perf_counter() - started
+    return result
+
+
+def default_rejects_path(path):
+    """Where the UI and CLI put rejected rows: next to the source file."""
+    root, _ = os.path.splitext(path)
+    return root + ".rejects.csv"
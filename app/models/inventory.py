@@ -1,6 +1,18 @@
-import sqlite3
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QPushButton, QTableWidget, QTableWidgetItem, QHBoxLayout, QMessageBox
+import re
+from datetime import date
+from app.db import get_connection, transaction, after_commit, retry_on_busy
+from app.instrumentation import instrumented
+from app.models.catalogue import catalogue, ItemRecord
+from app.models import changes
+from app.models.stock import record_movements
 
+
+def _record(item_id, item):
+    """ItemRecord for an item dictionary as add_item_to_db()/update_item_in_db() take it."""
+    return ItemRecord(item_id, item['name'], item['category'], item['size'], item['description'],
+                      item['quantity'], item['price'], item['supplier'], item['entry_date'], item['notes'])
+
+@instrumented
 def get_all_items():
     """
     Fetches all clothing items from the database.
@@ -17,98 +29,232 @@ def get_all_items():
     - Entry Date (changed from Expiry Date)
     - Notes
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM clothing_items")
-    items = cursor.fetchall()
-    conn.close()
-    return items
+    cursor = get_connection().execute("SELECT * FROM clothing_items")
+    return cursor.fetchall()
+
+
+@instrumented
+def get_items_page(limit=200, after_id=None):
+    """
+    Fetches one page of clothing items ordered by ID, using keyset pagination.
+    Pass the ID of the last item of the previous page as after_id to get the
+    next page. Returns tuples in the same shape as get_all_items().
+    """
+    cursor = get_connection().execute("""
+        SELECT * FROM clothing_items
+        WHERE id > ?
+        ORDER BY id
+        LIMIT ?
+    """, (after_id if after_id is not None else -1, limit))
+    return cursor.fetchall()
+
+
+@instrumented
+def get_items_by_ids(item_ids):
+    """
+    Fetches the clothing items with the given IDs, in the same shape as
+    get_all_items(). IDs without an item are left out.
+    :param item_ids: Iterable of item IDs
+    :return: List of tuples ordered by ID
+    """
+    item_ids = list(item_ids)
+    rows = []
+    # Bounded number of bound parameters per statement
+    for start in range(0, len(item_ids), 500):
+        chunk = item_ids[start:start + 500]
+        placeholders = ", ".join("?" * len(chunk))
+        rows += get_connection().execute(
+            f"SELECT * FROM clothing_items WHERE id IN ({placeholders})", chunk).fetchall()
+    return sorted(rows)
+
+
+# Relative weight of a match in name, category, description, supplier and notes
+SEARCH_WEIGHTS = (10.0, 4.0, 2.0, 1.0, 1.0)
+# Queries matching more items than this are not ranked (see search_items())
+SEARCH_RANK_LIMIT = 2000
 
 
+def _match_expression(query):
+    """
+    FTS5 MATCH expression requiring every word of query as a word prefix,
+    e.g. 'blue jea' -> '"blue"* "jea"*'. Returns None if query has no words.
+    """
+    words = re.findall(r"\w+", query)
+    if not words:
+        return None
+    # Only word characters are kept, so quoting cannot be broken out of
+    return " ".join(f'"{word}"*' for word in words)
+
+
+@instrumented
+def search_items(query, limit=50):
+    """
+    Full-text search over item name, category, description, supplier and notes.
+    Every word of the query must match the start of a word in one of those
+    columns ("blu jea" finds "Blue Jeans"); case and accents are ignored.
+
+    Results are ranked best match first (bm25, with name matches weighted
+    highest). Ranking has to score every match, so a query matching more than
+    SEARCH_RANK_LIMIT items (e.g. a single letter) returns the first matches
+    by ID instead; the next keystroke narrows it down.
+    :param query: Text typed by the user
+    :param limit: Maximum number of items returned
+    :return: List of tuples in the same shape as get_all_items()
+    """
+    expression = _match_expression(query)
+    if expression is None:
+        return []
+    conn = get_connection()
+    matches = conn.execute("""
+        SELECT COUNT(*) FROM (
+            SELECT rowid FROM clothing_items_fts WHERE clothing_items_fts MATCH ? LIMIT ?
+        )
+    """, (expression, SEARCH_RANK_LIMIT + 1)).fetchone()[0]
+    if matches > SEARCH_RANK_LIMIT:
+        # The index returns matches in ID order, so this needs no sort
+        score, order = "f.rowid", "f.rowid"
+    else:
+        score = "bm25(clothing_items_fts, " + ", ".join(map(str, SEARCH_WEIGHTS)) + ")"
+        order = "score, f.rowid"
+    # Rank inside the index and join only the rows returned
+    cursor = conn.execute(f"""
+        SELECT i.* FROM (
+            SELECT f.rowid AS id, {score} AS score
+            FROM clothing_items_fts f
+            WHERE clothing_items_fts MATCH ?
+            ORDER BY {order}
+            LIMIT ?
+        ) hits
+        JOIN clothing_items i ON i.id = hits.id
+        ORDER BY hits.score, hits.id
+    """, (expression, limit))
+    return cursor.fetchall()
+
+
+@instrumented
+def count_items():
+    """
+    Returns the number of clothing items.
+    """
+    return get_connection().execute("SELECT COUNT(*) FROM clothing_items").fetchone()[0]
+
+
+def iter_items(batch_size=500):
+    """
+    Streams all clothing items ordered by ID, fetching batch_size rows per query
+    so the whole table never has to be held in memory.
+    """
+    after_id = None
+    while True:
+        page = get_items_page(batch_size, after_id)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after_id = page[-1][0]
+
+
+@instrumented
+@retry_on_busy()
 def add_item_to_db(item):
     """
     Adds a new clothing item to the database.
     The item parameter should be a dictionary containing the item data.
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    
-    # Check if a similar item already exists
-    cursor.execute("""
-        SELECT id FROM clothing_items 
-        WHERE name=? AND description=? AND size=?
-    """, (item['name'], item['description'], item['size']))
-    
-    existing = cursor.fetchone()
-    
-    if existing:
-        # Item exists, maybe update quantity instead?
-        cursor.execute("""
-            UPDATE clothing_items
-            SET quantity = quantity + ?
-            WHERE id = ?
-        """, (item['quantity'], existing[0]))
-    else:
-        # Insert new item
+    # IMMEDIATE: the lookup decides between restocking and inserting
+    with transaction(immediate=True) as cursor:
+        # Check if a similar item already exists
         cursor.execute("""
-            INSERT INTO clothing_items (
-                name, category, size, description, quantity, price,
-                supplier, entry_date, notes
-            ) VALUES (
-                :name, :category, :size, :description, :quantity, :price,
-                :supplier, :entry_date, :notes
-            )
-        """, item)
-    
-    conn.commit()
-    conn.close()
+            SELECT id FROM clothing_items 
+            WHERE name=? AND description=? AND size=?
+        """, (item['name'], item['description'], item['size']))
+        
+        existing = cursor.fetchone()
+        
+        if existing:
+            # Item exists, maybe update quantity instead?
+            quantity = cursor.execute("""
+                UPDATE clothing_items
+                SET quantity = quantity + ?
+                WHERE id = ?
+                RETURNING quantity
+            """, (item['quantity'], existing[0])).fetchone()[0]
+            record_movements(cursor, [(existing[0], item['quantity'], date.today().isoformat(), "Restocked")])
+            after_commit(lambda: catalogue.set_quantity(existing[0], quantity))
+            changes.publish(changes.ITEMS, changes.STOCK, [existing[0]])
+        else:
+            # Insert new item
+            cursor.execute("""
+                INSERT INTO clothing_items (
+                    name, category, size, description, quantity, price,
+                    supplier, entry_date, notes
+                ) VALUES (
+                    :name, :category, :size, :description, :quantity, :price,
+                    :supplier, :entry_date, :notes
+                )
+            """, item)
+            record = _record(cursor.lastrowid, item)
+            record_movements(cursor, [(record.id, item['quantity'],
+                                       item['entry_date'] or date.today().isoformat(), "Opening stock")])
+            after_commit(lambda: catalogue.put(record))
+            changes.publish(changes.ITEMS, changes.INSERTED, [record.id])
 
+@instrumented
+@retry_on_busy()
 def delete_item_from_db(item_id):
     """
     Deletes a clothing item from the database.
     The item_id parameter should be the ID of the item to be deleted.
     The function removes the item from the clothing_items table in the database.
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM clothing_items WHERE id=?", (item_id,))
-    conn.commit()
-    conn.close()
+    # IMMEDIATE so the quantity written off is the one deleted
+    with transaction(immediate=True) as cursor:
+        # The stock left goes out of the ledger with the item
+        row = cursor.execute("SELECT quantity FROM clothing_items WHERE id=?", (item_id,)).fetchone()
+        if row and row[0]:
+            record_movements(cursor, [(item_id, -row[0], date.today().isoformat(), "Item deleted")])
+        cursor.execute("DELETE FROM clothing_items WHERE id=?", (item_id,))
+        after_commit(lambda: catalogue.remove(item_id))
+        changes.publish(changes.ITEMS, changes.DELETED, [item_id])
 
 
+@instrumented
 def get_item_by_id(item_id):
     """
     Fetches an item from the database by its ID.
     :param item_id: The ID of the item to fetch.
     :return: A tuple representing the item, or None if not found.
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM clothing_items WHERE id=?", (item_id,))
-    item = cursor.fetchone()
-    conn.close()
-    return item
+    cursor = get_connection().execute("SELECT * FROM clothing_items WHERE id=?", (item_id,))
+    return cursor.fetchone()
 
+@instrumented
+@retry_on_busy()
 def update_item_in_db(item_id, updated_item):
     """
     Updates an item in the database.
     :param item_id: The ID of the item to update.
     :param updated_item: A dictionary containing the updated item data.
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    cursor.execute("""
-        UPDATE clothing_items
-        SET name=:name, 
-            category=:category, 
-            size=:size, 
-            description=:description, 
-            quantity=:quantity, 
-            price=:price, 
-            supplier=:supplier, 
-            entry_date=:entry_date, 
-            notes=:notes
-        WHERE id=:id
-    """, {**updated_item, 'id': item_id})
-    conn.commit()
-    conn.close()
+    # IMMEDIATE so the ledger's adjustment is taken from the quantity replaced
+    with transaction(immediate=True) as cursor:
+        row = cursor.execute("SELECT quantity FROM clothing_items WHERE id=?", (item_id,)).fetchone()
+        cursor.execute("""
+            UPDATE clothing_items
+            SET name=:name, 
+                category=:category, 
+                size=:size, 
+                description=:description, 
+                quantity=:quantity, 
+                price=:price, 
+                supplier=:supplier, 
+                entry_date=:entry_date, 
+                notes=:notes
+            WHERE id=:id
+        """, {**updated_item, 'id': item_id})
+        if cursor.rowcount:
+            # A changed quantity is a stock count correction
+            record_movements(cursor, [(item_id, (updated_item['quantity'] or 0) - (row[0] or 0),
+                                       date.today().isoformat(), "Stock adjustment")])
+            record = _record(item_id, updated_item)
+            after_commit(lambda: catalogue.put(record))
+            changes.publish(changes.ITEMS, changes.UPDATED, [item_id])
@@ -0,0 +1,258 @@
+import time
+from datetime import datetime
+from io import BytesIO
+from app.models.analytics import get_period_summary, summary_totals
+from app.models.sales import iter_sales, get_sales_totals
+
+# Colors of the report, the Sales Book's palette
+REPORT_COLORS = {
+    'primary': '#4A6FA5',
+    'secondary': '#3D7068',
+    'accent': '#D28A7A',
+    'background': '#FFFFFF',
+    'background_light': '#FAF8F5',
+    'header': '#EAE6E1',
+    'border': '#D5CEC8',
+    'text_primary': '#2D3142',
+    'text_secondary': '#6B717E',
+    'profit': '#508569',
+    'loss': '#B95C50',
+}
+
+LEDGER_ROW_HEIGHT = 13   # Points; fixed so a ledger table fills a page exactly
+LEDGER_FETCH_ROWS = 5000  # Sales fetched per query while the ledger is laid out
+REFILL_AT = 8             # Flowables kept queued ahead of the layout engine
+
+# Ledger columns: (header, width in points, max characters, alignment)
+LEDGER_COLUMNS = [
+    ("Date", 95, 19, "LEFT"),
+    ("Item", 170, 34, "LEFT"),
+    ("Qty", 40, 8, "RIGHT"),
+    ("Unit Price", 65, 12, "RIGHT"),
+    ("Total", 70, 14, "RIGHT"),
+    ("Payment", 70, 12, "LEFT"),
+    ("Profit", 70, 14, "RIGHT"),
+    ("Notes", 180, 38, "LEFT"),
+]
+
+
+class _StreamedStory(list):
+    """
+    Flowable list for ReportLab's doc.build() that fills itself from a
+    generator as the layout engine consumes it.
+
+    build() pops flowables off the front and checks len() before each one, so
+    topping the list up in __len__ keeps only REFILL_AT flowables (a few pages
+    of ledger) in memory instead of the whole document.
+    """
+
+    def __init__(self, flowables):
+        super().__init__()
+        self._source = iter(flowables)
+
+    def __len__(self):
+        while self._source is not None and super().__len__() < REFILL_AT:
+            flowable = next(self._source, None)
+            if flowable is None:
+                self._source = None
+            else:
+                self.append(flowable)
+        return super().__len__()
+
+
+def _money(value):
+    return f"${value:,.2f}" if value is not None else ""
+
+
+def _clip(value, limit):
+    """Cuts text to fit a fixed-height ledger cell"""
+    text = "" if value is None else str(value)
+    return text if len(text) <= limit else text[:limit - 1] + "…"
+
+
+def _styles():
+    # ReportLab is imported when a report is built, not when this module is
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+    styles = getSampleStyleSheet()
+    text = colors.HexColor(REPORT_COLORS['text_primary'])
+    return {
+        "title": ParagraphStyle("ReportTitle", parent=styles["Title"], textColor=text, alignment=0),
+        "heading": ParagraphStyle("ReportHeading", parent=styles["Heading2"], textColor=text,
+                                  fontSize=14, leading=18, spaceBefore=0, spaceAfter=6),
+        "body": ParagraphStyle("ReportBody", parent=styles["Normal"],
+                               textColor=colors.HexColor(REPORT_COLORS['text_secondary'])),
+    }
+
+
+def _summary_cards(totals, sale_count):
+    """Summary cards as a one-row table: one colored cell per metric"""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    cards = [
+        ("Total Sales", _money(totals["revenue"]), REPORT_COLORS['primary']),
+        ("Total Profit", _money(totals["profit"]), REPORT_COLORS['profit']),
+        ("Average Margin", f"{totals['margin']:.1f}%", REPORT_COLORS['secondary']),
+        ("Sales", f"{sale_count:,}", REPORT_COLORS['accent']),
+        ("Units Sold", f"{totals['units']:,}", REPORT_COLORS['text_secondary']),
+    ]
+    table = Table([[title for title, _, _ in cards], [value for _, value, _ in cards]],
+                  colWidths=150, rowHeights=(18, 30))
+    style = [
+        ("BACKGROUND", (0, 0), (-1, -1), colors.HexColor(REPORT_COLORS['background_light'])),
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, 0), 9),
+        ("FONTNAME", (0, 1), (-1, 1), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 1), (-1, 1), 16),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+    ]
+    for column, (_, _, color) in enumerate(cards):
+        style += [("LINEBEFORE", (column, 0), (column, 1), 4, colors.HexColor(color)),
+                  ("TEXTCOLOR", (column, 1), (column, 1), colors.HexColor(color))]
+    table.setStyle(TableStyle(style))
+    return table
+
+
+def _period_table(summary):
+    """Per-period figures, as the Summary tab's table shows them"""
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    rows = [["Period", "Total Sales", "Total Profit", "Profit Margin %", "Units", "Sales Moving Avg",
+             "Sales Growth %"]]
+    for period, revenue, profit, margin, units, moving, growth in zip(
+            summary["period"], summary["revenue"], summary["profit"], summary["margin"],
+            summary["units"], summary["revenue_ma"], summary["revenue_growth"]):
+        rows.append([period, _money(revenue), _money(profit), f"{margin:.1f}%", f"{units:,}",
+                     _money(moving), "" if growth != growth else f"{growth:+.1f}%"])
+    table = Table(rows, repeatRows=1, colWidths=(100, 100, 100, 100, 70, 110, 100))
+    table.setStyle(TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(REPORT_COLORS['header'])),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor(REPORT_COLORS['background_light'])]),
+        ("ALIGN", (1, 0), (-1, -1), "RIGHT"),
+        ("LINEBELOW", (0, 0), (-1, 0), 0.5, colors.HexColor(REPORT_COLORS['border'])),
+    ]))
+    return table
+
+
+def _ledger_tables(start_date, end_date, first_rows, rows_per_page, progress, total):
+    """
+    Yields the sales ledger as one table per page, pulling LEDGER_FETCH_ROWS
+    sales at a time from iter_sales(), so only a few pages of rows exist at once.
+    """
+    from reportlab.lib import colors
+    from reportlab.platypus import Table, TableStyle
+    style = TableStyle([
+        ("FONTNAME", (0, 0), (-1, 0), "Helvetica-Bold"),
+        ("FONTSIZE", (0, 0), (-1, -1), 7.5),
+        ("BACKGROUND", (0, 0), (-1, 0), colors.HexColor(REPORT_COLORS['header'])),
+        ("ROWBACKGROUNDS", (0, 1), (-1, -1), [colors.white, colors.HexColor(REPORT_COLORS['background_light'])]),
+        ("VALIGN", (0, 0), (-1, -1), "MIDDLE"),
+        ("TOPPADDING", (0, 0), (-1, -1), 1),
+        ("BOTTOMPADDING", (0, 0), (-1, -1), 1),
+    ] + [("ALIGN", (column, 0), (column, -1), align)
+         for column, (_, _, _, align) in enumerate(LEDGER_COLUMNS)])
+    header = [title for title, _, _, _ in LEDGER_COLUMNS]
+    widths = [width for _, width, _, _ in LEDGER_COLUMNS]
+    limits = [limit for _, _, limit, _ in LEDGER_COLUMNS]
+
+    def table(rows):
+        return Table([header] + rows, colWidths=widths, rowHeights=LEDGER_ROW_HEIGHT,
+                     style=style, repeatRows=1)
+
+    page = []
+    size = first_rows  # The first page also holds the ledger heading
+    done = 0
+    for sale_id, date, item, quantity, unit_price, total_amount, payment, profit, notes in iter_sales(
+            start_date, end_date, batch_size=LEDGER_FETCH_ROWS):
+        cells = (date, item, quantity, _money(unit_price), _money(total_amount), payment,
+                 _money(profit), notes)
+        page.append([_clip(value, limit) for value, limit in zip(cells, limits)])
+        if len(page) == size:
+            done += len(page)
+            if progress is not None:
+                progress(done, done / total if total else None)
+            yield table(page)
+            page = []
+            size = rows_per_page
+    if page or done == 0:
+        yield table(page or [["No sales in this period"] + [""] * (len(LEDGER_COLUMNS) - 1)])
+
+
+def build_sales_report(path, period_type="daily", start_date=None, end_date=None,
+                       include_ledger=True, colors=None, progress=None):
+    """
+    Writes a PDF sales report for a date range: summary cards, the sales
+    trend and margin charts, the per-period figures and the full sales ledger.
+
+    The ledger is generated while ReportLab lays out pages: its rows are pulled
+    from iter_sales() in chunks and turned into one fixed-height table per
+    page, so memory stays bounded however many sales the range holds.
+
+    :param path: Output PDF file
+    :param period_type: "daily", "weekly" or "monthly" periods for the summary
+    :param start_date: Optional start date (YYYY-MM-DD)
+    :param end_date: Optional end date (YYYY-MM-DD)
+    :param include_ledger: Append the sales ledger
+    :param colors: Chart colors; defaults to REPORT_COLORS
+    :param progress: Optional callable(ledger_rows_done, fraction) reported per ledger page
+    :return: Dictionary with pages, ledger rows and seconds
+    """
+    from reportlab.lib.pagesizes import A4, landscape
+    from reportlab.lib.units import cm
+    from reportlab.platypus import BaseDocTemplate, Frame, Image, PageBreak, PageTemplate, Paragraph, Spacer
+    from app.utils.charting import render_summary_png
+
+    started = time.perf_counter()
+    summary = get_period_summary(period_type, start_date, end_date)
+    totals = summary_totals(summary)
+    sale_count = get_sales_totals(start_date, end_date)[0]
+    styles = _styles()
+    period_text = f"{start_date or 'first sale'} to {end_date or 'last sale'}"
+
+    doc = BaseDocTemplate(path, pagesize=landscape(A4), leftMargin=1.5 * cm, rightMargin=1.5 * cm,
+                          topMargin=1.5 * cm, bottomMargin=1.5 * cm, title="Sales Report",
+                          author="InventoLee")
+    padding = 6
+    frame = Frame(doc.leftMargin, doc.bottomMargin, doc.width, doc.height, id="body",
+                  leftPadding=padding, rightPadding=padding, topPadding=padding, bottomPadding=padding)
+
+    def footer(canvas, document):
+        canvas.saveState()
+        canvas.setFont("Helvetica", 8)
+        canvas.setFillColorRGB(0.42, 0.44, 0.49)
+        canvas.drawString(doc.leftMargin, 0.8 * cm, f"InventoLee sales report, {period_text}")
+        canvas.drawRightString(doc.leftMargin + doc.width, 0.8 * cm, f"Page {document.page}")
+        canvas.restoreState()
+
+    doc.addPageTemplates([PageTemplate(id="report", frames=[frame], onPage=footer)])
+
+    # Ledger rows per page: what the frame holds after its padding and the header row
+    rows_per_page = int((doc.height - 2 * padding) // LEDGER_ROW_HEIGHT) - 1
+    heading_rows = int(-(-(styles["heading"].leading + styles["heading"].spaceAfter) // LEDGER_ROW_HEIGHT))
+
+    def story():
+        yield Paragraph("Sales Report", styles["title"])
+        yield Paragraph(f"{period_type.capitalize()} summary, {period_text}. Generated "
+                        f"{datetime.now().strftime('%Y-%m-%d %H:%M')}.", styles["body"])
+        yield Spacer(1, 12)
+        yield _summary_cards(totals, sale_count)
+        yield Spacer(1, 12)
+        if not summary.empty:
+            png = render_summary_png(summary, colors or REPORT_COLORS)
+            yield Image(BytesIO(png), width=doc.width, height=doc.width * 0.45)
+            yield PageBreak()
+            yield Paragraph(f"{period_type.capitalize()} Figures", styles["heading"])
+            yield _period_table(summary)
+        if include_ledger:
+            yield PageBreak()
+            yield Paragraph(f"Sales Ledger ({sale_count:,} sales)", styles["heading"])
+            yield from _ledger_tables(start_date, end_date, rows_per_page - heading_rows,
+                                      rows_per_page, progress, sale_count)
+
+    doc.build(_StreamedStory(story()))
+    if progress is not None:
+        progress(sale_count, 1.0)
+    return {"pages": doc.page, "ledger_rows": sale_count if include_ledger else 0,
+            "seconds": time.perf_counter() - started}
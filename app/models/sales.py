@@ -1,194 +1,530 @@
-import sqlite3
+import heapq
 from datetime import datetime
+from app.db import get_connection, transaction, after_commit, retry_on_busy, fill_sales_rollup, SALES_ROLLUP_SELECT
+from app.instrumentation import instrumented
+from app.models.catalogue import catalogue
+from app.models import changes
+from app.models.stock import record_movements
+from app.models.archive import sales_tables, rollup_source
 
+class InsufficientStockError(ValueError):
+    """
+    Raised when a sale asks for more units than are in stock.
+    Nothing is written when this is raised.
+    
+    :ivar shortages: Dictionary of item_id -> (requested, available)
+    """
+    def __init__(self, shortages):
+        self.shortages = shortages
+        details = "; ".join(f"item {item_id}: requested {requested}, available {available}"
+                            for item_id, (requested, available) in shortages.items())
+        super().__init__(f"Insufficient stock ({details})")
+
+def _update_rollup(cursor, sales, sign=1):
+    """
+    Add (sign=1) or subtract (sign=-1) sales from sales_daily_rollup.
+    Must run in the same transaction as the change to the sales table.
+    
+    :param sales: Iterable of (date, item_id, total_amount, profit, quantity) tuples
+    """
+    cursor.executemany("""
+        INSERT INTO sales_daily_rollup (day, item_id, revenue, profit, units, sale_count)
+        VALUES (substr(:date, 1, 10), IFNULL(:item_id, 0), :revenue, :profit, :units, :count)
+        ON CONFLICT (day, item_id) DO UPDATE SET
+            revenue = revenue + excluded.revenue,
+            profit = profit + excluded.profit,
+            units = units + excluded.units,
+            sale_count = sale_count + excluded.sale_count
+    """, ({'date': date, 'item_id': item_id, 'revenue': sign * total_amount,
+           'profit': sign * (profit or 0), 'units': sign * quantity, 'count': sign}
+          for date, item_id, total_amount, profit, quantity in sales))
+    if sign < 0:
+        cursor.execute("DELETE FROM sales_daily_rollup WHERE sale_count <= 0")
+
+@instrumented
+@retry_on_busy()
 def add_sale(sale_data):
     """
     Add a new sale record to the database.
     
+    The stock check and decrement are a single conditional UPDATE inside a
+    BEGIN IMMEDIATE transaction, so concurrent tills or app instances sharing
+    the database can never oversell or drive quantity negative. The call is
+    retried with backoff if the database stays busy.
+    
     :param sale_data: Dictionary containing sale details
     :return: ID of the newly added sale
+    :raises InsufficientStockError: If the item has fewer units than requested
+    :raises ValueError: If the item does not exist
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    
-    # First get the current item data to calculate profit if not provided
-    cursor.execute("""
-        SELECT price FROM clothing_items WHERE id = ?
-    """, (sale_data['item_id'],))
-    
-    item_data = cursor.fetchone()
-    if not item_data:
-        conn.close()
-        raise ValueError(f"Item with ID {sale_data['item_id']} not found")
-    
-    # Calculate cost price (from inventory)
-    purchase_price = item_data[0]
-    
-    # Calculate total amount if not provided
-    if 'total_amount' not in sale_data:
-        sale_data['total_amount'] = sale_data['quantity'] * sale_data['unit_price']
-    
-    # Calculate profit if not explicitly set
-    if 'profit' not in sale_data or sale_data['profit'] is None:
-        # Profit = (sale price - purchase price) * quantity
-        sale_data['profit'] = (sale_data['unit_price'] - purchase_price) * sale_data['quantity']
-    
-    cursor.execute("""
-        INSERT INTO sales (
-            date, item_id, quantity, unit_price, 
-            total_amount, payment_method, profit, expense_notes
-        ) VALUES (
-            :date, :item_id, :quantity, :unit_price,
-            :total_amount, :payment_method, :profit, :expense_notes
-        )
-    """, sale_data)
+    with transaction(immediate=True) as cursor:
+        # First get the current item data to calculate profit if not provided
+        cursor.execute("""
+            SELECT price, quantity FROM clothing_items WHERE id = ?
+        """, (sale_data['item_id'],))
+        
+        item_data = cursor.fetchone()
+        if not item_data:
+            raise ValueError(f"Item with ID {sale_data['item_id']} not found")
+        
+        # Calculate cost price (from inventory)
+        purchase_price, in_stock = item_data
+        
+        # Update inventory quantity, only if enough stock is left
+        updated = cursor.execute("""
+            UPDATE clothing_items
+            SET quantity = quantity - ?
+            WHERE id = ? AND quantity >= ?
+            RETURNING quantity
+        """, (sale_data['quantity'], sale_data['item_id'], sale_data['quantity'])).fetchone()
+        if updated is None:
+            raise InsufficientStockError({sale_data['item_id']: (sale_data['quantity'], in_stock)})
+        after_commit(lambda: catalogue.set_quantity(sale_data['item_id'], updated[0]))
+        
+        # Calculate total amount if not provided
+        if 'total_amount' not in sale_data:
+            sale_data['total_amount'] = sale_data['quantity'] * sale_data['unit_price']
+        
+        # Calculate profit if not explicitly set
+        if 'profit' not in sale_data or sale_data['profit'] is None:
+            # Profit = (sale price - purchase price) * quantity
+            sale_data['profit'] = (sale_data['unit_price'] - purchase_price) * sale_data['quantity']
+        
+        cursor.execute("""
+            INSERT INTO sales (
+                date, item_id, quantity, unit_price, 
+                total_amount, payment_method, profit, expense_notes
+            ) VALUES (
+                :date, :item_id, :quantity, :unit_price,
+                :total_amount, :payment_method, :profit, :expense_notes
+            )
+        """, sale_data)
+        
+        sale_id = cursor.lastrowid
+        record_movements(cursor, [(sale_data['item_id'], -sale_data['quantity'], sale_data['date'],
+                                   f"Sale #{sale_id}")])
+        
+        # Keep the daily rollup in step with the sales table
+        _update_rollup(cursor, [(sale_data['date'], sale_data['item_id'], sale_data['total_amount'],
+                                 sale_data['profit'], sale_data['quantity'])])
+        changes.publish(changes.SALES, changes.INSERTED, [sale_id])
+        changes.publish(changes.ITEMS, changes.STOCK, [sale_data['item_id']])
     
-    sale_id = cursor.lastrowid
+    return sale_id
+
+@instrumented
+@retry_on_busy()
+def add_sales_batch(sales):
+    """
+    Add several sales (e.g. every line of a basket) in a single transaction.
     
-    # Update inventory quantity
-    cursor.execute("""
-        UPDATE clothing_items
-        SET quantity = quantity - ?
-        WHERE id = ?
-    """, (sale_data['quantity'], sale_data['item_id']))
+    Stock is validated for all lines up front (quantities for the same item are
+    summed), then all sale rows are inserted with executemany and each item's
+    quantity is decremented once. Either every line is recorded or none is.
     
-    conn.commit()
-    conn.close()
-    return sale_id
+    :param sales: List of dictionaries shaped like add_sale()'s sale_data
+    :return: List of the new sale IDs, in the order of sales
+    :raises InsufficientStockError: If any item has fewer units than requested
+    :raises ValueError: If any item does not exist
+    """
+    if not sales:
+        return []
+    
+    # Quantity requested per item across all lines
+    requested = {}
+    for sale in sales:
+        requested[sale['item_id']] = requested.get(sale['item_id'], 0) + sale['quantity']
+    
+    with transaction(immediate=True) as cursor:
+        # Look up price and stock for every item in the basket at once
+        item_ids = list(requested)
+        placeholders = ", ".join("?" * len(item_ids))
+        cursor.execute(f"""
+            SELECT id, price, quantity FROM clothing_items WHERE id IN ({placeholders})
+        """, item_ids)
+        items = {item_id: (price, stock) for item_id, price, stock in cursor.fetchall()}
+        
+        missing = [item_id for item_id in item_ids if item_id not in items]
+        if missing:
+            raise ValueError(f"Items with ID {', '.join(map(str, missing))} not found")
+        
+        shortages = {item_id: (qty, items[item_id][1]) for item_id, qty in requested.items()
+                     if qty > items[item_id][1]}
+        if shortages:
+            raise InsufficientStockError(shortages)
+        
+        rows = []
+        for sale in sales:
+            sale = dict(sale)
+            purchase_price = items[sale['item_id']][0]
+            # Calculate total amount and profit if not provided, as add_sale does
+            if 'total_amount' not in sale:
+                sale['total_amount'] = sale['quantity'] * sale['unit_price']
+            if sale.get('profit') is None:
+                sale['profit'] = (sale['unit_price'] - purchase_price) * sale['quantity']
+            sale.setdefault('expense_notes', None)
+            rows.append(sale)
+        
+        cursor.executemany("""
+            INSERT INTO sales (
+                date, item_id, quantity, unit_price, 
+                total_amount, payment_method, profit, expense_notes
+            ) VALUES (
+                :date, :item_id, :quantity, :unit_price,
+                :total_amount, :payment_method, :profit, :expense_notes
+            )
+        """, rows)
+        
+        # The write lock is held, so the new IDs are consecutive
+        last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        sale_ids = list(range(last_id - len(rows) + 1, last_id + 1))
+        record_movements(cursor, [(r['item_id'], -r['quantity'], r['date'], f"Sale #{sale_id}")
+                                  for r, sale_id in zip(rows, sale_ids)])
+        
+        _update_rollup(cursor, [(r['date'], r['item_id'], r['total_amount'], r['profit'], r['quantity'])
+                                for r in rows])
+        
+        # Update inventory quantities, one statement per distinct item. The
+        # condition never fails under the IMMEDIATE lock, but guards anyway.
+        short = []
+        remaining = {}
+        for item_id, qty in requested.items():
+            updated = cursor.execute("""
+                UPDATE clothing_items
+                SET quantity = quantity - ?
+                WHERE id = ? AND quantity >= ?
+                RETURNING quantity
+            """, (qty, item_id, qty)).fetchone()
+            if updated is None:
+                short.append(item_id)
+            else:
+                remaining[item_id] = updated[0]
+        if short:
+            # The failed updates left these items' quantities as they are
+            cursor.execute(f"""
+                SELECT id, quantity FROM clothing_items WHERE id IN ({", ".join("?" * len(short))})
+            """, short)
+            stock = dict(cursor.fetchall())
+            raise InsufficientStockError({item_id: (requested[item_id], stock.get(item_id, 0))
+                                          for item_id in short})
+        
+        def patch_catalogue():
+            for item_id, quantity in remaining.items():
+                catalogue.set_quantity(item_id, quantity)
+        after_commit(patch_catalogue)
+        changes.publish(changes.SALES, changes.INSERTED, sale_ids)
+        changes.publish(changes.ITEMS, changes.STOCK, requested)
+    
+    return sale_ids
+
+# strftime() format of the period labels of each summary period type
+PERIOD_FORMATS = {
+    "daily": "%Y-%m-%d",
+    "weekly": "%Y-%W",  # Year-Week number, weeks start on Monday
+    "monthly": "%Y-%m",
+}
+
+def _date_filter(column, start_date=None, end_date=None):
+    """
+    Build the WHERE conditions for an optional date range on column.
+    
+    Both ends are whole days, included: the upper bound is the start of the
+    day after end_date, so the same conditions select the same days from
+    sales.date timestamps and from the rollup's plain days. Both are bare
+    comparisons on column, which an index on it serves as a range.
+    
+    :return: (list of SQL conditions, list of parameters)
+    """
+    conditions, params = [], []
+    if start_date:
+        conditions.append(f"{column} >= ?")
+        params.append(start_date)
+    if end_date:
+        conditions.append(f"{column} < date(?, '+1 day')")
+        params.append(end_date)
+    return conditions, params
 
+# Sale records as the listing functions return them, from one sales table
+# (the live one or an archive's, see app.models.archive.sales_tables())
+_SALES_COLUMNS = """
+        SELECT s.id, s.date, i.name, s.quantity, s.unit_price, 
+               s.total_amount, s.payment_method, s.profit, s.expense_notes
+        FROM {table} s
+        JOIN clothing_items i ON s.item_id = i.id
+"""
+
+def _newest_first(results, key):
+    """Merge per-table result lists, each already sorted newest first by key."""
+    if len(results) == 1:
+        return results[0]
+    return list(heapq.merge(*results, key=key, reverse=True))
+
+@instrumented
 def get_all_sales(start_date=None, end_date=None):
     """
     Get all sales records, optionally filtered by date range.
     
+    For large ranges prefer get_sales_page() or iter_sales(), which do not
+    materialize the whole result.
+    
     :param start_date: Optional start date for filtering (YYYY-MM-DD format)
     :param end_date: Optional end date for filtering (YYYY-MM-DD format)
     :return: List of sale records
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
+    conditions, params = _date_filter("s.date", start_date, end_date)
     
-    query = """
-        SELECT s.id, s.date, i.name, s.quantity, s.unit_price, 
-               s.total_amount, s.payment_method, s.profit, s.expense_notes
-        FROM sales s
-        JOIN clothing_items i ON s.item_id = i.id
+    query = _SALES_COLUMNS
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY s.date DESC"
+    
+    conn = get_connection()
+    results = [conn.execute(query.format(table=table), params).fetchall()
+               for table in sales_tables(conn, start_date, end_date)]
+    return _newest_first(results, key=lambda row: row[1])
+
+@instrumented
+def get_sales_page(start_date=None, end_date=None, limit=200, after=None):
     """
+    Get one page of sales records, newest first, using keyset pagination.
     
-    params = []
-    if start_date and end_date:
-        query += " WHERE s.date BETWEEN ? AND ?"
-        params = [start_date, end_date]
-    elif start_date:
-        query += " WHERE s.date >= ?"
-        params = [start_date]
-    elif end_date:
-        query += " WHERE s.date <= ?"
-        params = [end_date]
+    Rows are ordered by (date, id) descending. Pass the (date, id) of the last
+    row of the previous page as `after` to get the next page; the index seeks
+    straight to it, so page N costs the same as page 1.
     
-    query += " ORDER BY s.date DESC"
+    :param start_date: Optional start date for filtering (YYYY-MM-DD format)
+    :param end_date: Optional end date for filtering (YYYY-MM-DD format)
+    :param limit: Maximum number of rows to return
+    :param after: Optional (date, id) cursor of the last row already fetched
+    :return: List of sale records in the same shape as get_all_sales()
     
-    if params:
-        cursor.execute(query, params)
-    else:
-        cursor.execute(query)
-        
-    sales = cursor.fetchall()
-    conn.close()
-    return sales
+    With archived years in the range, each sales table returns its own page
+    and the pages are merged.
+    """
+    conditions, params = _date_filter("s.date", start_date, end_date)
+    if after is not None:
+        after_date, after_id = after
+        # The plain upper bound on date lets the index range stop at the cursor
+        conditions.append("s.date <= ? AND (s.date, s.id) < (?, ?)")
+        params += [after_date, after_date, after_id]
+    
+    query = _SALES_COLUMNS
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY s.date DESC, s.id DESC LIMIT ?"
+    params.append(limit)
+    
+    conn = get_connection()
+    results = [conn.execute(query.format(table=table), params).fetchall()
+               for table in sales_tables(conn, start_date, end_date)]
+    return _newest_first(results, key=lambda row: (row[1], row[0]))[:limit]
+
+@instrumented
+def get_sales_by_ids(sale_ids, start_date=None, end_date=None):
+    """
+    Get the sales records with the given IDs that fall in an optional date range.
+    
+    :param sale_ids: Iterable of sale IDs
+    :param start_date: Optional start date for filtering (YYYY-MM-DD format)
+    :param end_date: Optional end date for filtering (YYYY-MM-DD format)
+    :return: List of sale records in the same shape as get_all_sales(), newest first;
+             IDs without a sale in the range are left out
+    """
+    sale_ids = list(sale_ids)
+    rows = []
+    conn = get_connection()
+    tables = sales_tables(conn, start_date, end_date)
+    # Bounded number of bound parameters per statement
+    for start in range(0, len(sale_ids), 500):
+        chunk = sale_ids[start:start + 500]
+        conditions, params = _date_filter("s.date", start_date, end_date)
+        conditions.append(f"s.id IN ({', '.join('?' * len(chunk))})")
+        query = _SALES_COLUMNS + " WHERE " + " AND ".join(conditions)
+        for table in tables:
+            rows += conn.execute(query.format(table=table), params + chunk).fetchall()
+    rows.sort(key=lambda row: (row[1], row[0]), reverse=True)
+    return rows
+
+def iter_sales(start_date=None, end_date=None, batch_size=500):
+    """
+    Stream sales records, newest first, without loading them all at once.
+    
+    Rows are pulled in keyset pages of batch_size, so no read transaction is
+    held open between batches and memory stays bounded by the batch size.
+    
+    :param start_date: Optional start date for filtering (YYYY-MM-DD format)
+    :param end_date: Optional end date for filtering (YYYY-MM-DD format)
+    :param batch_size: Number of rows fetched per query
+    :return: Generator of sale records
+    """
+    after = None
+    while True:
+        page = get_sales_page(start_date, end_date, batch_size, after)
+        yield from page
+        if len(page) < batch_size:
+            return
+        after = (page[-1][1], page[-1][0])
 
+@instrumented
+def get_sales_totals(start_date=None, end_date=None):
+    """
+    Get the number of sales and their total amount and profit for a date range,
+    aggregated in SQL.
+    
+    :param start_date: Optional start date for filtering (YYYY-MM-DD format)
+    :param end_date: Optional end date for filtering (YYYY-MM-DD format)
+    :return: Tuple of (count, total_amount, total_profit)
+    """
+    conditions, params = _date_filter("s.date", start_date, end_date)
+    
+    # Same join as get_all_sales so the totals match the rows it lists
+    query = """
+        SELECT COUNT(*), COALESCE(SUM(s.total_amount), 0), COALESCE(SUM(s.profit), 0)
+        FROM {table} s
+        JOIN clothing_items i ON s.item_id = i.id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    
+    conn = get_connection()
+    totals = [conn.execute(query.format(table=table), params).fetchone()
+              for table in sales_tables(conn, start_date, end_date)]
+    if len(totals) == 1:
+        return totals[0]
+    return tuple(sum(column) for column in zip(*totals))
+
+@instrumented
 def get_summary(period_type="daily", start_date=None, end_date=None):
     """
     Get sales summary for specified period.
     
+    Aggregates sales_daily_rollup rather than the sales table, so the cost
+    scales with the number of days in the range, not the number of sales.
+    Archived years in the range are read from their archives' rollups.
+    
     :param period_type: Type of summary ("daily", "weekly", "monthly")
     :param start_date: Optional start date for filtering
     :param end_date: Optional end date for filtering
-    :return: Dictionary with summary data
+    :return: List of (period, total_sales, total_profit) tuples
     """
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    
-    # SQL date formatting based on period type
-    if period_type == "daily":
-        date_format = "%Y-%m-%d"
-    elif period_type == "weekly":
-        date_format = "%Y-%W"  # Year-Week number
-    elif period_type == "monthly":
-        date_format = "%Y-%m"
-    else:
-        date_format = "%Y-%m-%d"  # Default to daily
+    # The label format is bound, so the query text only changes with the
+    # date filter and the archives read, not the period type
+    date_format = PERIOD_FORMATS.get(period_type, PERIOD_FORMATS["daily"])
     
+    conn = get_connection()
     query = f"""
         SELECT 
-            strftime('{date_format}', date) as period,
-            SUM(total_amount) as total_sales,
-            SUM(CASE WHEN profit IS NULL THEN 0 ELSE profit END) as total_profit
-        FROM sales
-    """
-    
-    params = []
-    if start_date and end_date:
-        query += " WHERE date BETWEEN ? AND ?"
-        params = [start_date, end_date]
-    elif start_date:
-        query += " WHERE date >= ?"
-        params = [start_date]
-    elif end_date:
-        query += " WHERE date <= ?"
-        params = [end_date]
+            strftime(?, day) as period,
+            SUM(revenue) as total_sales,
+            SUM(profit) as total_profit
+        FROM {rollup_source(conn, start_date, end_date)}
+    """
     
-    query += " GROUP BY period ORDER BY period"
+    conditions, params = _date_filter("day", start_date, end_date)
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
     
-    if params:
-        cursor.execute(query, params)
-    else:
-        cursor.execute(query)
-        
-    summaries = cursor.fetchall()
-    conn.close()
+    query += " GROUP BY period ORDER BY period"
     
-    return summaries
+    cursor = conn.execute(query, [date_format] + params)
+    return cursor.fetchall()
 
+@instrumented
+@retry_on_busy()
 def delete_last_sale():
-    """Delete the most recently added sale and restore inventory"""
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
-    
-    # Get the last sale
-    cursor.execute("""
-        SELECT id, item_id, quantity FROM sales
-        ORDER BY id DESC LIMIT 1
-    """)
-    last_sale = cursor.fetchone()
-    
-    if last_sale:
-        sale_id, item_id, quantity = last_sale
-        
-        # Restore inventory quantity
+    """Delete the most recently added sale and restore inventory (unless it was imported)"""
+    # IMMEDIATE so a till recording a sale meanwhile cannot make "last" stale
+    with transaction(immediate=True) as cursor:
+        # Get the last sale
         cursor.execute("""
-            UPDATE clothing_items
-            SET quantity = quantity + ?
-            WHERE id = ?
-        """, (quantity, item_id))
+            SELECT id, item_id, quantity, date, total_amount, profit FROM sales
+            ORDER BY id DESC LIMIT 1
+        """)
+        last_sale = cursor.fetchone()
         
-        # Delete the sale
-        cursor.execute("DELETE FROM sales WHERE id = ?", (sale_id,))
+        if not last_sale:
+            return False
         
-        conn.commit()
-        conn.close()
-        return True
+        sale_id, item_id, quantity, date, total_amount, profit = last_sale
+        
+        # Imported sales (see import_sales_csv()) never took stock, so there
+        # is nothing to restore
+        imported = cursor.execute("""
+            SELECT last_id >= ? FROM sale_imports
+            WHERE first_id <= ? ORDER BY first_id DESC LIMIT 1
+        """, (sale_id, sale_id)).fetchone()
+        if not (imported and imported[0]):
+            # Restore inventory quantity
+            restored = cursor.execute("""
+                UPDATE clothing_items
+                SET quantity = quantity + ?
+                WHERE id = ?
+                RETURNING quantity
+            """, (quantity, item_id)).fetchone()
+            if restored is not None:
+                after_commit(lambda: catalogue.set_quantity(item_id, restored[0]))
+            # Reverse the sale's ledger entry on its own date, as if it never happened
+            record_movements(cursor, [(item_id, quantity, date, f"Sale #{sale_id} deleted")])
+            changes.publish(changes.ITEMS, changes.STOCK, [item_id])
+        
+        # Delete the sale and take it out of the daily rollup
+        cursor.execute("DELETE FROM sales WHERE id = ?", (sale_id,))
+        _update_rollup(cursor, [(date, item_id, total_amount, profit, quantity)], sign=-1)
+        changes.publish(changes.SALES, changes.DELETED, [sale_id])
     
-    conn.close()
-    return False
+    return True
 
+@instrumented
+@retry_on_busy()
 def delete_all_sales():
-    """Delete all sales (CAUTION: This will not restore inventory)"""
-    conn = sqlite3.connect("inventory.db")
-    cursor = conn.cursor()
+    """Delete all sales in the live database (CAUTION: This will not restore inventory).
+    Archived years are left alone. The stock the sales took stays out of the
+    ledger too, but its entries are relabelled "Deleted sale #<id>", so
+    reconcile_stock() no longer counts them as sales."""
+    with transaction(immediate=True) as cursor:
+        cursor.execute("""
+            UPDATE transactions SET reason = 'Deleted sale #' || substr(reason, 7)
+            WHERE reason LIKE 'Sale #%' AND reason IN (SELECT 'Sale #' || id FROM sales)
+        """)
+        # Delete all sales
+        cursor.execute("DELETE FROM sales")
+        cursor.execute("DELETE FROM sales_daily_rollup")
+        changes.publish(changes.SALES, changes.RESET)
     
-    # Delete all sales
-    cursor.execute("DELETE FROM sales")
+    return True
+
+@instrumented
+def rebuild_sales_rollup():
+    """
+    Recompute sales_daily_rollup from scratch from the sales table.
     
-    conn.commit()
-    conn.close()
-    return True
\ No newline at end of file
+    :return: Number of (day, item) rows in the rebuilt rollup
+    """
+    with transaction(immediate=True) as cursor:
+        return fill_sales_rollup(cursor)
+
+@instrumented
+def check_sales_rollup():
+    """
+    Compare sales_daily_rollup against totals recomputed from the sales table
+    (in the live database; archives are consistent by construction).
+    Amounts are compared to the cent to ignore floating point noise.
+    
+    :return: List of (problem, day, item_id, revenue, profit, units, sale_count) tuples,
+             where problem is "missing" for totals absent from the rollup and
+             "unexpected" for rollup rows that do not match the sales; empty if consistent
+    """
+    cursor = get_connection().execute("""
+        WITH expected AS (
+            SELECT day, item_id, ROUND(revenue, 2), ROUND(profit, 2), units, sale_count
+            FROM (""" + SALES_ROLLUP_SELECT + """)
+        ), actual AS (
+            SELECT day, item_id, ROUND(revenue, 2), ROUND(profit, 2), units, sale_count
+            FROM sales_daily_rollup
+        )
+        SELECT 'missing', * FROM (SELECT * FROM expected EXCEPT SELECT * FROM actual)
+        UNION ALL
+        SELECT 'unexpected', * FROM (SELECT * FROM actual EXCEPT SELECT * FROM expected)
+        ORDER BY 2, 3
+    """)
+    return cursor.fetchall()
@@ -0,0 +1,230 @@
+from datetime import date, timedelta
+from app.db import get_connection, transaction, retry_on_busy
+from app.instrumentation import instrumented
+
+# Stock movement ledger. Every change to clothing_items.quantity is also
+# written to the transactions table, in the same transaction, as an 'in' or
+# 'out' entry with a positive quantity, so an item's quantity always equals
+# the sum of its ledger entries.
+#
+# stock_snapshots holds the balance of every item with stock at the end of a
+# snapshot date (month ends, see refresh_stock_snapshots()). Stock on hand as
+# of a date is the latest snapshot on or before it plus the few entries made
+# after that snapshot, instead of a replay of the whole ledger.
+
+# Signed quantity of a ledger entry
+SIGNED_QUANTITY = "CASE transaction_type WHEN 'in' THEN quantity ELSE -quantity END"
+
+
+def record_movements(cursor, movements):
+    """
+    Write stock movements to the ledger. Must run in the same transaction as
+    the change to clothing_items.quantity.
+
+    Snapshots dated on or after a backdated movement are corrected by its
+    quantity, so they stay valid. Stock taken out before it came in moves
+    the incoming entries back to it (see _backdate_stock_in()).
+
+    :param movements: Iterable of (item_id, change, date, reason) tuples; change is
+                      positive for stock coming in and negative for stock going out,
+                      date is YYYY-MM-DD, optionally followed by a time
+    """
+    movements = [(item_id, change, str(day), reason)
+                 for item_id, change, day, reason in movements if change]
+    if not movements:
+        return
+    cursor.executemany("""
+        INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
+        VALUES (?, ?, ?, ?, ?)
+    """, [(item_id, "in" if change > 0 else "out", abs(change), day, reason)
+          for item_id, change, day, reason in movements])
+    # Finds nothing unless snapshots were taken on or after the movement's date
+    cursor.executemany("""
+        INSERT INTO stock_snapshots (snapshot_date, item_id, quantity)
+        SELECT DISTINCT snapshot_date, ?, ? FROM stock_snapshots
+        WHERE snapshot_date >= substr(?, 1, 10)
+        ON CONFLICT (snapshot_date, item_id) DO UPDATE SET
+            quantity = quantity + excluded.quantity
+    """, [(item_id, change, day) for item_id, change, day, reason in movements])
+    # A backdated outgoing movement may predate the stock it was taken from
+    for item_id, day in {(item_id, day[:10]) for item_id, change, day, reason in movements
+                         if change < 0}:
+        _backdate_stock_in(cursor, item_id, day)
+
+
+def _backdate_stock_in(cursor, item_id, day):
+    """
+    Make sure an item's ledger does not end day with negative stock after a
+    backdated outgoing movement (a sale dated before the item's opening stock
+    or restock entry): its earliest incoming entries dated after day are
+    moved to day, as many as the shortfall needs, since the stock was there
+    to be taken. Snapshots between the two dates are corrected.
+    """
+    until = _next_day(day)
+    while True:
+        # Usually finds nothing: movements are rarely dated before stock came in
+        entry = cursor.execute("""
+            SELECT id, quantity, transaction_date FROM transactions
+            WHERE clothing_item_id = ? AND transaction_date >= ? AND transaction_type = 'in'
+            ORDER BY transaction_date, id LIMIT 1
+        """, (item_id, until)).fetchone()
+        if entry is None:
+            return
+        balance = cursor.execute(f"""
+            SELECT IFNULL(SUM({SIGNED_QUANTITY}), 0) FROM transactions
+            WHERE clothing_item_id = ? AND transaction_date < ?
+        """, (item_id, until)).fetchone()[0]
+        if balance >= 0:
+            return
+        entry_id, quantity, moved_from = entry
+        cursor.execute("UPDATE transactions SET transaction_date = ? WHERE id = ?", (day, entry_id))
+        cursor.execute("""
+            INSERT INTO stock_snapshots (snapshot_date, item_id, quantity)
+            SELECT DISTINCT snapshot_date, ?, ? FROM stock_snapshots
+            WHERE snapshot_date >= ? AND snapshot_date < substr(?, 1, 10)
+            ON CONFLICT (snapshot_date, item_id) DO UPDATE SET
+                quantity = quantity + excluded.quantity
+        """, (item_id, quantity, day, moved_from))
+
+
+def _next_day(day):
+    return (date.fromisoformat(day[:10]) + timedelta(days=1)).isoformat()
+
+
+def _latest_snapshot(conn, as_of):
+    """Date of the latest snapshot taken on or before as_of, or None."""
+    return conn.execute("SELECT MAX(snapshot_date) FROM stock_snapshots WHERE snapshot_date <= ?",
+                        (as_of,)).fetchone()[0]
+
+
+def stock_as_of_query(conn, as_of):
+    """
+    SQL and parameters of a query returning (item_id, quantity) for every item
+    with non-zero stock at the end of as_of, in no particular order. Other
+    queries use it as a subquery.
+    """
+    snapshot = _latest_snapshot(conn, as_of)
+    sql = f"""
+        SELECT item_id, SUM(quantity) AS quantity FROM (
+            SELECT item_id, quantity FROM stock_snapshots WHERE snapshot_date = :snapshot
+            UNION ALL
+            SELECT clothing_item_id, SUM({SIGNED_QUANTITY}) FROM transactions
+            WHERE transaction_date >= :since AND transaction_date < :until
+            GROUP BY clothing_item_id
+        )
+        GROUP BY item_id
+        HAVING SUM(quantity) <> 0
+    """
+    return sql, {'snapshot': snapshot, 'since': _next_day(snapshot) if snapshot else "",
+                 'until': _next_day(as_of)}
+
+
+def _stock_as_of(conn, as_of):
+    sql, params = stock_as_of_query(conn, as_of)
+    return conn.execute(sql + " ORDER BY item_id", params).fetchall()
+
+
+@instrumented
+def get_stock_as_of(as_of):
+    """
+    Stock on hand of every item at the end of a day, from the latest snapshot
+    on or before it plus the ledger entries made since.
+    :param as_of: Date as YYYY-MM-DD
+    :return: List of (item_id, quantity) tuples ordered by item ID; items without stock are left out
+    """
+    return _stock_as_of(get_connection(), as_of)
+
+
+@instrumented
+def get_item_stock_as_of(item_id, as_of):
+    """
+    Stock on hand of one item at the end of a day.
+    :param item_id: ID of the item
+    :param as_of: Date as YYYY-MM-DD
+    :return: Quantity in stock
+    """
+    conn = get_connection()
+    snapshot = _latest_snapshot(conn, as_of)
+    cursor = conn.execute(f"""
+        SELECT IFNULL((SELECT quantity FROM stock_snapshots
+                       WHERE snapshot_date = :snapshot AND item_id = :item_id), 0)
+             + IFNULL((SELECT SUM({SIGNED_QUANTITY}) FROM transactions
+                       WHERE clothing_item_id = :item_id
+                       AND transaction_date >= :since AND transaction_date < :until), 0)
+    """, {'item_id': item_id, 'snapshot': snapshot, 'since': _next_day(snapshot) if snapshot else "",
+          'until': _next_day(as_of)})
+    return cursor.fetchone()[0]
+
+
+@instrumented
+def get_stock_ledger(item_id, start_date=None, end_date=None):
+    """
+    Fetches the ledger entries of one item, oldest first, with the running balance.
+    :param item_id: ID of the item
+    :param start_date: Optional first date (YYYY-MM-DD); the balance carries over from before it
+    :param end_date: Optional last date (YYYY-MM-DD), inclusive
+    :return: List of (id, date, type, quantity, reason, balance) tuples, type being 'in' or 'out'
+    """
+    opening = 0
+    if start_date:
+        day_before = (date.fromisoformat(start_date[:10]) - timedelta(days=1)).isoformat()
+        opening = get_item_stock_as_of(item_id, day_before)
+    cursor = get_connection().execute(f"""
+        SELECT id, transaction_date, transaction_type, quantity, reason,
+               :opening + SUM({SIGNED_QUANTITY}) OVER (ORDER BY transaction_date, id)
+        FROM transactions
+        WHERE clothing_item_id = :item_id
+        AND transaction_date >= :since AND transaction_date < :until
+        ORDER BY transaction_date, id
+    """, {'item_id': item_id, 'opening': opening, 'since': start_date or "",
+          'until': _next_day(end_date) if end_date else "9999"})
+    return cursor.fetchall()
+
+
+@instrumented
+@retry_on_busy()
+def take_stock_snapshot(as_of):
+    """
+    Record the stock on hand of every item at the end of as_of, replacing an
+    earlier snapshot of the same date.
+    :param as_of: Date as YYYY-MM-DD
+    :return: Number of items in the snapshot
+    """
+    with transaction(immediate=True) as cursor:
+        cursor.execute("DELETE FROM stock_snapshots WHERE snapshot_date = ?", (as_of,))
+        balances = _stock_as_of(cursor, as_of)
+        cursor.executemany("""
+            INSERT INTO stock_snapshots (snapshot_date, item_id, quantity) VALUES (?, ?, ?)
+        """, [(as_of, item_id, quantity) for item_id, quantity in balances])
+    return len(balances)
+
+
+def _month_end(day):
+    next_month = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return next_month - timedelta(days=1)
+
+
+@instrumented
+def refresh_stock_snapshots(today=None):
+    """
+    Take the month-end snapshots missing since the latest snapshot (or since
+    the first ledger entry), up to the last month that has ended. Each one is
+    built from the previous one, so catching up is cheap; when up to date this
+    is two index lookups.
+    :param today: Date to count complete months up to (default: today)
+    :return: List of the snapshot dates taken
+    """
+    today = today or date.today()
+    latest, first = get_connection().execute("""
+        SELECT (SELECT MAX(snapshot_date) FROM stock_snapshots),
+               (SELECT MIN(transaction_date) FROM transactions)
+    """).fetchone()
+    if first is None:
+        return []
+    day = date.fromisoformat(_next_day(latest) if latest else first[:10])
+    taken = []
+    while _month_end(day) < today:
+        taken.append(_month_end(day).isoformat())
+        take_stock_snapshot(taken[-1])
+        day = _month_end(day) + timedelta(days=1)
+    return taken
@@ -2,7 +2,6 @@ from PySide6.QtWidgets import (
     QDialog, QVBoxLayout, QLabel, QLineEdit, QPushButton, QHBoxLayout, QSpinBox, QDateEdit, QDoubleSpinBox
 )
 from PySide6.QtCore import QDate
-from app.models.inventory import add_item_to_db
 
 class AddItemDialog(QDialog):
     def __init__(self, parent=None, item=None):
@@ -12,9 +11,9 @@ class AddItemDialog(QDialog):
         self.item_id = None
         
         if isinstance(item, int):
-            # If item is an ID, fetch the item data
-            from app.models.inventory import get_item_by_id
-            self.item_data = get_item_by_id(item)
+            # If item is an ID, look the item up (from memory once the catalogue is loaded)
+            from app.models.catalogue import catalogue
+            self.item_data = catalogue.get(item)
             self.item_id = item
         else:
             self.item_data = item
@@ -97,18 +96,10 @@ class AddItemDialog(QDialog):
             self.notes.setText(str(self.item_data[9]))
     
     def save(self):
-        """Save either updates an existing item or adds a new one"""
-        data = self.get_item_data()
-        
-        if self.item_id:
-            # Update existing item
-            from app.models.inventory import update_item_in_db
-            update_item_in_db(self.item_id, data)
-        else:
-            # Add new item
-            from app.models.inventory import add_item_to_db
-            add_item_to_db(data)
-            
+        """
+        Accept the dialog. The caller reads get_item_data() and performs the
+        add or update itself (off the GUI thread), so the item is written once.
+        """
         self.accept()
     
     def get_item_data(self):
@@ -0,0 +1,77 @@
+from collections import OrderedDict
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+from app.utils.charting import SummaryChart
+
+"""
+Module: charts
+--------------
+
+Matplotlib canvas for the Profit & Loss charts. Importing this module loads
+matplotlib, so views import it only when the charts are first shown.
+
+The charts themselves are drawn by app.utils.charting.SummaryChart, which
+reuses its artists and downsamples long ranges. On top of that the canvas
+caches rendered images by (period type, date range, data version, canvas
+size) and shows them again by blitting, without redrawing.
+
+Classes:
+--------
+- SummaryChartCanvas(FigureCanvasQTAgg): Sales trend and profit margin charts
+  for a get_period_summary() frame.
+
+Methods:
+--------
+- show_summary(): Draws a summary, reusing cached images and artists when possible.
+- clear_cache(): Forgets the cached images.
+"""
+
+
+def _fingerprint(summary):
+    """Version of a summary's data: changes whenever any period's figures change."""
+    columns = summary[["revenue", "profit", "revenue_ma"]].to_numpy()
+    return hash((columns.tobytes(), tuple(summary["period"])))
+
+
+class SummaryChartCanvas(FigureCanvasQTAgg):
+    CACHE_SIZE = 8         # Rendered images kept (about 2 MB each)
+
+    def __init__(self, colors, parent=None):
+        self.colors = colors
+        self.figure = Figure(figsize=(10, 5), facecolor=colors['background'])
+        super().__init__(self.figure)
+        self.setParent(parent)
+        self.setMinimumHeight(260)
+        self.chart = SummaryChart(self.figure, colors)
+        self._cache = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+
+    def clear_cache(self):
+        """Forget every cached image, e.g. after a theme change"""
+        self._cache.clear()
+
+    def show_summary(self, summary, key):
+        """
+        Draw a get_period_summary() frame.
+
+        :param summary: DataFrame with period, revenue, profit, revenue_ma columns
+        :param key: (period_type, start_date, end_date) the summary was computed for
+        """
+        self.chart.plot(summary)
+
+        cache_key = tuple(key) + (_fingerprint(summary), self.width(), self.height())
+        cached = self._cache.get(cache_key)
+        if cached is not None:
+            # Same picture as before: put the pixels back instead of rendering
+            self._cache.move_to_end(cache_key)
+            self.stats["hits"] += 1
+            self.restore_region(cached)
+            self.blit(self.figure.bbox)
+            return
+
+        self.stats["misses"] += 1
+        self.draw()
+        if self.width() > 0 and self.height() > 0:
+            self._cache[cache_key] = self.copy_from_bbox(self.figure.bbox)
+            while len(self._cache) > self.CACHE_SIZE:
+                self._cache.popitem(last=False)
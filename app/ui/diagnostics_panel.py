@@ -0,0 +1,152 @@
+from datetime import datetime
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QTableWidget, QTableWidgetItem,
+                              QHeaderView, QLabel, QPushButton, QDoubleSpinBox, QPlainTextEdit,
+                              QSplitter)
+from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QTimer
+from app import instrumentation
+from app.models.catalogue import catalogue
+
+"""
+Module: diagnostics_panel
+-------------------------
+
+Hidden diagnostics window (Ctrl+Shift+D in the main window) showing the
+timing statistics app.instrumentation collects for every model function,
+plus the most recent slow calls with their SQL and the item catalogue's
+cache counters.
+
+Classes:
+--------
+- DiagnosticsPanel(QDialog): Non-modal window that refreshes the statistics
+  once a second while it is visible.
+
+Methods:
+--------
+- refresh(): Redraws the statistics and slow-call tables.
+- reset(): Clears the collected statistics.
+- show_slow_sql(): Shows the SQL of the selected slow call.
+"""
+
+
+class DiagnosticsPanel(QDialog):
+    COLUMNS = ["Function", "Calls", "Errors", "Slow", "p50 (ms)", "p95 (ms)", "p99 (ms)",
+               "Max (ms)", "Mean (ms)", "Avg rows"]
+    SLOW_COLUMNS = ["Time", "Function", "ms", "Rows", "VM steps"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics - Query Timings")
+        self.resize(900, 600)
+        self.slow_calls = []
+
+        layout = QVBoxLayout(self)
+
+        # Threshold and log location
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Slow-query threshold:"))
+        self.threshold = QDoubleSpinBox()
+        self.threshold.setRange(0, 60000)
+        self.threshold.setSuffix(" ms")
+        self.threshold.setValue(instrumentation.SLOW_QUERY_THRESHOLD_MS)
+        self.threshold.valueChanged.connect(instrumentation.set_slow_query_threshold)
+        controls.addWidget(self.threshold)
+        log = instrumentation.SLOW_QUERY_LOG or "disabled"
+        controls.addWidget(QLabel(f"Log: {log}"))
+        controls.addStretch()
+        reset_btn = QPushButton("Reset")
+        reset_btn.clicked.connect(self.reset)
+        controls.addWidget(reset_btn)
+        layout.addLayout(controls)
+
+        self.catalogue_label = QLabel()
+        layout.addWidget(self.catalogue_label)
+
+        splitter = QSplitter(Qt.Orientation.Vertical)
+
+        # Per-function statistics
+        self.stats_table = self._make_table(self.COLUMNS)
+        splitter.addWidget(self.stats_table)
+
+        # Recent slow calls and the SQL of the selected one
+        self.slow_table = self._make_table(self.SLOW_COLUMNS)
+        self.slow_table.itemSelectionChanged.connect(self.show_slow_sql)
+        splitter.addWidget(self.slow_table)
+
+        self.sql_view = QPlainTextEdit()
+        self.sql_view.setReadOnly(True)
+        self.sql_view.setFont(QFont("Consolas", 9))
+        self.sql_view.setPlaceholderText("Select a slow call to see its SQL")
+        splitter.addWidget(self.sql_view)
+        layout.addWidget(splitter)
+
+        self.timer = QTimer(self)
+        self.timer.setInterval(1000)
+        self.timer.timeout.connect(self.refresh)
+
+    @staticmethod
+    def _make_table(headers):
+        table = QTableWidget(0, len(headers))
+        table.setHorizontalHeaderLabels(headers)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        return table
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self.timer.start()
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        """Redraw both tables from the current statistics"""
+        c = catalogue.snapshot()
+        lookups = c["hits"] + c["misses"]
+        hit_rate = f"{c['hits'] / lookups:.0%}" if lookups else "n/a"
+        self.catalogue_label.setText(
+            f"Item catalogue: {c['items']} items{'' if c['complete'] else ' (partial)'}, "
+            f"{c['hits']} hits, {c['misses']} misses ({hit_rate} hit rate), "
+            f"{c['patches']} patches, {c['clears']} clears")
+
+        stats = instrumentation.get_stats()
+        self.stats_table.setRowCount(len(stats))
+        for row, s in enumerate(stats):
+            avg_rows = "" if s["avg_rows"] is None else f"{s['avg_rows']:.0f}"
+            values = [s["name"], str(s["calls"]), str(s["errors"]), str(s["slow"]),
+                      f"{s['p50_ms']:.2f}", f"{s['p95_ms']:.2f}", f"{s['p99_ms']:.2f}",
+                      f"{s['max_ms']:.2f}", f"{s['mean_ms']:.2f}", avg_rows]
+            for col, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if col:
+                    item.setTextAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+                self.stats_table.setItem(row, col, item)
+
+        slow_calls = instrumentation.get_recent_slow_queries()
+        if slow_calls == self.slow_calls:
+            return  # Keep the selection while nothing new came in
+        self.slow_calls = slow_calls
+        self.slow_table.setRowCount(len(slow_calls))
+        for row, call in enumerate(slow_calls):
+            values = [datetime.fromtimestamp(call["time"]).strftime("%H:%M:%S"),
+                      call["name"] + (" (failed)" if call["failed"] else ""),
+                      f"{call['ms']:.1f}", "" if call["rows"] is None else str(call["rows"]),
+                      f"~{call['steps']}"]
+            for col, value in enumerate(values):
+                self.slow_table.setItem(row, col, QTableWidgetItem(value))
+
+    def show_slow_sql(self):
+        """Show the statements issued by the selected slow call"""
+        row = self.slow_table.currentRow()
+        if 0 <= row < len(self.slow_calls):
+            self.sql_view.setPlainText(";\n\n".join(s.strip() for s in self.slow_calls[row]["sql"]))
+
+    def reset(self):
+        """Forget the collected statistics"""
+        instrumentation.reset_stats()
+        self.sql_view.clear()
+        self.refresh()
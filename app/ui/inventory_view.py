@@ -1,11 +1,16 @@
-from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QTableWidget, 
-                              QTableWidgetItem, QHBoxLayout, QMessageBox, QLabel,
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QPushButton, QTableView,
+                              QHBoxLayout, QMessageBox, QLabel,
                               QHeaderView, QFrame, QSplitter, QSpacerItem, QSizePolicy)
-from PySide6.QtGui import QColor, QBrush, QFont, QIcon, QPalette, QLinearGradient, QPixmap
+from PySide6.QtGui import QFont, QIcon, QPalette, QLinearGradient, QPixmap
 from PySide6.QtCore import Qt, QSize, QPropertyAnimation, QEasingCurve
 from app.ui.add_item_dialog import AddItemDialog
-from app.models.inventory import (delete_item_from_db, get_all_items, add_item_to_db, 
-                                get_item_by_id, update_item_in_db)
+from app.ui.table_models import InventoryTableModel, ActionButtonsDelegate
+from app.ui.workers import DataExecutor, BusyIndicator, change_notifier
+from app.ui.search_box import SearchBox
+from app.models.inventory import delete_item_from_db, add_item_to_db, update_item_in_db
+from app.models.catalogue import catalogue
+from app.models.valuation import get_stock_value_totals
+from app.models import changes
 
 """
 Module: inventory_view
@@ -17,12 +22,17 @@ for displaying and managing inventory items in a colorful, professional table fo
 Classes:
 --------
 - InventoryView(QWidget): A QWidget subclass that displays a table of inventory items with
-  elegant styling and animated buttons for user interaction.
+  elegant styling and painted Edit/Delete buttons for user interaction. The table is a
+  QTableView over an InventoryTableModel, so only the visible rows cost anything.
 
 Methods:
 --------
 - __init__(): Initializes the InventoryView widget with professional styling.
-- load_items(): Populates the table with inventory data and applies styling.
+- load_items(): Reloads the table model with inventory data.
+- load_stock_value(): Shows the total stock value in the status bar.
+- search_items(): Narrows the table to the items matching the search box.
+- on_data_changed(): Patches the rows of items that changed (added, edited, deleted,
+  sold) anywhere in the application, reloading only after bulk changes.
 - edit_item(): Opens dialog to edit an existing inventory item.
 - delete_item(): Prompts for confirmation and deletes an item.
 - show_add_dialog(): Opens dialog to add a new inventory item.
@@ -33,7 +43,11 @@ Dependencies:
 - PySide6.QtWidgets: GUI components
 - PySide6.QtGui: Styling and visual elements
 - PySide6.QtCore: Core functionality for animations and properties
-- app.models.inventory: Functions for database operations
+- app.models.inventory: Functions for database operations, run off the GUI thread
+  through app.ui.workers.DataExecutor
+- app.models.catalogue: In-memory item cache used to open the edit dialog without a query
+- app.models.valuation: Total stock value for the status bar
+- app.models.changes: Change events, received through app.ui.workers.change_notifier()
 """
 
 class StyledButton(QPushButton):
@@ -88,6 +102,9 @@ class InventoryView(QWidget):
         # Set color palette and theme
         self.setup_ui_theme()
         
+        # All database work runs on worker threads through this executor
+        self.executor = DataExecutor(self)
+        
         # Main layout
         self.layout = QVBoxLayout()
         self.layout.setContentsMargins(20, 20, 20, 20)
@@ -134,9 +151,25 @@ class InventoryView(QWidget):
         })
         self.add_button.clicked.connect(self.show_add_dialog)
         
-        # Search field placeholder - could be expanded in future
+        # Search field: filters the table as the user types (full-text, prefix matching)
+        self.search_box = SearchBox("🔍 Search name, category, description, supplier, notes…")
+        self.search_box.setMinimumWidth(320)
+        self.search_box.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {self.colors['background']};
+                border: 1px solid {self.colors['border']};
+                border-radius: 4px;
+                padding: 6px 8px;
+            }}
+            QLineEdit:focus {{
+                border: 1px solid {self.colors['primary']};
+            }}
+        """)
+        self.search_box.search.connect(self.search_items)
+        
         toolbar_layout.addWidget(self.add_button)
         toolbar_layout.addStretch()
+        toolbar_layout.addWidget(self.search_box)
         
         self.layout.addWidget(toolbar_frame)
         
@@ -155,18 +188,39 @@ class InventoryView(QWidget):
         table_layout.setContentsMargins(5, 5, 5, 5)  # Increased from 2,2,2,2
         
         # Inventory Table
-        self.table = QTableWidget()
+        self.model = InventoryTableModel(self, self.executor)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.setFont(QFont("Segoe UI", 9))
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
         self.table.setShowGrid(True)
+        self.table.setMouseTracking(True)  # Hover effect on the painted buttons
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
         self.table.verticalHeader().setVisible(False)
+        # Uniform row height: set once, no per-row setRowHeight loop
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(48)
+        
+        # Set column widths
+        self.table.setColumnWidth(0, 60)  # ID column
+        self.table.setColumnWidth(4, 180)  # Description column - wider for more text
+        self.table.setColumnWidth(5, 60)  # Qty column
+        self.table.setColumnWidth(8, 100)  # Entry Date column
+        self.table.setColumnWidth(9, 160)  # Actions column
+        
+        # Edit and Delete buttons are painted by a delegate instead of a widget per row
+        self.actions_delegate = ActionButtonsDelegate([
+            ("edit", "✏️ Edit", self.colors['edit'], self.colors['edit_hover']),
+            ("delete", "🗑️ Delete", self.colors['delete'], self.colors['delete_hover']),
+        ], self.table)
+        self.actions_delegate.clicked.connect(self.on_action_clicked)
+        self.table.setItemDelegateForColumn(InventoryTableModel.ACTIONS_COLUMN, self.actions_delegate)
         
         # Table styling
         self.table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {self.colors['background_light']};
                 alternate-background-color: {self.colors['background_alt']};
                 border: none;
@@ -174,12 +228,12 @@ class InventoryView(QWidget):
                 gridline-color: {self.colors['border']};
             }}
             
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 12px 8px;  /* Increase padding for more space */
                 border-bottom: 1px solid {self.colors['border']};
             }}
             
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {self.colors['selection']};
                 color: {self.colors['text_primary']};
             }}
@@ -204,15 +258,28 @@ class InventoryView(QWidget):
         status_layout = QHBoxLayout(status_bar)
         status_layout.setContentsMargins(5, 0, 5, 0)
         
-        status_label = QLabel("Ready")
-        status_label.setStyleSheet(f"color: {self.colors['text_secondary']};")
-        status_layout.addWidget(status_label)
+        self.status_label = QLabel("Ready")
+        self.status_label.setStyleSheet(f"color: {self.colors['text_secondary']};")
+        status_layout.addWidget(self.status_label)
         status_layout.addStretch()
         
+        # Total stock value, refreshed whenever items change
+        self.value_label = QLabel()
+        self.value_label.setStyleSheet(f"color: {self.colors['text_secondary']};")
+        status_layout.addWidget(self.value_label)
+        
+        # Busy indicator while queries run in the background
+        self.busy_indicator = BusyIndicator(self.executor, self.colors['primary'])
+        self.busy_indicator.setFixedWidth(120)
+        status_layout.addWidget(self.busy_indicator)
+        self.executor.busy_changed.connect(
+            lambda busy: self.status_label.setText("Loading…" if busy else "Ready"))
+        
         self.layout.addWidget(status_bar)
         
-        # Load items into the table
+        # Load items into the table; afterwards only the rows that change are refreshed
         self.load_items()
+        change_notifier().changed.connect(self.on_data_changed)
 
     def setup_ui_theme(self):
         """
@@ -254,108 +321,70 @@ class InventoryView(QWidget):
 
     def load_items(self):
         """
-        Load inventory items into the table widget with professional styling.
+        Reload inventory items into the table model.
+        Rows are fetched in pages as the table scrolls, and cells are formatted
+        and styled lazily by the model as they are painted.
         """
-        # Fetch all items from the data source
-        items = get_all_items()
-        headers = ["ID", "Name", "Category", "Size", "Description", "Qty", "Price", "Supplier", "Entry Date", "Actions"]
-        self.table.setColumnCount(len(headers))
-        self.table.setHorizontalHeaderLabels(headers)
-        self.table.setRowCount(len(items))
-        
-        # Set column widths
-        self.table.setColumnWidth(0, 60)  # ID column
-        self.table.setColumnWidth(4, 180)  # Description column - wider for more text
-        self.table.setColumnWidth(5, 60)  # Qty column
-        self.table.setColumnWidth(8, 100)  # Entry Date column
-        self.table.setColumnWidth(9, 160)  # Actions column
-        
-        # Set row height for all rows
-        for row in range(self.table.rowCount()):
-            self.table.setRowHeight(row, 48)
-        
-        # Fonts
-        regular_font = QFont("Segoe UI", 9)
-        bold_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
-        
-        for row, item in enumerate(items):
-            # Populate each row with item data
-            for col, value in enumerate(item):
-                if col < len(item):
-                    cell_item = QTableWidgetItem(str(value))
-                    
-                    # Make ID bold
-                    if col == 0:
-                        cell_item.setFont(bold_font)
-                    else:
-                        cell_item.setFont(regular_font)
-                    
-                    # No more special coloring for the color column since it's now description
-                    
-                    # Style quantity - highlight low stock
-                    if col == 5:  # Qty column
-                        qty = int(value) if str(value).isdigit() else 0
-                        if qty <= 5:
-                            cell_item.setForeground(QBrush(QColor("red")))
-                            cell_item.setFont(bold_font)
-                        elif qty <= 10:
-                            cell_item.setForeground(QBrush(QColor("orange")))
-                    
-                    # Format price with currency symbol
-                    if col == 6:  # Price column
-                        try:
-                            price = float(value)
-                            cell_item.setText(f"${price:.2f}")
-                        except:
-                            pass
-                    
-                    self.table.setItem(row, col, cell_item)
+        self.model.reload()
+        self.load_stock_value()
 
-            # Create Edit and Delete buttons
-            button_widget = QWidget()
-            button_layout = QHBoxLayout(button_widget)
-            # Remove all margins to ensure buttons fit within cell boundaries
-            button_layout.setContentsMargins(0, 0, 0, 0)  
-            button_layout.setSpacing(4)  # Reduce spacing between buttons
-            
-            item_id = item[0]
-            
-            # Edit button - make it smaller to fit
-            edit_button = StyledButton("✏️ Edit", color_scheme={
-                "base": self.colors['edit'],
-                "hover": self.colors['edit_hover'],
-                "text": "#FFFFFF"
-            })
-            edit_button.setFixedWidth(75)  # Smaller width
-            edit_button.setFixedHeight(32)  # Smaller height 
-            edit_button.clicked.connect(lambda _, id=item_id: self.edit_item(id))
-            
-            # Delete button - make it smaller to fit
-            delete_button = StyledButton("🗑️ Delete", color_scheme={
-                "base": self.colors['delete'],
-                "hover": self.colors['delete_hover'],
-                "text": "#FFFFFF"
-            })
-            delete_button.setFixedWidth(75)  # Smaller width
-            delete_button.setFixedHeight(32)  # Smaller height
-            delete_button.clicked.connect(lambda _, id=item_id: self.delete_item(id))
-            
-            # Add buttons to layout without stretches that could push them apart
-            button_layout.addWidget(edit_button)
-            button_layout.addWidget(delete_button)
+    def load_stock_value(self):
+        """
+        Recompute the total stock value in the background and show it
+        """
+        self.executor.submit("stock_value", get_stock_value_totals,
+                             on_result=self.show_stock_value, on_error=self.show_db_error)
+
+    def show_stock_value(self, totals):
+        items, units, value = totals
+        self.value_label.setText(f"Stock value: ${value:,.2f}  ({units:,} units of {items:,} items)")
+
+    def search_items(self, query):
+        """
+        Show only the items matching the search box, best match first
+        """
+        self.model.set_search(query)
 
-            # Set fixed size on the container widget to prevent expansion
-            button_widget.setFixedHeight(36)
+    def on_data_changed(self, event):
+        """
+        Apply a committed change event to the table
+        """
+        if event.table != changes.ITEMS:
+            return
+        if event.kind == changes.RESET:
+            self.load_items()
+        else:
+            # Re-reads just these items; an edit, delete or sale touches one row
+            self.model.refresh_rows(event.ids)
+            self.load_stock_value()
 
-            # Add the button widget to the last column of the table
-            self.table.setCellWidget(row, len(headers) - 1, button_widget)
+    def on_action_clicked(self, action, row):
+        """
+        Dispatch a click on one of the painted Edit/Delete buttons
+        """
+        item_id = self.model.item_id_at(row)
+        if action == "edit":
+            self.edit_item(item_id)
+        elif action == "delete":
+            self.delete_item(item_id)
 
     def edit_item(self, item_id):
         """
         Edit item with professional dialog and feedback
         """
-        # Fetch the item details by ID
-        item = get_item_by_id(item_id)
+        # Served from the item catalogue when cached, else fetched by ID in the background
+        item = catalogue.peek(item_id)
+        if item is not None:
+            self.show_edit_dialog(item_id, item)
+            return
+        self.executor.submit(None, catalogue.get, item_id,
+                             on_result=lambda item: self.show_edit_dialog(item_id, item),
+                             on_error=self.show_db_error)
+
+    def show_edit_dialog(self, item_id, item):
+        """
+        Open the edit dialog for an item fetched by edit_item()
+        """
         if not item:
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("Edit Item")
@@ -382,37 +411,41 @@ class InventoryView(QWidget):
             return
 
         # Open the AddItemDialog pre-filled with the item's details
-        dialog = AddItemDialog(self, item=item_id)
+        dialog = AddItemDialog(self, item=item)
         if dialog.exec():
             # If the dialog is accepted, update the item in the database
             updated_item = dialog.get_item_data()
-            update_item_in_db(item_id, updated_item)
-            
-            # Success message
-            msg_box = QMessageBox(self)
-            msg_box.setWindowTitle("Success")
-            msg_box.setIcon(QMessageBox.Icon.Information)
-            msg_box.setText(f"Item with ID: {item_id} updated successfully.")
-            msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
-            msg_box.setStyleSheet(f"""
-                QMessageBox {{
-                    background-color: {self.colors['background_light']};
-                    color: {self.colors['text_primary']};
-                }}
-                QPushButton {{
-                    background-color: {self.colors['primary']};
-                    color: white;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    min-width: 80px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors['primary_light']};
-                }}
-            """)
-            msg_box.exec()
-            
-            self.load_items()  # Reload the table to reflect the changes
+            self.executor.submit(None, update_item_in_db, item_id, updated_item,
+                                 on_result=lambda _: self.item_updated(item_id),
+                                 on_error=self.show_db_error)
+
+    def item_updated(self, item_id):
+        """
+        Confirm a finished update (the row itself is patched by on_data_changed)
+        """
+        # Success message
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Success")
+        msg_box.setIcon(QMessageBox.Icon.Information)
+        msg_box.setText(f"Item with ID: {item_id} updated successfully.")
+        msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msg_box.setStyleSheet(f"""
+            QMessageBox {{
+                background-color: {self.colors['background_light']};
+                color: {self.colors['text_primary']};
+            }}
+            QPushButton {{
+                background-color: {self.colors['primary']};
+                color: white;
+                border-radius: 4px;
+                padding: 6px 12px;
+                min-width: 80px;
+            }}
+            QPushButton:hover {{
+                background-color: {self.colors['primary_light']};
+            }}
+        """)
+        msg_box.exec()
 
     def delete_item(self, item_id):
         """
@@ -456,34 +489,38 @@ class InventoryView(QWidget):
         reply = msg_box.exec()
 
         if reply == QMessageBox.StandardButton.Yes:
-            # Perform the deletion logic
-            delete_item_from_db(item_id)  # Delete the item from the database
-            
-            # Success message
-            success_box = QMessageBox(self)
-            success_box.setWindowTitle("Success")
-            success_box.setIcon(QMessageBox.Icon.Information)
-            success_box.setText(f"Item with ID: {item_id} deleted successfully.")
-            success_box.setStandardButtons(QMessageBox.StandardButton.Ok)
-            success_box.setStyleSheet(f"""
-                QMessageBox {{
-                    background-color: {self.colors['background_light']};
-                    color: {self.colors['text_primary']};
-                }}
-                QPushButton {{
-                    background-color: {self.colors['primary']};
-                    color: white;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    min-width: 80px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors['primary_light']};
-                }}
-            """)
-            success_box.exec()
-            
-            self.load_items()  # Reload the table to reflect the changes
+            # Perform the deletion logic on a worker thread
+            self.executor.submit(None, delete_item_from_db, item_id,
+                                 on_result=lambda _: self.item_deleted(item_id),
+                                 on_error=self.show_db_error)
+
+    def item_deleted(self, item_id):
+        """
+        Confirm a finished deletion (the row itself is removed by on_data_changed)
+        """
+        # Success message
+        success_box = QMessageBox(self)
+        success_box.setWindowTitle("Success")
+        success_box.setIcon(QMessageBox.Icon.Information)
+        success_box.setText(f"Item with ID: {item_id} deleted successfully.")
+        success_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+        success_box.setStyleSheet(f"""
+            QMessageBox {{
+                background-color: {self.colors['background_light']};
+                color: {self.colors['text_primary']};
+            }}
+            QPushButton {{
+                background-color: {self.colors['primary']};
+                color: white;
+                border-radius: 4px;
+                padding: 6px 12px;
+                min-width: 80px;
+            }}
+            QPushButton:hover {{
+                background-color: {self.colors['primary_light']};
+            }}
+        """)
+        success_box.exec()
 
     def show_add_dialog(self):
         """
@@ -492,30 +529,40 @@ class InventoryView(QWidget):
         dialog = AddItemDialog(self)
         if dialog.exec():
             new_item = dialog.get_item_data()
-            add_item_to_db(new_item)
-            
-            # Success message
-            msg_box = QMessageBox(self)
-            msg_box.setWindowTitle("Success")
-            msg_box.setIcon(QMessageBox.Icon.Information)
-            msg_box.setText("New item added successfully.")
-            msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
-            msg_box.setStyleSheet(f"""
-                QMessageBox {{
-                    background-color: {self.colors['background_light']};
-                    color: {self.colors['text_primary']};
-                }}
-                QPushButton {{
-                    background-color: {self.colors['primary']};
-                    color: white;
-                    border-radius: 4px;
-                    padding: 6px 12px;
-                    min-width: 80px;
-                }}
-                QPushButton:hover {{
-                    background-color: {self.colors['primary_light']};
-                }}
-            """)
-            msg_box.exec()
-            
-            self.load_items()
\ No newline at end of file
+            self.executor.submit(None, add_item_to_db, new_item,
+                                 on_result=lambda _: self.item_added(),
+                                 on_error=self.show_db_error)
+
+    def item_added(self):
+        """
+        Confirm a newly added item (the row itself is inserted by on_data_changed)
+        """
+        # Success message
+        msg_box = QMessageBox(self)
+        msg_box.setWindowTitle("Success")
+        msg_box.setIcon(QMessageBox.Icon.Information)
+        msg_box.setText("New item added successfully.")
+        msg_box.setStandardButtons(QMessageBox.StandardButton.Ok)
+        msg_box.setStyleSheet(f"""
+            QMessageBox {{
+                background-color: {self.colors['background_light']};
+                color: {self.colors['text_primary']};
+            }}
+            QPushButton {{
+                background-color: {self.colors['primary']};
+                color: white;
+                border-radius: 4px;
+                padding: 6px 12px;
+                min-width: 80px;
+            }}
+            QPushButton:hover {{
+                background-color: {self.colors['primary_light']};
+            }}
+        """)
+        msg_box.exec()
+
+    def show_db_error(self, error):
+        """
+        Report a failed background database operation
+        """
+        QMessageBox.critical(self, "Database Error", f"The operation could not be completed: {error}")
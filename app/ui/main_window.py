@@ -1,6 +1,35 @@
-from PySide6.QtWidgets import QMainWindow, QLabel, QTabWidget
+import os
+from PySide6.QtWidgets import (QMainWindow, QLabel, QTabWidget, QWidget, QVBoxLayout,
+                               QFileDialog, QMessageBox, QProgressDialog)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QKeySequence, QShortcut
 from app.ui.inventory_view import InventoryView
-from app.ui.sales_view import SalesView  # Add this import
+from app.ui.workers import DataExecutor
+
+class LazyTab(QWidget):
+    """
+    Placeholder tab page that builds its real view the first time it is shown,
+    so the view's module (and whatever it imports) stays out of startup.
+    """
+    def __init__(self, factory, parent=None):
+        super().__init__(parent)
+        self.factory = factory
+        self.view = None
+        self.page_layout = QVBoxLayout(self)
+        self.page_layout.setContentsMargins(0, 0, 0, 0)
+
+    def ensure_loaded(self):
+        """Build the view if it has not been built yet and return it"""
+        if self.view is None:
+            self.view = self.factory()
+            self.page_layout.addWidget(self.view)
+        return self.view
+
+
+def _create_sales_view():
+    from app.ui.sales_view import SalesView
+    return SalesView()
+
 
 class MainWindow(QMainWindow):
     """
@@ -17,7 +46,186 @@ class MainWindow(QMainWindow):
         self.setCentralWidget(self.tabs)
 
         self.inventory_tab = InventoryView()
-        self.sales_tab = SalesView()  # Add this line
+        # The Sales Book (and matplotlib) is only loaded when first opened
+        self.sales_tab = LazyTab(_create_sales_view)
         
         self.tabs.addTab(self.inventory_tab, "🧥 Inventory")
         self.tabs.addTab(self.sales_tab, "💰 Sales Book")  # Add this line
+        self.tabs.currentChanged.connect(self.on_tab_changed)
+
+        # Hidden diagnostics panel with query timings
+        self.diagnostics = None
+        QShortcut(QKeySequence("Ctrl+Shift+D"), self, activated=self.show_diagnostics)
+
+        # CSV bulk imports and exports run on a worker thread with a progress dialog
+        self.executor = DataExecutor(self)
+        self.progress_dialog = None
+        file_menu = self.menuBar().addMenu("&File")
+        file_menu.addAction("Import Items from CSV…", lambda: self.import_csv("items"))
+        file_menu.addAction("Import Sales from CSV…", lambda: self.import_csv("sales"))
+        file_menu.addSeparator()
+        file_menu.addAction("Export Inventory…", lambda: self.export_data("inventory"))
+        file_menu.addAction("Export Sales…", lambda: self.export_data("sales"))
+        file_menu.addAction("Export Summary…", lambda: self.export_data("summary"))
+        file_menu.addAction("Sales Report (PDF)…", self.sales_report)
+        file_menu.addSeparator()
+        file_menu.addAction("Back Up Database", self.backup_database)
+
+        # Take the month-end stock snapshots due since the last start, and a
+        # backup if the last one is over a day old. A failure (e.g. the
+        # database stayed locked) is harmless: the next start catches up.
+        from app.models.stock import refresh_stock_snapshots
+        from app.models.backup import backup_if_due
+        self.executor.submit(None, refresh_stock_snapshots, on_error=lambda error: None)
+        self.executor.submit(None, backup_if_due, on_error=lambda error: None)
+
+    def on_tab_changed(self, index):
+        page = self.tabs.widget(index)
+        if isinstance(page, LazyTab):
+            page.ensure_loaded()
+
+    def show_diagnostics(self):
+        """Open (or raise) the query timing diagnostics panel"""
+        if self.diagnostics is None:
+            from app.ui.diagnostics_panel import DiagnosticsPanel
+            self.diagnostics = DiagnosticsPanel(self)
+        self.diagnostics.show()
+        self.diagnostics.raise_()
+        self.diagnostics.activateWindow()
+
+    def import_csv(self, kind):
+        """Ask for a CSV file and import items or historic sales from it"""
+        title = "Import Items" if kind == "items" else "Import Sales"
+        path, _ = QFileDialog.getOpenFileName(self, title, "", "CSV files (*.csv);;All files (*)")
+        if not path:
+            return
+        # Imported here so the importer stays out of startup
+        from app.models.importer import import_items_csv, import_sales_csv, default_rejects_path
+        import_csv = import_items_csv if kind == "items" else import_sales_csv
+
+        self._open_progress(title, f"Importing {path}…")
+        self.executor.submit(None, import_csv, path, rejects_path=default_rejects_path(path),
+                             on_progress=lambda rows, fraction: self.show_progress(f"{rows} rows read…", fraction),
+                             on_result=lambda result: self.import_finished(title, result),
+                             on_error=lambda error: self.task_failed(title, error))
+
+    def _open_progress(self, title, text):
+        self.progress_dialog = QProgressDialog(text, None, 0, 1000, self)
+        self.progress_dialog.setWindowTitle(title)
+        self.progress_dialog.setWindowModality(Qt.WindowModal)
+        self.progress_dialog.setMinimumDuration(0)
+        self.progress_dialog.setValue(0)
+
+    def show_progress(self, text, fraction):
+        if self.progress_dialog is not None:
+            self.progress_dialog.setLabelText(text)
+            if fraction is None:
+                self.progress_dialog.setRange(0, 0)  # Busy indicator
+            else:
+                self.progress_dialog.setRange(0, 1000)
+                self.progress_dialog.setValue(int(fraction * 1000))
+
+    def _close_progress(self):
+        if self.progress_dialog is not None:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+
+    def import_finished(self, title, result):
+        self._close_progress()
+        message = (f"Read {result.rows_read} rows in {result.seconds:.1f} s.\n\n"
+                   f"Inserted: {result.inserted}\nMerged into existing items: {result.merged}\n"
+                   f"Rejected: {result.rejected}")
+        if result.rejects:
+            message += "\n\n" + "\n".join(f"Line {line}: {error}" for line, error in result.rejects[:5])
+        if result.rejects_path:
+            message += f"\n\nAll rejected rows were written to {result.rejects_path}"
+        box = QMessageBox.warning if result.rejected else QMessageBox.information
+        # The views reload themselves on the import's change events
+        box(self, title, message)
+
+    def export_data(self, kind):
+        """Ask for a file and export the inventory, the sales or the summary to it"""
+        title = f"Export {kind.capitalize()}"
+        path, selected = QFileDialog.getSaveFileName(
+            self, title, f"{kind}.csv",
+            "CSV (*.csv);;Excel workbook (*.xlsx);;Parquet (*.parquet)")
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += "." + selected.split("*.")[-1].rstrip(")")
+        # Imported here so the exporters stay out of startup
+        from app.utils import export
+
+        # Sales and summary follow the Sales Book's filters once it has been opened
+        sales_view = self.sales_tab.view
+        if kind == "inventory":
+            fn, args = export.export_inventory, ()
+        elif kind == "sales":
+            dates = ((sales_view.start_date.date().toString("yyyy-MM-dd"),
+                      sales_view.end_date.date().toString("yyyy-MM-dd")) if sales_view else ())
+            fn, args = export.export_sales, dates
+        else:
+            fn, args = export.export_summary, self._summary_filters()
+
+        self._open_progress(title, f"Exporting to {path}…")
+        self.executor.submit(None, fn, path, *args,
+                             on_progress=lambda rows, fraction: self.show_progress(f"{rows} rows written…", fraction),
+                             on_result=lambda rows: self.export_finished(title, path, rows),
+                             on_error=lambda error: self.task_failed(title, error))
+
+    def _summary_filters(self):
+        """(period type, start, end) of the Sales Book's summary, or all daily history before it is opened"""
+        sales_view = self.sales_tab.view
+        if sales_view is None:
+            return ("daily", None, None)
+        return (sales_view.period_combo.currentText().lower(),
+                sales_view.summary_start_date.date().toString("yyyy-MM-dd"),
+                sales_view.summary_end_date.date().toString("yyyy-MM-dd"))
+
+    def sales_report(self):
+        """Ask for a file and write the PDF sales report for the summary's period to it"""
+        title = "Sales Report"
+        path, _ = QFileDialog.getSaveFileName(self, title, "sales_report.pdf", "PDF (*.pdf)")
+        if not path:
+            return
+        if not os.path.splitext(path)[1]:
+            path += ".pdf"
+        # Imported here: the report pulls in ReportLab and matplotlib
+        from app.models.reports import build_sales_report
+        colors = self.sales_tab.view.colors if self.sales_tab.view is not None else None
+
+        self._open_progress(title, f"Writing {path}…")
+        self.executor.submit(None, build_sales_report, path, *self._summary_filters(), colors=colors,
+                             on_progress=lambda rows, fraction: self.show_progress(f"{rows} ledger rows laid out…", fraction),
+                             on_result=lambda result: self.report_finished(path, result),
+                             on_error=lambda error: self.task_failed(title, error))
+
+    def backup_database(self):
+        """
+        Take a snapshot of the database. Progress goes to the status bar rather
+        than a modal dialog, so sales can go on being entered while it copies.
+        """
+        from app.models.backup import backup_database
+        self.statusBar().showMessage("Backing up the database…")
+        self.executor.submit(None, backup_database,
+                             on_progress=lambda pages, fraction: self.statusBar().showMessage(
+                                 f"Backing up the database… {fraction:.0%}"),
+                             on_result=self.backup_finished,
+                             on_error=lambda error: self.task_failed("Back Up Database", error))
+
+    def backup_finished(self, result):
+        self.statusBar().showMessage(f"Backed up and verified to {result.path} "
+                                     f"({result.size / 1e6:.1f} MB, {result.seconds:.1f} s)", 15000)
+
+    def report_finished(self, path, result):
+        self._close_progress()
+        QMessageBox.information(self, "Sales Report",
+                                f"Wrote {result['pages']} pages to {path} in {result['seconds']:.1f} s")
+
+    def export_finished(self, title, path, rows):
+        self._close_progress()
+        QMessageBox.information(self, title, f"Exported {rows} rows to {path}")
+
+    def task_failed(self, title, error):
+        self._close_progress()
+        QMessageBox.critical(self, title, f"The operation could not be completed: {error}")
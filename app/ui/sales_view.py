@@ -1,16 +1,27 @@
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget,
-                              QTableWidgetItem, QLabel, QComboBox, QDateEdit, QMessageBox,
+                              QTableWidgetItem, QTableView, QLabel, QComboBox, QDateEdit, QMessageBox,
                               QFrame, QHeaderView, QSpinBox, QDoubleSpinBox, QDialog, QFormLayout,
                               QLineEdit, QTabWidget, QStackedWidget, QSplitter, QCheckBox)
 from PySide6.QtGui import QFont, QColor, QBrush
 from PySide6.QtCore import Qt, QDate
 from datetime import datetime, timedelta
-from app.models.sales import add_sale, get_all_sales, get_summary, delete_last_sale, delete_all_sales
-from app.models.inventory import get_all_items, get_item_by_id
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-import numpy as np
+from app.models.sales import InsufficientStockError, add_sale, add_sales_batch, get_sales_totals, delete_last_sale, delete_all_sales
+from app.models.analytics import get_period_summary, summary_totals
+from app.models.catalogue import catalogue
+from app.models.inventory import search_items
+from app.models import changes
+from app.ui.table_models import SalesTableModel
+from app.ui.workers import DataExecutor, BusyIndicator, change_notifier
+from app.ui.search_box import SearchBox
+
+def load_catalogue(executor, on_result, on_error):
+    """Pass the item catalogue to on_result: at once if it is cached, else after loading it on a worker thread"""
+    items = catalogue.peek_all()
+    if items is not None:
+        on_result(items)
+    else:
+        executor.submit("items", catalogue.all_items, on_result=on_result, on_error=on_error)
+
 
 class AddSaleDialog(QDialog):
     def __init__(self, parent=None):
@@ -18,8 +29,12 @@ class AddSaleDialog(QDialog):
         self.setWindowTitle("Add New Sale")
         self.setMinimumWidth(400)
         
-        # Get inventory items for dropdown
-        self.items = get_all_items()
+        # Database work runs on worker threads through this executor
+        self.executor = DataExecutor(self)
+        
+        # Inventory items for dropdown, loaded in the background
+        self.items = []
+        self.items_by_id = {}
         
         # Store the purchase price (from inventory)
         self.purchase_price = 0.0
@@ -33,10 +48,14 @@ class AddSaleDialog(QDialog):
         self.date_edit.setCalendarPopup(True)
         layout.addRow("Date:", self.date_edit)
         
+        # Item search: narrows the dropdown to the best matches as the user types
+        self.search_box = SearchBox("Type to find an item…")
+        self.search_box.search.connect(self.find_items)
+        layout.addRow("Find:", self.search_box)
+        
         # Item selection - update the displayed text to include description instead of color
         self.item_combo = QComboBox()
-        for item in self.items:
-            self.item_combo.addItem(f"{item[1]} - {item[4]} (ID: {item[0]}, Stock: {item[5]}, Cost: ${item[6]:.2f})", item[0])
+        self.item_combo.setPlaceholderText("Loading items…")
         self.item_combo.currentIndexChanged.connect(self.update_price)
         layout.addRow("Item:", self.item_combo)
         
@@ -115,13 +134,52 @@ class AddSaleDialog(QDialog):
         button_layout.addWidget(self.cancel_btn)
         layout.addRow("", button_layout)
         
+        # Busy indicator while items load or the sale is saved
+        layout.addRow(BusyIndicator(self.executor, "#4A6FA5"))
+        
         # Connect signals
         self.save_btn.clicked.connect(self.save_sale)
         self.cancel_btn.clicked.connect(self.reject)
         
+        # Saving is enabled once the items have arrived
+        self.save_btn.setEnabled(False)
+        load_catalogue(self.executor, self.populate_items, self.show_error)
+    
+    def populate_items(self, items):
+        """Fill the item dropdown once the inventory has been loaded"""
+        self.items = items
+        self.items_by_id = {item[0]: item for item in items}
+        if not self.search_box.text().strip():
+            self.show_items(items)
+    
+    def show_items(self, items):
+        """List the given items in the dropdown, selecting the first"""
+        self.item_combo.clear()
+        # Update the displayed text to include description instead of color
+        for item in items:
+            self.item_combo.addItem(f"{item[1]} - {item[4]} (ID: {item[0]}, Stock: {item[5]}, Cost: ${item[6]:.2f})", item[0])
+        
         # Initialize with first item
+        if items:
+            self.item_combo.setCurrentIndex(0)
+        self.save_btn.setEnabled(bool(items))
         self.update_price()
     
+    def find_items(self, query):
+        """Narrow the dropdown to the items matching query (every item when it is empty)"""
+        if not query:
+            self.executor.cancel("search")
+            self.show_items(self.items)
+            return
+        # Full-text search on a worker thread; a newer query interrupts an older one
+        self.executor.submit("search", search_items, query, on_result=self.show_matches,
+                             on_error=self.show_error, interruptible=True)
+    
+    def show_matches(self, items):
+        """Show the results of find_items"""
+        self.items_by_id.update((item[0], item) for item in items)
+        self.show_items(items)
+    
     def toggle_profit_edit(self, state):
         """Toggle whether profit is auto-calculated or manually entered"""
         is_auto = state == Qt.CheckState.Checked.value
@@ -137,7 +195,8 @@ class AddSaleDialog(QDialog):
         # Get selected item ID
         item_id = self.item_combo.currentData()
         if item_id:
-            item = get_item_by_id(item_id)
+            # Served from the items already loaded for the dropdown
+            item = self.items_by_id.get(item_id)
             if item and len(item) > 6:
                 # Store the purchase price from inventory
                 self.purchase_price = item[6]
@@ -167,13 +226,6 @@ class AddSaleDialog(QDialog):
         # Get the selected item ID
         item_id = self.item_combo.currentData()
         
-        # Check if there's enough inventory
-        item = get_item_by_id(item_id)
-        if not item or self.quantity.value() > item[5]:
-            QMessageBox.warning(self, "Insufficient Stock", 
-                               "The requested quantity exceeds available stock.")
-            return
-        
         # Prepare sale data
         sale_data = {
             'date': self.date_edit.date().toString("yyyy-MM-dd"),
@@ -186,12 +238,195 @@ class AddSaleDialog(QDialog):
             'expense_notes': self.notes.text()
         }
         
-        try:
-            # Add sale to database
-            add_sale(sale_data)
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to save sale: {str(e)}")
+        # Add the sale on a worker thread; add_sale() refuses to oversell
+        self.save_btn.setEnabled(False)
+        self.executor.submit(None, add_sale, sale_data,
+                             on_result=lambda _: self.accept(), on_error=self.show_error)
+    
+    def show_error(self, error):
+        """Report a failed background database operation"""
+        self.save_btn.setEnabled(bool(self.items))
+        if isinstance(error, InsufficientStockError):
+            QMessageBox.warning(self, "Insufficient Stock", 
+                               "The requested quantity exceeds available stock.")
+            return
+        QMessageBox.critical(self, "Error", f"Database operation failed: {str(error)}")
+
+
+class CheckoutDialog(QDialog):
+    """
+    Multi-line sale: items are added to a cart and the whole basket is
+    recorded in one transaction with add_sales_batch().
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Checkout")
+        self.setMinimumWidth(640)
+        
+        # Database work runs on worker threads through this executor
+        self.executor = DataExecutor(self)
+        
+        # Inventory items for the item picker, loaded in the background
+        self.items_by_id = {}
+        
+        # Cart lines: dicts with item_id, name, quantity, unit_price
+        self.cart = []
+        
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+        
+        # Sale details shared by all lines
+        details = QFormLayout()
+        self.date_edit = QDateEdit()
+        self.date_edit.setDate(QDate.currentDate())
+        self.date_edit.setCalendarPopup(True)
+        details.addRow("Date:", self.date_edit)
+        
+        self.payment_method = QComboBox()
+        self.payment_method.addItems(["Cash", "Card", "Mobile Money", "Bank Transfer", "Other"])
+        details.addRow("Payment Method:", self.payment_method)
+        
+        self.notes = QLineEdit()
+        details.addRow("Notes:", self.notes)
+        layout.addLayout(details)
+        
+        # Line entry: item, quantity, selling price
+        line_layout = QHBoxLayout()
+        self.item_combo = QComboBox()
+        self.item_combo.setPlaceholderText("Loading items…")
+        self.item_combo.currentIndexChanged.connect(self.update_price)
+        self.quantity = QSpinBox()
+        self.quantity.setMinimum(1)
+        self.quantity.setMaximum(999)
+        self.price = QDoubleSpinBox()
+        self.price.setMinimum(0.01)
+        self.price.setMaximum(9999.99)
+        self.price.setDecimals(2)
+        self.add_line_btn = QPushButton("➕ Add to Cart")
+        self.add_line_btn.setEnabled(False)
+        self.add_line_btn.clicked.connect(self.add_line)
+        line_layout.addWidget(self.item_combo, 1)
+        line_layout.addWidget(QLabel("Qty:"))
+        line_layout.addWidget(self.quantity)
+        line_layout.addWidget(QLabel("Price ($):"))
+        line_layout.addWidget(self.price)
+        line_layout.addWidget(self.add_line_btn)
+        layout.addLayout(line_layout)
+        
+        # Cart
+        self.cart_table = QTableWidget()
+        self.cart_table.setColumnCount(4)
+        self.cart_table.setHorizontalHeaderLabels(["Item", "Quantity", "Unit Price", "Line Total"])
+        self.cart_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
+        self.cart_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.cart_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
+        self.cart_table.verticalHeader().setVisible(False)
+        layout.addWidget(self.cart_table)
+        
+        cart_buttons = QHBoxLayout()
+        remove_btn = QPushButton("Remove Line")
+        remove_btn.clicked.connect(self.remove_line)
+        self.total_label = QLabel("Total: $0.00")
+        self.total_label.setFont(QFont("Segoe UI", 11, QFont.Weight.Bold))
+        cart_buttons.addWidget(remove_btn)
+        cart_buttons.addStretch()
+        cart_buttons.addWidget(self.total_label)
+        layout.addLayout(cart_buttons)
+        
+        # Busy indicator while items load or the basket is saved
+        layout.addWidget(BusyIndicator(self.executor, "#4A6FA5"))
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.checkout_btn = QPushButton("Complete Sale")
+        self.checkout_btn.setEnabled(False)
+        self.cancel_btn = QPushButton("Cancel")
+        button_layout.addWidget(self.checkout_btn)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
+        
+        self.checkout_btn.clicked.connect(self.checkout)
+        self.cancel_btn.clicked.connect(self.reject)
+        
+        load_catalogue(self.executor, self.populate_items, self.show_error)
+    
+    def populate_items(self, items):
+        """Fill the item picker once the inventory has been loaded"""
+        self.items_by_id = {item[0]: item for item in items}
+        for item in items:
+            self.item_combo.addItem(f"{item[1]} - {item[4]} (ID: {item[0]}, Stock: {item[5]})", item[0])
+        self.add_line_btn.setEnabled(bool(items))
+        self.update_price()
+    
+    def update_price(self):
+        """Default the selling price to a 30% markup on the purchase price"""
+        item = self.items_by_id.get(self.item_combo.currentData())
+        if item:
+            self.price.setValue(item[6] * 1.3)
+    
+    def add_line(self):
+        """Add the selected item to the cart, checking against the loaded stock"""
+        item = self.items_by_id.get(self.item_combo.currentData())
+        if not item:
+            return
+        in_cart = sum(line['quantity'] for line in self.cart if line['item_id'] == item[0])
+        if in_cart + self.quantity.value() > item[5]:
+            QMessageBox.warning(self, "Insufficient Stock",
+                               "The requested quantity exceeds available stock.")
+            return
+        self.cart.append({
+            'item_id': item[0],
+            'name': f"{item[1]} - {item[4]}",
+            'quantity': self.quantity.value(),
+            'unit_price': self.price.value(),
+        })
+        self.refresh_cart()
+    
+    def remove_line(self):
+        """Remove the selected cart line"""
+        row = self.cart_table.currentRow()
+        if 0 <= row < len(self.cart):
+            del self.cart[row]
+            self.refresh_cart()
+    
+    def refresh_cart(self):
+        """Redraw the cart table and total"""
+        self.cart_table.setRowCount(len(self.cart))
+        for row, line in enumerate(self.cart):
+            line_total = line['quantity'] * line['unit_price']
+            for col, text in enumerate([line['name'], str(line['quantity']),
+                                        f"${line['unit_price']:.2f}", f"${line_total:.2f}"]):
+                self.cart_table.setItem(row, col, QTableWidgetItem(text))
+        total = sum(line['quantity'] * line['unit_price'] for line in self.cart)
+        self.total_label.setText(f"Total: ${total:.2f}")
+        self.checkout_btn.setEnabled(bool(self.cart))
+    
+    def checkout(self):
+        """Record every cart line in a single transaction"""
+        date = self.date_edit.date().toString("yyyy-MM-dd")
+        sales = [{
+            'date': date,
+            'item_id': line['item_id'],
+            'quantity': line['quantity'],
+            'unit_price': line['unit_price'],
+            'payment_method': self.payment_method.currentText(),
+            'profit': None,  # Calculated from the purchase price
+            'expense_notes': self.notes.text(),
+        } for line in self.cart]
+        
+        self.checkout_btn.setEnabled(False)
+        self.executor.submit(None, add_sales_batch, sales,
+                             on_result=lambda _: self.accept(), on_error=self.show_error)
+    
+    def show_error(self, error):
+        """Report a failed background database operation"""
+        self.checkout_btn.setEnabled(bool(self.cart))
+        if isinstance(error, InsufficientStockError):
+            # Stock was sold elsewhere since the items were loaded
+            QMessageBox.warning(self, "Insufficient Stock",
+                               f"Checkout cancelled, nothing was recorded.\n{str(error)}")
+            return
+        QMessageBox.critical(self, "Error", f"Checkout failed: {str(error)}")
 
 
 class SalesView(QWidget):
@@ -201,6 +436,9 @@ class SalesView(QWidget):
         # Set up theme and colors (similar to inventory view)
         self.setup_ui_theme()
         
+        # All database work runs on worker threads through this executor
+        self.executor = DataExecutor(self)
+        
         # Main layout
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(20, 20, 20, 20)
@@ -223,6 +461,9 @@ class SalesView(QWidget):
         header_layout.addWidget(subtitle_label)
         main_layout.addWidget(header_frame)
         
+        # Busy indicator while queries run in the background
+        main_layout.addWidget(BusyIndicator(self.executor, self.colors['primary']))
+        
         # Tabs for sales table and summary
         self.tabs = QTabWidget()
         
@@ -235,8 +476,13 @@ class SalesView(QWidget):
         self.summary_widget = QWidget()
         self.setup_summary_tab()
         self.tabs.addTab(self.summary_widget, "📊 Profit & Loss")
+        # Charts (and matplotlib) are only built once the summary tab is opened
+        self.tabs.currentChanged.connect(self.on_tab_changed)
         
         main_layout.addWidget(self.tabs)
+        
+        # Sales recorded anywhere are patched into the log as they commit
+        change_notifier().changed.connect(self.on_data_changed)
     
     def setup_ui_theme(self):
         """
@@ -321,6 +567,11 @@ class SalesView(QWidget):
         """)
         add_sale_btn.clicked.connect(self.show_add_sale_dialog)
         
+        # Checkout button for multi-item baskets
+        checkout_btn = QPushButton("🛒 Checkout")
+        checkout_btn.setStyleSheet(add_sale_btn.styleSheet())
+        checkout_btn.clicked.connect(self.show_checkout_dialog)
+        
         # Clear last entry button
         clear_last_btn = QPushButton("🗑️ Clear Last Entry")
         clear_last_btn.setStyleSheet(f"""
@@ -348,6 +599,7 @@ class SalesView(QWidget):
         controls_layout.addWidget(filter_btn)
         controls_layout.addStretch()
         controls_layout.addWidget(add_sale_btn)
+        controls_layout.addWidget(checkout_btn)
         controls_layout.addWidget(clear_last_btn)
         controls_layout.addWidget(clear_all_btn)
         
@@ -364,16 +616,32 @@ class SalesView(QWidget):
         table_layout = QVBoxLayout(table_frame)
         table_layout.setContentsMargins(5, 5, 5, 5)
         
-        self.sales_table = QTableWidget()
+        # Sales are shown through a model that pages rows in as the user scrolls
+        self.sales_model = SalesTableModel(self.colors, self, self.executor)
+        self.sales_table = QTableView()
+        self.sales_table.setModel(self.sales_model)
         self.sales_table.setAlternatingRowColors(True)
-        self.sales_table.setEditTriggers(QTableWidget.EditTrigger.NoEditTriggers)
-        self.sales_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
+        self.sales_table.setEditTriggers(QTableView.EditTrigger.NoEditTriggers)
+        self.sales_table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
         self.sales_table.horizontalHeader().setStretchLastSection(True)
         self.sales_table.verticalHeader().setVisible(False)
+        # Fixed row heights for uniformity
+        self.sales_table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.sales_table.verticalHeader().setDefaultSectionSize(48)
         
-        # Styling
+        # Set column widths
+        self.sales_table.setColumnWidth(0, 50)   # ID
+        self.sales_table.setColumnWidth(1, 100)  # Date
+        self.sales_table.setColumnWidth(2, 180)  # Item
+        self.sales_table.setColumnWidth(3, 80)   # Quantity
+        self.sales_table.setColumnWidth(4, 100)  # Unit Price
+        self.sales_table.setColumnWidth(5, 100)  # Total
+        self.sales_table.setColumnWidth(6, 130)  # Payment Method
+        self.sales_table.setColumnWidth(7, 100)  # Profit
+        
+        # Styling (QTableView selectors also match the QTableWidget summary table)
         self.sales_table.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {self.colors['background_light']};
                 alternate-background-color: {self.colors['background_alt']};
                 border: none;
@@ -381,12 +649,12 @@ class SalesView(QWidget):
                 gridline-color: {self.colors['border']};
             }}
             
-            QTableWidget::item {{
+            QTableView::item {{
                 padding: 12px 8px;
                 border-bottom: 1px solid {self.colors['border']};
             }}
             
-            QTableWidget::item:selected {{
+            QTableView::item:selected {{
                 background-color: {self.colors['selection']};
                 color: {self.colors['text_primary']};
             }}
@@ -499,7 +767,7 @@ class SalesView(QWidget):
         self.load_summary()
     
     def setup_summary_charts(self):
-        """Create and display charts for sales data visualization"""
+        """Create the frame that holds the sales charts; the charts themselves are built by ensure_charts()"""
         # Create chart frame
         chart_frame = QFrame()
         chart_frame.setStyleSheet(f"""
@@ -507,154 +775,76 @@ class SalesView(QWidget):
             border-radius: 8px;
             padding: 8px;
         """)
-        chart_layout = QHBoxLayout(chart_frame)
-        
-        # Create figure with two subplots
-        self.figure = Figure(figsize=(10, 5), facecolor=self.colors['background_light'])
-        self.figure.subplots_adjust(bottom=0.15, wspace=0.3)
-        self.canvas = FigureCanvasQTAgg(self.figure)
-        
-        # Add canvas to layout
-        chart_layout.addWidget(self.canvas)
+        self.chart_layout = QHBoxLayout(chart_frame)
+        self.charts = None
+        self.pending_summary = None
         
         # Return the frame to be added to main layout
         return chart_frame
-
-    def update_charts(self, summaries):
-        """Update charts with the latest summary data"""
-        if not summaries:
+    
+    def on_tab_changed(self, index):
+        if self.tabs.widget(index) is self.summary_widget:
+            self.ensure_charts()
+    
+    def ensure_charts(self):
+        """Create the chart canvas on first use, keeping matplotlib out of startup"""
+        if self.charts is not None:
             return
-            
-        self.figure.clear()
-        
-        # Extract data
-        periods = [s[0] for s in summaries]
-        sales = [s[1] for s in summaries]
-        profits = [s[2] for s in summaries]
-        
-        # Create two subplots
-        ax1 = self.figure.add_subplot(121)  # Sales trend
-        ax2 = self.figure.add_subplot(122)  # Profit margin
-        
-        # Format both axes
-        for ax in [ax1, ax2]:
-            ax.spines['top'].set_visible(False)
-            ax.spines['right'].set_visible(False)
-            ax.tick_params(axis='x', rotation=45)
-            ax.set_facecolor(self.colors['background_light'])
-        
-        # Sales trend chart
-        bars = ax1.bar(periods, sales, color=self.colors['primary'])
-        ax1.set_title('Sales Trend', fontweight='bold', fontsize=12, color=self.colors['text_primary'])
-        ax1.set_ylabel('Total Sales ($)', color=self.colors['text_secondary'])
-        ax1.tick_params(colors=self.colors['text_secondary'])
-
-        # Add value labels to the sales bars too
-        for bar in bars:
-            height = bar.get_height()
-            ax1.annotate(f'${height:.0f}',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8)
+        from app.ui.charts import SummaryChartCanvas
+        
+        self.charts = SummaryChartCanvas(self.colors)
+        self.chart_layout.addWidget(self.charts)
+        
+        # Draw the summary that arrived before the charts existed
+        if self.pending_summary is not None:
+            summary, self.pending_summary = self.pending_summary, None
+            self.update_charts(summary)
 
-        # Profit margin chart
-        margins = [(p/s*100) if s > 0 else 0 for p, s in zip(profits, sales)]
-        colors = [self.colors['profit'] if m >= 0 else self.colors['loss'] for m in margins]
-        
-        bars2 = ax2.bar(periods, margins, color=colors)
-        ax2.set_title('Profit Margin (%)', fontweight='bold', fontsize=12)
-        ax2.set_ylabel('Margin %')
-        
-        # Add value labels
-        for bar in bars2:
-            height = bar.get_height()
-            ax2.annotate(f'{height:.1f}%',
-                        xy=(bar.get_x() + bar.get_width() / 2, height),
-                        xytext=(0, 3),  # 3 points vertical offset
-                        textcoords="offset points",
-                        ha='center', va='bottom',
-                        fontsize=8)
-        
-        # Set better background color for chart
-        self.figure.set_facecolor(self.colors['background'])
-        for ax in [ax1, ax2]:
-            ax.set_facecolor(self.colors['background_light'])
-            ax.spines['bottom'].set_color(self.colors['border'])
-            ax.spines['left'].set_color(self.colors['border'])
-            ax.tick_params(colors=self.colors['text_secondary'])
-        
-        # Refresh canvas
-        self.canvas.draw()
+    def update_charts(self, summary):
+        """Update charts with the latest summary data (a get_period_summary() frame)"""
+        if summary is None or summary.empty:
+            return
+        if self.charts is None:
+            # Summary tab not opened yet: draw when it is
+            self.pending_summary = summary
+            return
+        # Reuses the chart artists, and a cached image if this exact summary was drawn before
+        self.charts.show_summary(summary, self.summary_key)
     
     def load_sales(self):
         # Get date range
         start_date = self.start_date.date().toString("yyyy-MM-dd")
         end_date = self.end_date.date().toString("yyyy-MM-dd")
         
-        # Load sales data
-        sales = get_all_sales(start_date, end_date)
-        
-        # Set up table
-        headers = ["ID", "Date", "Item", "Quantity", "Unit Price", "Total", "Payment Method", "Profit", "Notes"]
-        self.sales_table.setColumnCount(len(headers))
-        self.sales_table.setHorizontalHeaderLabels(headers)
-        self.sales_table.setRowCount(len(sales))
-        
-        # Set column widths
-        self.sales_table.setColumnWidth(0, 50)   # ID
-        self.sales_table.setColumnWidth(1, 100)  # Date
-        self.sales_table.setColumnWidth(2, 180)  # Item
-        self.sales_table.setColumnWidth(3, 80)   # Quantity
-        self.sales_table.setColumnWidth(4, 100)  # Unit Price
-        self.sales_table.setColumnWidth(5, 100)  # Total
-        self.sales_table.setColumnWidth(6, 130)  # Payment Method
-        self.sales_table.setColumnWidth(7, 100)  # Profit
-        
-        # Fonts
-        regular_font = QFont("Segoe UI", 9)
-        bold_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
-        
-        # Fill table with data
-        for row, sale in enumerate(sales):
-            for col, value in enumerate(sale):
-                if value is None:
-                    value = ""
-                
-                cell_item = QTableWidgetItem(str(value))
-                
-                # ID in bold
-                if col == 0:
-                    cell_item.setFont(bold_font)
-                else:
-                    cell_item.setFont(regular_font)
-                
-                # Format prices with $ symbol
-                if col in [4, 5, 7]:  # Unit price, Total, Profit columns
-                    try:
-                        amount = float(value)
-                        cell_item.setText(f"${amount:.2f}")
-                        
-                        # Color profit/loss
-                        if col == 7 and value != "":
-                            if amount >= 0:
-                                cell_item.setForeground(QBrush(QColor(self.colors['profit'])))
-                            else:
-                                cell_item.setForeground(QBrush(QColor(self.colors['loss'])))
-                    except:
-                        pass
-                
-                self.sales_table.setItem(row, col, cell_item)
-            
-        # After creating the rows, set fixed row heights for uniformity
-        for row in range(self.sales_table.rowCount()):
-            self.sales_table.setRowHeight(row, 48)
-        
-        # Show totals in status bar
-        total_sales = sum(sale[5] for sale in sales) if sales else 0
-        total_profit = sum(sale[7] for sale in sales if sale[7] is not None) if sales else 0
+        # Load the first page of sales; further pages are fetched as the table scrolls
+        self.sales_model.set_date_range(start_date, end_date)
+        self.load_sales_totals()
     
+    def load_sales_totals(self):
+        # Totals for the whole range are aggregated in SQL rather than over loaded rows
+        self.executor.submit("sales_totals", get_sales_totals,
+                             self.sales_model.start_date, self.sales_model.end_date,
+                             on_result=self.show_sales_totals, on_error=self.show_db_error,
+                             interruptible=True)
+    
+    def on_data_changed(self, event):
+        """Apply a committed change event to the sales log, its totals and the summary"""
+        if event.table == changes.SALES:
+            if event.kind == changes.RESET:
+                self.load_sales()
+            else:
+                # Only the added or deleted sales are read back into the log
+                self.sales_model.refresh_rows(event.ids)
+                self.load_sales_totals()
+            self.load_summary()
+        elif event.kind in (changes.UPDATED, changes.DELETED, changes.RESET):
+            # The log shows item names, and sales of a deleted item drop out of it
+            self.load_sales()
+    
+    def show_sales_totals(self, totals):
+        """Show the totals computed by load_sales in the status label"""
+        sale_count, total_sales, total_profit = totals
+        
         # Display totals in the status label
         self.status_label.setStyleSheet(f"""
             color: {self.colors['text_primary']}; 
@@ -667,7 +857,7 @@ class SalesView(QWidget):
         
         # Add icons to the status message
         self.status_label.setText(
-            f"📊 Summary: {len(sales)} sales  |  💰 Total Revenue: ${total_sales:.2f}  |  "
+            f"📊 Summary: {sale_count} sales  |  💰 Total Revenue: ${total_sales:.2f}  |  "
             f"{'📈' if total_profit >= 0 else '📉'} Total Profit: ${total_profit:.2f}"
         )
         
@@ -679,61 +869,57 @@ class SalesView(QWidget):
         # Get period type
         period_type = self.period_combo.currentText().lower()
         
-        # Load summary data
-        summaries = get_summary(period_type, start_date, end_date)
-        
+        # Load summary data; a newer request (e.g. the date range changing again)
+        # supersedes one still running
+        self.summary_key = (period_type, start_date, end_date)
+        self.executor.submit("summary", get_period_summary, period_type, start_date, end_date,
+                             on_result=self.show_summary, on_error=self.show_db_error,
+                             interruptible=True)
+    
+    def show_summary(self, summary):
+        """Fill the summary table, cards and charts with the frame computed by load_summary"""
         # Set up table
-        headers = ["Period", "Total Sales", "Total Profit", "Profit Margin %"]
+        headers = ["Period", "Total Sales", "Total Profit", "Profit Margin %", "Units",
+                   "Sales Moving Avg", "Sales Growth %"]
         self.summary_table.setColumnCount(len(headers))
         self.summary_table.setHorizontalHeaderLabels(headers)
-        self.summary_table.setRowCount(len(summaries))
+        self.summary_table.setRowCount(len(summary))
         
         # Set column widths
-        self.summary_table.setColumnWidth(0, 120)  # Period
-        self.summary_table.setColumnWidth(1, 120)  # Total Sales
-        self.summary_table.setColumnWidth(2, 120)  # Total Profit
-        self.summary_table.setColumnWidth(3, 120)  # Margin
-        
-        # Fill table with data
-        for row, summary in enumerate(summaries):
-            period, total_sales, total_profit = summary
-            
-            # Period
-            period_item = QTableWidgetItem(period)
-            self.summary_table.setItem(row, 0, period_item)
-            
-            # Total Sales
-            sales_item = QTableWidgetItem(f"${total_sales:.2f}")
-            self.summary_table.setItem(row, 1, sales_item)
-            
-            # Total Profit
-            profit_item = QTableWidgetItem(f"${total_profit:.2f}")
-            if total_profit >= 0:
-                profit_item.setForeground(QBrush(QColor(self.colors['profit'])))
-            else:
-                profit_item.setForeground(QBrush(QColor(self.colors['loss'])))
-            self.summary_table.setItem(row, 2, profit_item)
-            
-            # Profit Margin %
-            margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
-            margin_item = QTableWidgetItem(f"{margin:.1f}%")
-            if margin >= 0:
-                margin_item.setForeground(QBrush(QColor(self.colors['profit'])))
-            else:
-                margin_item.setForeground(QBrush(QColor(self.colors['loss'])))
-            self.summary_table.setItem(row, 3, margin_item)
+        for col in range(len(headers)):
+            self.summary_table.setColumnWidth(col, 120)
+        
+        # Format every column at once; only the widgets are created per cell
+        profit_brush = QBrush(QColor(self.colors['profit']))
+        loss_brush = QBrush(QColor(self.colors['loss']))
+        columns = [
+            (summary["period"], None),
+            (summary["revenue"].map("${:.2f}".format), None),
+            (summary["profit"].map("${:.2f}".format), summary["profit"] >= 0),
+            (summary["margin"].map("{:.1f}%".format), summary["margin"] >= 0),
+            (summary["units"].astype(str), None),
+            (summary["revenue_ma"].map("${:.2f}".format), None),
+            (summary["revenue_growth"].map("{:+.1f}%".format).where(summary["revenue_growth"].notna(), "—"),
+             summary["revenue_growth"].fillna(0) >= 0),
+        ]
+        for col, (texts, positive) in enumerate(columns):
+            texts = texts.to_numpy()
+            positive = None if positive is None else positive.to_numpy()
+            for row in range(len(texts)):
+                item = QTableWidgetItem(texts[row])
+                if positive is not None:
+                    item.setForeground(profit_brush if positive[row] else loss_brush)
+                self.summary_table.setItem(row, col, item)
             
         # After populating the summary table, update cards and charts
     
         # Calculate totals for cards
-        total_sales = sum(summary[1] for summary in summaries) if summaries else 0
-        total_profit = sum(summary[2] for summary in summaries) if summaries else 0
-        avg_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
+        totals = summary_totals(summary)
         
         # Update cards
-        self.card_values["sales"].setText(f"${total_sales:.2f}")
-        self.card_values["profit"].setText(f"${total_profit:.2f}")
-        self.card_values["margin"].setText(f"{avg_margin:.1f}%")
+        self.card_values["sales"].setText(f"${totals['revenue']:.2f}")
+        self.card_values["profit"].setText(f"${totals['profit']:.2f}")
+        self.card_values["margin"].setText(f"{totals['margin']:.1f}%")
         
         # Update subtitles
         period_type = self.period_combo.currentText()
@@ -742,7 +928,7 @@ class SalesView(QWidget):
             self.card_values[key].setText(f"{period_type} totals • {date_range}")
         
         # Update charts
-        self.update_charts(summaries)
+        self.update_charts(summary)
     
     def add_summary_cards(self):
         """Add elegant info cards at the top of summary tab"""
@@ -829,10 +1015,7 @@ class SalesView(QWidget):
         """Display dialog to add a new sale"""
         dialog = AddSaleDialog(self)
         if dialog.exec():
-            # Refresh the sales view after adding a sale
-            self.load_sales()
-            
-            # Show success message
+            # Show success message (the sale reaches the log through on_data_changed)
             msg_box = QMessageBox(self)
             msg_box.setWindowTitle("Success")
             msg_box.setIcon(QMessageBox.Icon.Information)
@@ -856,6 +1039,13 @@ class SalesView(QWidget):
             """)
             msg_box.exec()
 
+    def show_checkout_dialog(self):
+        """Display dialog to ring up a multi-item sale"""
+        dialog = CheckoutDialog(self)
+        if dialog.exec():
+            # The new sales reach the log through on_data_changed
+            QMessageBox.information(self, "Success", f"Sale with {len(dialog.cart)} lines recorded successfully.")
+
     def clear_last_entry(self):
         """Clear the last sales entry and restore inventory"""
         msg_box = QMessageBox(self)
@@ -893,18 +1083,16 @@ class SalesView(QWidget):
         
         reply = msg_box.exec()
         if reply == QMessageBox.StandardButton.Yes:
-            success = delete_last_sale()
-            
-            if success:
-                # Show success message
-                QMessageBox.information(self, "Success", "Last sale entry deleted successfully.")
-                
-                # Refresh both tables
-                self.load_sales()
-                if hasattr(self, 'load_summary'):
-                    self.load_summary()
-            else:
-                QMessageBox.warning(self, "Warning", "No sales found to delete.")
+            self.executor.submit(None, delete_last_sale,
+                                 on_result=self.last_entry_cleared, on_error=self.show_db_error)
+    
+    def last_entry_cleared(self, success):
+        """Report the result of clear_last_entry"""
+        if success:
+            # Show success message (the log and summary follow through on_data_changed)
+            QMessageBox.information(self, "Success", "Last sale entry deleted successfully.")
+        else:
+            QMessageBox.warning(self, "Warning", "No sales found to delete.")
 
     def clear_all_entries(self):
         """Clear all sales entries (with strong warning)"""
@@ -920,15 +1108,17 @@ class SalesView(QWidget):
                                        "Type 'DELETE' to confirm deletion of all sales:")
         
         if ok and text == "DELETE":
-            success = delete_all_sales()
-            
-            if success:
-                # Show success message
-                QMessageBox.information(self, "Success", "All sales data has been deleted.")
-                
-                # Refresh both tables
-                self.load_sales()
-                if hasattr(self, 'load_summary'):
-                    self.load_summary()
+            self.executor.submit(None, delete_all_sales,
+                                 on_result=self.all_entries_cleared, on_error=self.show_db_error)
         elif ok:
-            QMessageBox.warning(self, "Cancelled", "Delete operation cancelled - confirmation text didn't match.")
\ No newline at end of file
+            QMessageBox.warning(self, "Cancelled", "Delete operation cancelled - confirmation text didn't match.")
+    
+    def all_entries_cleared(self, success):
+        """Report the result of clear_all_entries"""
+        if success:
+            # Show success message (the log and summary follow through on_data_changed)
+            QMessageBox.information(self, "Success", "All sales data has been deleted.")
+    
+    def show_db_error(self, error):
+        """Report a failed background database operation"""
+        QMessageBox.critical(self, "Database Error", f"The operation could not be completed: {error}")
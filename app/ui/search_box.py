@@ -0,0 +1,49 @@
+from PySide6.QtWidgets import QLineEdit
+from PySide6.QtCore import QTimer, Signal
+
+"""
+Module: search_box
+------------------
+
+Search field for search-as-you-type. Queries are debounced: the search
+signal is emitted once typing pauses, so a fast typist causes one query
+instead of one per keystroke (and a superseded query still running is
+interrupted by the view's DataExecutor).
+
+Classes:
+--------
+- SearchBox(QLineEdit): Line edit emitting search(text) DELAY_MS after the last edit.
+"""
+
+
+class SearchBox(QLineEdit):
+    search = Signal(str)  # Stripped text; empty when the search was cleared
+
+    DELAY_MS = 250
+
+    def __init__(self, placeholder="Search…", parent=None):
+        super().__init__(parent)
+        self.setPlaceholderText(placeholder)
+        self.setClearButtonEnabled(True)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(self.DELAY_MS)
+        self._timer.timeout.connect(self._emit_search)
+        self._last = ""
+        self.textChanged.connect(self._edited)
+        # Enter searches at once
+        self.returnPressed.connect(self._emit_search)
+
+    def _edited(self, text):
+        if not text.strip():
+            # Clearing takes effect at once
+            self._emit_search()
+        else:
+            self._timer.start()
+
+    def _emit_search(self):
+        self._timer.stop()
+        text = self.text().strip()
+        if text != self._last:
+            self._last = text
+            self.search.emit(text)
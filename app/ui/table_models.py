@@ -0,0 +1,428 @@
+from PySide6.QtWidgets import QStyledItemDelegate, QStyle
+from PySide6.QtGui import QColor, QBrush, QFont, QPainter
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex, QRect, QEvent, Signal
+from app.models.inventory import get_items_page, get_items_by_ids, search_items
+from app.models.sales import get_sales_page, get_sales_by_ids
+
+"""
+Module: table_models
+--------------------
+
+Model/view building blocks for the data tables. Instead of creating a
+QTableWidgetItem per cell and a widget per row, the views hand the data to a
+QAbstractTableModel and Qt only asks for the cells that are actually on
+screen. Rows are pulled from the database in keyset pages as the user
+scrolls, so large tables are never materialized up front. After a change
+only the affected rows are re-read and patched in place (refresh_rows()).
+
+Classes:
+--------
+- PagedTableModel(QAbstractTableModel): Base model that loads rows page by page via fetchMore().
+- InventoryTableModel(PagedTableModel): Read-only model over clothing_items rows, or
+  over the results of a full-text search.
+- SalesTableModel(PagedTableModel): Read-only model over sales rows in a date range.
+- ActionButtonsDelegate(QStyledItemDelegate): Paints Edit/Delete buttons into a
+  cell and reports clicks as signals, so rows need no child widgets.
+"""
+
+
+class PagedTableModel(QAbstractTableModel):
+    """
+    Base table model whose rows are fetched lazily, one keyset page at a time.
+
+    Subclasses define HEADERS, fetch_page(after, limit) returning the next rows
+    after the given cursor (None for the first page), page_cursor(row)
+    returning the cursor value of a fetched row, and fetch_rows(ids) returning
+    the current rows for some row IDs (the first column). Rows are kept in
+    cursor order, ascending or, with DESCENDING, descending. The view calls
+    fetchMore() as the user scrolls towards the end of what is loaded. When an
+    executor (see app.ui.workers.DataExecutor) is given, pages are fetched on
+    a worker thread and appended when they arrive.
+
+    refresh_rows(ids) re-reads only the given rows and updates, inserts or
+    removes them at their sorted position, so a change costs the same however
+    many rows are loaded. It falls back to reload() when more than PAGE_SIZE
+    rows change at once, or when a page was being fetched while the change
+    happened (that page may predate it).
+    """
+    HEADERS = []
+    PAGE_SIZE = 200
+    DESCENDING = False
+
+    def __init__(self, parent=None, executor=None):
+        super().__init__(parent)
+        self.executor = executor
+        self._rows = []
+        self._by_id = {}        # Row ID -> loaded row
+        self._exhausted = True
+        self._fetching = False
+        self._page_stale = False  # A change arrived while a page was in flight
+        self._stale_ids = set()   # IDs waiting to be re-read by refresh_rows()
+        self._patching = False    # A fetch_rows() request is in flight
+        self._generation = 0      # Bumped by reload(), to drop patches read for older rows
+        self.stats = {"patched": 0, "reloads": 0}
+
+    def fetch_page(self, after, limit):
+        raise NotImplementedError
+
+    def page_cursor(self, row):
+        raise NotImplementedError
+
+    def fetch_rows(self, ids):
+        raise NotImplementedError
+
+    def reload(self):
+        """Discard the loaded rows and fetch the first page again."""
+        self.beginResetModel()
+        self._rows = []
+        self._by_id = {}
+        self._exhausted = False
+        self._fetching = False
+        self._page_stale = False
+        self._stale_ids.clear()
+        self._generation += 1
+        self.stats["reloads"] += 1
+        self.endResetModel()
+        self.fetchMore()
+
+    def refresh_rows(self, ids):
+        """
+        Re-read the rows with the given IDs (changed, inserted or deleted) and
+        patch them into the loaded rows. Requests made while one is in flight
+        are merged into the next.
+        """
+        self._stale_ids.update(ids)
+        if self._fetching:
+            self._page_stale = True
+        if len(self._stale_ids) > self.PAGE_SIZE:
+            self.reload()
+            return
+        if self._patching or not self._stale_ids:
+            return
+        ids = list(self._stale_ids)
+        self._stale_ids.clear()
+        if self.executor is None:
+            self._apply_rows(self._generation, ids, self.fetch_rows(ids))
+            return
+        self._patching = True
+        generation = self._generation
+        self.executor.submit(None, self.fetch_rows, ids,
+                             on_result=lambda rows: self._patch_done(generation, ids, rows),
+                             on_error=lambda error: self._patch_done(generation, ids, None))
+
+    def _patch_done(self, generation, ids, rows):
+        self._patching = False
+        if rows is None:
+            # Could not read the rows back: show the table as the database has it
+            self.reload()
+            return
+        self._apply_rows(generation, ids, rows)
+        if self._stale_ids:
+            self.refresh_rows(())
+
+    def _apply_rows(self, generation, ids, rows):
+        if generation != self._generation:
+            return  # Reloaded since: the new pages are newer than these rows
+        current = {row[0]: row for row in rows}
+        last_column = len(self.HEADERS) - 1
+        for row_id in ids:
+            new = current.get(row_id)
+            old = self._by_id.pop(row_id, None)
+            if old is not None:
+                position = self._position(self.page_cursor(old))
+                if new is not None and self.page_cursor(new) == self.page_cursor(old):
+                    # Same place in the order: update the cells in place
+                    self._rows[position] = self._by_id[row_id] = new
+                    self.dataChanged.emit(self.index(position, 0), self.index(position, last_column))
+                    continue
+                self.beginRemoveRows(QModelIndex(), position, position)
+                del self._rows[position]
+                self.endRemoveRows()
+            if new is not None:
+                position = self._position(self.page_cursor(new))
+                if position == len(self._rows) and not self._exhausted:
+                    continue  # Past the loaded pages: it arrives with a later page
+                self.beginInsertRows(QModelIndex(), position, position)
+                self._rows.insert(position, new)
+                self._by_id[row_id] = new
+                self.endInsertRows()
+        self.stats["patched"] += len(ids)
+
+    def _position(self, cursor):
+        """Index of the first loaded row that does not sort before cursor (binary search)."""
+        low, high = 0, len(self._rows)
+        while low < high:
+            middle = (low + high) // 2
+            value = self.page_cursor(self._rows[middle])
+            if (value > cursor) if self.DESCENDING else (value < cursor):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def row_at(self, row):
+        """Return the raw database row shown in the given table row."""
+        return self._rows[row]
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and not self._exhausted
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._exhausted or self._fetching:
+            return
+        after = self.page_cursor(self._rows[-1]) if self._rows else None
+        if self.executor is None:
+            self._append_page(self.fetch_page(after, self.PAGE_SIZE))
+            return
+        # A reload supersedes any page still in flight for this model
+        self._fetching = True
+        self.executor.submit(("page", id(self)), self.fetch_page, after, self.PAGE_SIZE,
+                             on_result=self._append_page, interruptible=True)
+
+    def _append_page(self, page):
+        self._fetching = False
+        if self._page_stale:
+            # The page may have been read before a change that was patched in meanwhile
+            self.reload()
+            return
+        if len(page) < self.PAGE_SIZE:
+            self._exhausted = True
+        page = [row for row in page if row[0] not in self._by_id]
+        if page:
+            first = len(self._rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(page) - 1)
+            self._rows.extend(page)
+            self._by_id.update((row[0], row) for row in page)
+            self.endInsertRows()
+
+
+class InventoryTableModel(PagedTableModel):
+    """
+    Table model over clothing_items rows, paged by ID, or over the best
+    SEARCH_LIMIT matches of a search_items() query once set_search() is given one.
+    The last column holds no data; it is painted by ActionButtonsDelegate.
+    """
+    HEADERS = ["ID", "Name", "Category", "Size", "Description", "Qty", "Price", "Supplier", "Entry Date", "Actions"]
+    QTY_COLUMN = 5
+    PRICE_COLUMN = 6
+    ACTIONS_COLUMN = 9
+    SEARCH_LIMIT = 200
+
+    def __init__(self, parent=None, executor=None):
+        super().__init__(parent, executor)
+        self.search = ""
+        self._regular_font = QFont("Segoe UI", 9)
+        self._bold_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self._red = QBrush(QColor("red"))
+        self._orange = QBrush(QColor("orange"))
+
+    def set_search(self, query):
+        """Show the items matching query, best match first, or every item if it is empty."""
+        self.search = query
+        self.reload()
+
+    def fetch_page(self, after, limit):
+        if self.search:
+            # Search results arrive as a single ranked page
+            return search_items(self.search, self.SEARCH_LIMIT) if after is None else []
+        return get_items_page(limit, after)
+
+    def refresh_rows(self, ids):
+        if self.search:
+            # Ranked results are not in ID order: run the search again instead of patching
+            self.reload()
+        else:
+            super().refresh_rows(ids)
+
+    def page_cursor(self, row):
+        return row[0]
+
+    def fetch_rows(self, ids):
+        return get_items_by_ids(ids)
+
+    def item_id_at(self, row):
+        """Return the item ID shown in the given row."""
+        return self._rows[row][0]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        col = index.column()
+        if col == self.ACTIONS_COLUMN:
+            return None
+        value = self._rows[index.row()][col]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            # Format price with currency symbol
+            if col == self.PRICE_COLUMN:
+                try:
+                    return f"${float(value):.2f}"
+                except (TypeError, ValueError):
+                    pass
+            return str(value)
+
+        if role == Qt.ItemDataRole.FontRole:
+            # Make ID and low stock quantities bold
+            if col == 0 or (col == self.QTY_COLUMN and self._qty(value) <= 5):
+                return self._bold_font
+            return self._regular_font
+
+        if role == Qt.ItemDataRole.ForegroundRole and col == self.QTY_COLUMN:
+            # Style quantity - highlight low stock
+            qty = self._qty(value)
+            if qty <= 5:
+                return self._red
+            if qty <= 10:
+                return self._orange
+
+        return None
+
+    @staticmethod
+    def _qty(value):
+        return int(value) if str(value).isdigit() else 0
+
+
+class SalesTableModel(PagedTableModel):
+    """
+    Table model over the sales in a date range, newest first, paged on (date, id).
+    Rows have the shape returned by get_sales_page().
+    """
+    HEADERS = ["ID", "Date", "Item", "Quantity", "Unit Price", "Total", "Payment Method", "Profit", "Notes"]
+    DESCENDING = True
+    MONEY_COLUMNS = (4, 5, 7)
+    PROFIT_COLUMN = 7
+
+    def __init__(self, colors, parent=None, executor=None):
+        super().__init__(parent, executor)
+        self.start_date = None
+        self.end_date = None
+        self._regular_font = QFont("Segoe UI", 9)
+        self._bold_font = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self._profit = QBrush(QColor(colors['profit']))
+        self._loss = QBrush(QColor(colors['loss']))
+
+    def set_date_range(self, start_date, end_date):
+        """Show the sales between start_date and end_date (YYYY-MM-DD), reloading from the first page."""
+        self.start_date = start_date
+        self.end_date = end_date
+        self.reload()
+
+    def fetch_page(self, after, limit):
+        return get_sales_page(self.start_date, self.end_date, limit, after)
+
+    def page_cursor(self, row):
+        return (row[1], row[0])
+
+    def fetch_rows(self, ids):
+        return get_sales_by_ids(ids, self.start_date, self.end_date)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        col = index.column()
+        value = self._rows[index.row()][col]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if value is None:
+                return ""
+            # Format prices with $ symbol
+            if col in self.MONEY_COLUMNS:
+                try:
+                    return f"${float(value):.2f}"
+                except (TypeError, ValueError):
+                    pass
+            return str(value)
+
+        if role == Qt.ItemDataRole.FontRole:
+            # ID in bold
+            return self._bold_font if col == 0 else self._regular_font
+
+        if role == Qt.ItemDataRole.ForegroundRole and col == self.PROFIT_COLUMN and value is not None:
+            # Color profit/loss
+            try:
+                return self._profit if float(value) >= 0 else self._loss
+            except (TypeError, ValueError):
+                pass
+
+        return None
+
+
+class ActionButtonsDelegate(QStyledItemDelegate):
+    """
+    Paints a row of flat buttons (e.g. Edit and Delete) inside a table cell.
+
+    Nothing is instantiated per row: the buttons are drawn in paint() and a
+    click is mapped back to the button under the cursor in editorEvent(), which
+    emits clicked(button_key, row). Enable mouse tracking on the view to get
+    hover highlighting.
+    """
+    clicked = Signal(str, int)
+
+    BUTTON_WIDTH = 75
+    BUTTON_HEIGHT = 32
+    SPACING = 4
+
+    def __init__(self, buttons, parent=None):
+        """
+        :param buttons: List of (key, label, base_color, hover_color) tuples, painted left to right.
+        """
+        super().__init__(parent)
+        self.buttons = buttons
+        self._font = QFont("Segoe UI", 9, QFont.Weight.Medium)
+        self._hover = None  # (row, key) under the mouse
+
+    def _button_rects(self, cell):
+        """Yield (key, label, base, hover, rect) for each button centered in cell."""
+        total = len(self.buttons) * self.BUTTON_WIDTH + (len(self.buttons) - 1) * self.SPACING
+        x = cell.x() + max(0, (cell.width() - total) // 2)
+        y = cell.y() + (cell.height() - self.BUTTON_HEIGHT) // 2
+        for key, label, base, hover in self.buttons:
+            yield key, label, base, hover, QRect(x, y, self.BUTTON_WIDTH, self.BUTTON_HEIGHT)
+            x += self.BUTTON_WIDTH + self.SPACING
+
+    def paint(self, painter, option, index):
+        if option.state & QStyle.StateFlag.State_Selected:
+            painter.fillRect(option.rect, option.palette.highlight())
+
+        painter.save()
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+        painter.setFont(self._font)
+        for key, label, base, hover, rect in self._button_rects(option.rect):
+            color = hover if self._hover == (index.row(), key) else base
+            painter.setBrush(QColor(color))
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("#FFFFFF"))
+            painter.drawText(rect, Qt.AlignmentFlag.AlignCenter, label)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.Type.MouseMove, QEvent.Type.MouseButtonRelease):
+            return False
+
+        pos = event.position().toPoint()
+        key = next((k for k, _, _, _, rect in self._button_rects(option.rect) if rect.contains(pos)), None)
+
+        if event.type() == QEvent.Type.MouseMove:
+            hover = (index.row(), key) if key else None
+            if hover != self._hover:
+                self._hover = hover
+                # Repaint the cell so the hover color follows the mouse
+                self.parent().viewport().update()
+            return False
+
+        if key and event.button() == Qt.MouseButton.LeftButton:
+            self.clicked.emit(key, index.row())
+            return True
+        return False
@@ -0,0 +1,234 @@
+import itertools
+import threading
+from PySide6.QtWidgets import QProgressBar
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+from app.db import get_connection
+from app.models import changes
+
+"""
+Module: workers
+---------------
+
+Runs database calls off the GUI thread. Views hand a model function to a
+DataExecutor, which runs it on Qt's global thread pool and calls back on the
+GUI thread with the result, so the window keeps repainting while queries run.
+Pool threads do not expire, and each keeps one SQLite connection (see
+app.db.get_connection()) for every task it runs.
+
+Classes:
+--------
+- DataExecutor(QObject): Submits model calls to the thread pool, supersedes
+  stale requests and reports when work is in flight via busy_changed.
+- BusyIndicator(QProgressBar): Thin indeterminate bar shown while an executor is busy.
+- ChangeNotifier(QObject): Delivers committed data changes (app.models.changes)
+  to the GUI thread as a Qt signal; change_notifier() returns the shared instance.
+"""
+
+
+class _TaskSignals(QObject):
+    finished = Signal(int, object)  # (token, result)
+    failed = Signal(int, object)    # (token, exception)
+    progress = Signal(int, object)  # (token, (done, fraction))
+
+
+class _DbTask(QRunnable):
+    """Runs fn(*args, **kwargs) on a pool thread and reports back through signals."""
+
+    def __init__(self, token, fn, args, kwargs, interruptible):
+        super().__init__()
+        self.setAutoDelete(False)
+        self.token = token
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.interruptible = interruptible
+        self.signals = _TaskSignals()
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def run(self):
+        with self._lock:
+            self._conn = get_connection()
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(self.token, e)
+        else:
+            self.signals.finished.emit(self.token, result)
+        finally:
+            with self._lock:
+                self._conn = None
+
+    def report_progress(self, done, fraction=None):
+        """Passed to fn as progress=; safe to call from the worker thread."""
+        self.signals.progress.emit(self.token, (done, fraction))
+
+    def interrupt(self):
+        """Abort the SQL statement this task is running, if it is still running."""
+        if not self.interruptible:
+            return
+        with self._lock:
+            if self._conn is not None:
+                self._conn.interrupt()
+
+
+class DataExecutor(QObject):
+    """
+    Runs model functions on the global QThreadPool and delivers their results
+    to callbacks on the GUI thread.
+
+    Requests submitted under the same key supersede each other: a queued
+    request that has not started yet is dropped, a running one is interrupted
+    if it was submitted as interruptible (use this for reads only), and in any
+    case only the result of the newest request for a key is delivered. Requests
+    without a key (e.g. writes) always run to completion.
+    """
+    busy_changed = Signal(bool)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool.globalInstance()
+        # Idle threads would otherwise exit after 30 s, and connections are
+        # per thread: keep the threads, and with them their connections,
+        # prepared statements and attached archives
+        self.pool.setExpiryTimeout(-1)
+        self._tokens = itertools.count(1)
+        self._pending = {}  # token -> (key, task, on_result, on_error)
+        self._progress = {}  # token -> on_progress
+        self._latest = {}   # key -> token of the newest request
+
+    @property
+    def busy(self):
+        return bool(self._pending)
+
+    def submit(self, key, fn, *args, on_result=None, on_error=None, on_progress=None,
+               interruptible=False, **kwargs):
+        """
+        Run fn(*args, **kwargs) on a worker thread.
+
+        :param key: Requests with the same key supersede each other; None never does.
+        :param on_result: Called on the GUI thread with the return value.
+        :param on_error: Called on the GUI thread with the exception if fn raised.
+        :param on_progress: If given, fn is also passed progress=callable(done, fraction=None),
+                            and each report reaches on_progress(done, fraction) on the GUI thread.
+        :param interruptible: Allow a superseded run to be aborted mid-query.
+        :return: Token identifying the request.
+        """
+        if key is not None and key in self._latest:
+            self._cancel(self._latest[key])
+
+        token = next(self._tokens)
+        task = _DbTask(token, fn, args, kwargs, interruptible)
+        task.signals.finished.connect(self._on_finished)
+        task.signals.failed.connect(self._on_failed)
+        if on_progress is not None:
+            task.kwargs["progress"] = task.report_progress
+            self._progress[token] = on_progress
+            task.signals.progress.connect(self._on_progress)
+
+        was_busy = self.busy
+        self._pending[token] = (key, task, on_result, on_error)
+        if key is not None:
+            self._latest[key] = token
+        self.pool.start(task)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return token
+
+    def cancel(self, key):
+        """Cancel the outstanding request for key, if any."""
+        if key in self._latest:
+            self._cancel(self._latest.pop(key))
+
+    def _cancel(self, token):
+        entry = self._pending.get(token)
+        if entry is None:
+            return
+        task = entry[1]
+        if self.pool.tryTake(task):
+            # Never started: forget it entirely
+            self._complete(token)
+        else:
+            task.interrupt()
+
+    def _is_current(self, key, token):
+        return key is None or self._latest.get(key) == token
+
+    def _complete(self, token):
+        self._progress.pop(token, None)
+        key = self._pending.pop(token)[0]
+        if key is not None and self._latest.get(key) == token:
+            del self._latest[key]
+        if not self.busy:
+            self.busy_changed.emit(False)
+
+    def _on_progress(self, token, report):
+        on_progress = self._progress.get(token)
+        if on_progress is not None and self._is_current(self._pending[token][0], token):
+            on_progress(*report)
+
+    def _on_finished(self, token, result):
+        entry = self._pending.get(token)
+        if entry is None:
+            return
+        key, _, on_result, _ = entry
+        current = self._is_current(key, token)
+        self._complete(token)
+        if current and on_result is not None:
+            on_result(result)
+
+    def _on_failed(self, token, error):
+        entry = self._pending.get(token)
+        if entry is None:
+            return
+        key, _, _, on_error = entry
+        current = self._is_current(key, token)
+        self._complete(token)
+        if current:
+            if on_error is not None:
+                on_error(error)
+            else:
+                raise error
+
+
+class BusyIndicator(QProgressBar):
+    """
+    Thin indeterminate progress bar that is visible only while the given
+    DataExecutor has requests in flight.
+    """
+
+    def __init__(self, executor, color, parent=None):
+        super().__init__(parent)
+        self.setRange(0, 0)  # Indeterminate
+        self.setTextVisible(False)
+        self.setFixedHeight(4)
+        self.setStyleSheet(f"""
+            QProgressBar {{ border: none; background: transparent; }}
+            QProgressBar::chunk {{ background-color: {color}; }}
+        """)
+        self.setVisible(executor.busy)
+        executor.busy_changed.connect(self.setVisible)
+
+
+class ChangeNotifier(QObject):
+    """
+    Re-emits the ChangeEvents of app.models.changes as the changed signal.
+    Events are published on whichever thread committed the change; Qt queues
+    the signal, so connected slots run on the GUI thread.
+    """
+    changed = Signal(object)  # ChangeEvent
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        changes.subscribe(self.changed.emit)
+
+
+_notifier = None
+
+
+def change_notifier():
+    """Returns the ChangeNotifier shared by all views, creating it on first use (on the GUI thread)."""
+    global _notifier
+    if _notifier is None:
+        _notifier = ChangeNotifier()
+    return _notifier
@@ -0,0 +1,173 @@
+"""
+Matplotlib drawing of the Profit & Loss charts, independent of any GUI.
+
+SummaryChart draws a get_period_summary() frame on a matplotlib Figure:
+the Sales Book's canvas (app.ui.charts) shows it on screen, and
+render_summary_png() renders it off-screen with the Agg backend, which is
+safe on worker threads (for PDF reports).
+
+Instead of clearing the figure and creating one bar and one annotation per
+period on every refresh, the chart keeps its artists and updates their data
+in place while the layout (chart kind and number of points) stays the same.
+Long ranges switch from bars to lines and are downsampled into buckets, so a
+two-year daily summary draws a few hundred points instead of 700+ bars and
+labels. Importing this module loads matplotlib.
+"""
+import io
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+
+class SummaryChart:
+    """Sales trend and profit margin charts for a get_period_summary() frame on a Figure."""
+
+    MAX_BARS = 45          # More periods than this are drawn as lines
+    MAX_ANNOTATIONS = 20   # Value labels only when there is room to read them
+    MAX_POINTS = 240       # Line charts are bucketed down to at most this many points
+    MAX_TICKS = 12
+
+    def __init__(self, figure, colors):
+        self.figure = figure
+        self.colors = colors
+        figure.subplots_adjust(bottom=0.18, wspace=0.3)
+        self.ax_sales, self.ax_margin = figure.subplots(1, 2)
+        self._layout = None    # (kind, number of points) the artists were built for
+        self._artists = {}
+        self.stats = {"in_place": 0, "rebuilt": 0}
+
+    def reset(self):
+        """Rebuild the artists on the next plot()"""
+        self._layout = None
+
+    def plot(self, summary):
+        """
+        Update the charts to a summary without drawing them.
+
+        :param summary: DataFrame with period, revenue, profit, revenue_ma columns
+        """
+        kind, labels, revenue, revenue_ma, margin, bucket = self._prepare(summary)
+        self._set_artists(kind, labels, revenue, revenue_ma, margin, bucket)
+
+    def _prepare(self, summary):
+        """Choose the chart kind and downsample the series to what is legible"""
+        labels = summary["period"].to_numpy()
+        revenue = summary["revenue"].to_numpy(dtype=np.float64)
+        profit = summary["profit"].to_numpy(dtype=np.float64)
+        revenue_ma = summary["revenue_ma"].to_numpy(dtype=np.float64)
+        kind = "bar" if len(labels) <= self.MAX_BARS else "line"
+
+        bucket = 1
+        if kind == "line" and len(labels) > self.MAX_POINTS:
+            # Average consecutive periods; margin is recomputed from the bucket sums
+            bucket = -(-len(labels) // self.MAX_POINTS)
+            starts = np.arange(0, len(labels), bucket)
+            counts = np.diff(np.append(starts, len(labels)))
+            labels = labels[starts]
+            revenue_sum = np.add.reduceat(revenue, starts)
+            profit = np.add.reduceat(profit, starts)
+            revenue_ma = np.add.reduceat(revenue_ma, starts) / counts
+            revenue = revenue_sum / counts
+        else:
+            revenue_sum = revenue
+
+        margin = np.zeros(len(labels))
+        np.divide(profit, revenue_sum, out=margin, where=revenue_sum > 0)
+        return kind, labels, revenue, revenue_ma, margin * 100, bucket
+
+    def _set_artists(self, kind, labels, revenue, revenue_ma, margin, bucket):
+        """Update the artists to the new data, rebuilding them only when the layout changed"""
+        x = np.arange(len(labels))
+        layout = (kind, len(labels))
+        if layout != self._layout:
+            self._build(kind, x)
+            self._layout = layout
+            self.stats["rebuilt"] += 1
+        else:
+            self.stats["in_place"] += 1
+
+        colors = self.colors
+        a = self._artists
+        if kind == "bar":
+            for rect, height in zip(a["sales"], revenue):
+                rect.set_height(height)
+            for rect, height, positive in zip(a["margin"], margin, margin >= 0):
+                rect.set_height(height)
+                rect.set_facecolor(colors['profit'] if positive else colors['loss'])
+            for note, height in zip(a["sales_notes"], revenue):
+                note.xy = (note.xy[0], height)
+                note.set_text(f'${height:.0f}')
+            for note, height in zip(a["margin_notes"], margin):
+                note.xy = (note.xy[0], height)
+                note.set_text(f'{height:.1f}%')
+        else:
+            a["sales"].set_ydata(revenue)
+            a["margin_gain"].set_ydata(np.where(margin >= 0, margin, np.nan))
+            a["margin_loss"].set_ydata(np.where(margin < 0, margin, np.nan))
+        a["sales_ma"].set_ydata(revenue_ma)
+
+        suffix = f" ({bucket}-period average)" if bucket > 1 else ""
+        self.ax_sales.set_title('Sales Trend' + suffix, fontweight='bold', fontsize=12,
+                                color=colors['text_primary'])
+        self.ax_margin.set_title('Profit Margin (%)' + suffix, fontweight='bold', fontsize=12)
+
+        # Label at most MAX_TICKS periods
+        step = max(1, -(-len(labels) // self.MAX_TICKS))
+        for ax in (self.ax_sales, self.ax_margin):
+            ax.set_xticks(x[::step], labels[::step])
+            ax.relim()
+            ax.autoscale_view()
+
+    def _build(self, kind, x):
+        """Create the artists for a chart kind and number of points"""
+        colors = self.colors
+        for ax in (self.ax_sales, self.ax_margin):
+            ax.cla()
+            ax.set_facecolor(colors['background_light'])
+            ax.spines['top'].set_visible(False)
+            ax.spines['right'].set_visible(False)
+            ax.spines['bottom'].set_color(colors['border'])
+            ax.spines['left'].set_color(colors['border'])
+            ax.tick_params(axis='x', rotation=45)
+            ax.tick_params(colors=colors['text_secondary'])
+        self.ax_sales.set_ylabel('Total Sales ($)', color=colors['text_secondary'])
+        self.ax_margin.set_ylabel('Margin %')
+        self.ax_margin.axhline(0, color=colors['border'], linewidth=1)
+
+        zeros = np.zeros(len(x))
+        a = self._artists = {}
+        if kind == "bar":
+            a["sales"] = self.ax_sales.bar(x, zeros, color=colors['primary'])
+            a["margin"] = self.ax_margin.bar(x, zeros, color=colors['profit'])
+            # Value labels only when there is room to read them
+            annotate = len(x) <= self.MAX_ANNOTATIONS
+            a["sales_notes"] = [self._annotate(self.ax_sales, pos) for pos in x] if annotate else []
+            a["margin_notes"] = [self._annotate(self.ax_margin, pos) for pos in x] if annotate else []
+        else:
+            a["sales"], = self.ax_sales.plot(x, zeros, color=colors['primary'], linewidth=1.2)
+            a["margin_gain"], = self.ax_margin.plot(x, zeros, color=colors['profit'], linewidth=1.2)
+            a["margin_loss"], = self.ax_margin.plot(x, zeros, color=colors['loss'], linewidth=1.2)
+        a["sales_ma"], = self.ax_sales.plot(x, zeros, color=colors['accent'], linewidth=1.5)
+
+    @staticmethod
+    def _annotate(ax, x):
+        return ax.annotate('', xy=(x, 0), xytext=(0, 3),  # 3 points vertical offset
+                           textcoords="offset points", ha='center', va='bottom', fontsize=8)
+
+
+def render_summary_png(summary, colors, size=(10, 4.5), dpi=150):
+    """
+    Renders the summary charts to PNG bytes with the Agg backend (no GUI needed).
+
+    :param summary: get_period_summary() frame
+    :param colors: Color dictionary with the keys SummaryChart uses
+    :param size: Figure size in inches
+    :return: PNG image as bytes
+    """
+    figure = Figure(figsize=size, facecolor=colors['background'])
+    FigureCanvasAgg(figure)
+    SummaryChart(figure, colors).plot(summary)
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png", dpi=dpi, facecolor=figure.get_facecolor())
+    return buffer.getvalue()
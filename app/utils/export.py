@@ -0,0 +1,193 @@
+"""
+Streaming export of sales, inventory and sales summaries to CSV, XLSX and
+Parquet.
+
+Rows are pulled from the database with the keyset iterators (iter_sales(),
+iter_items()) and written in chunks of CHUNK_ROWS, so memory stays bounded
+by the chunk size however many rows are exported and no read transaction is
+held open for the whole export. The export functions take an optional
+progress(rows_written, fraction) callable, which DataExecutor.submit(...,
+on_progress=...) supplies when they run off the GUI thread.
+
+XLSX export needs openpyxl and Parquet export needs pyarrow (both in
+requirements.txt); they are imported only when that format is used.
+"""
+import csv
+import os
+from itertools import islice
+
+from app.models.inventory import iter_items, count_items
+from app.models.sales import iter_sales, get_sales_totals
+
+CHUNK_ROWS = 10000          # Rows fetched and written at a time
+XLSX_MAX_ROWS = 1048576     # Rows per worksheet, including the header
+
+FORMATS = ("csv", "xlsx", "parquet")
+
+# (column name, type) of each export; the types give the Parquet schema
+SALES_COLUMNS = [("id", "int"), ("date", "str"), ("item", "str"), ("quantity", "int"),
+                 ("unit_price", "float"), ("total_amount", "float"), ("payment_method", "str"),
+                 ("profit", "float"), ("expense_notes", "str")]
+INVENTORY_COLUMNS = [("id", "int"), ("name", "str"), ("category", "str"), ("size", "str"),
+                     ("description", "str"), ("quantity", "int"), ("price", "float"),
+                     ("supplier", "str"), ("entry_date", "str"), ("notes", "str")]
+SUMMARY_COLUMNS = [("period", "str"), ("revenue", "float"), ("profit", "float"), ("units", "int"),
+                   ("sales", "int"), ("margin", "float"), ("revenue_ma", "float"),
+                   ("profit_ma", "float"), ("revenue_growth", "float"), ("profit_growth", "float")]
+
+
+def export_format(path):
+    """
+    Returns the export format for a file name from its extension.
+
+    :raises ValueError: If the extension is not .csv, .xlsx or .parquet
+    """
+    fmt = os.path.splitext(path)[1].lower().lstrip(".")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unsupported export format {fmt!r}; use one of: {', '.join(FORMATS)}")
+    return fmt
+
+
+class _CsvWriter:
+    def __init__(self, path, columns, title):
+        self._file = open(path, "w", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        self._writer.writerow([name for name, _ in columns])
+
+    def write(self, rows):
+        self._writer.writerows(rows)
+
+    def close(self):
+        self._file.close()
+
+
+class _XlsxWriter:
+    """openpyxl write-only workbook: rows go straight to a temporary file instead of cells in memory."""
+
+    def __init__(self, path, columns, title):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise ValueError("XLSX export requires openpyxl (pip install openpyxl)") from None
+        self.path = path
+        self.header = [name for name, _ in columns]
+        self.title = title
+        self.workbook = Workbook(write_only=True)
+        self.sheets = 0
+        self._new_sheet()
+
+    def _new_sheet(self):
+        # Rows beyond one worksheet's limit continue on "Title (2)", "Title (3)", ...
+        self.sheets += 1
+        self.sheet = self.workbook.create_sheet(self.title if self.sheets == 1
+                                                else f"{self.title} ({self.sheets})")
+        self.sheet.append(self.header)
+        self.sheet_rows = 1
+
+    def write(self, rows):
+        for row in rows:
+            if self.sheet_rows == XLSX_MAX_ROWS:
+                self._new_sheet()
+            self.sheet.append(row)
+            self.sheet_rows += 1
+
+    def close(self):
+        self.workbook.save(self.path)
+
+
+class _ParquetWriter:
+    """pyarrow ParquetWriter: each chunk becomes one row group."""
+
+    def __init__(self, path, columns, title):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ValueError("Parquet export requires pyarrow (pip install pyarrow)") from None
+        types = {"int": pa.int64(), "float": pa.float64(), "str": pa.string()}
+        self.pa = pa
+        self.schema = pa.schema([(name, types[kind]) for name, kind in columns])
+        self.writer = pq.ParquetWriter(path, self.schema)
+
+    def write(self, rows):
+        columns = list(zip(*rows))
+        self.writer.write_table(self.pa.Table.from_arrays(
+            [self.pa.array(values, type=field.type) for values, field in zip(columns, self.schema)],
+            schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+
+_WRITERS = {"csv": _CsvWriter, "xlsx": _XlsxWriter, "parquet": _ParquetWriter}
+
+
+def export_rows(rows, columns, path, title="Export", total=None, progress=None):
+    """
+    Writes rows to path in the format given by its extension, CHUNK_ROWS at a time.
+
+    :param rows: Iterable of tuples in the order of columns
+    :param columns: List of (name, type) pairs, type being "int", "float" or "str"
+    :param path: Output file ending in .csv, .xlsx or .parquet
+    :param title: Worksheet name for XLSX
+    :param total: Expected number of rows, used to report a fraction
+    :param progress: Optional callable(rows_written, fraction or None)
+    :return: Number of rows written
+    :raises ValueError: If the format is unsupported or its library is missing
+    """
+    writer = _WRITERS[export_format(path)](path, columns, title)
+    written = 0
+    try:
+        rows = iter(rows)
+        while True:
+            chunk = list(islice(rows, CHUNK_ROWS))
+            if not chunk:
+                break
+            writer.write(chunk)
+            written += len(chunk)
+            if progress is not None:
+                progress(written, min(written / total, 1.0) if total else None)
+    except BaseException:
+        writer.close()
+        os.remove(path)  # Don't leave a truncated file that looks like a finished export
+        raise
+    writer.close()
+    if progress is not None:
+        progress(written, 1.0)
+    return written
+
+
+def export_sales(path, start_date=None, end_date=None, progress=None):
+    """
+    Exports the sales in a date range, newest first, as get_all_sales() returns them.
+
+    :return: Number of rows written
+    """
+    total = get_sales_totals(start_date, end_date)[0]
+    return export_rows(iter_sales(start_date, end_date, batch_size=CHUNK_ROWS), SALES_COLUMNS,
+                       path, "Sales", total, progress)
+
+
+def export_inventory(path, progress=None):
+    """
+    Exports every clothing item ordered by ID.
+
+    :return: Number of rows written
+    """
+    return export_rows(iter_items(batch_size=CHUNK_ROWS), INVENTORY_COLUMNS, path, "Inventory",
+                       count_items(), progress)
+
+
+def export_summary(path, period_type="daily", start_date=None, end_date=None, progress=None):
+    """
+    Exports the Profit & Loss summary (get_period_summary()) of a date range.
+
+    :return: Number of rows written
+    """
+    # Imported here: pandas is only needed for this export
+    from app.models.analytics import get_period_summary
+    summary = get_period_summary(period_type, start_date, end_date)
+    # NaN growth (no previous period) becomes an empty cell
+    rows = (tuple(None if value != value else value for value in row)
+            for row in summary.itertuples(index=False, name=None))
+    return export_rows(rows, SUMMARY_COLUMNS, path, "Summary", len(summary), progress)
@@ -0,0 +1,74 @@
+"""
+Benchmark: Profit & Loss summary computed with per-row Python (get_summary()
+plus list comprehensions, as SalesView used to) versus the vectorized
+app.models.analytics.get_period_summary(), on a generated database.
+
+Both sides compute the same numbers: per-period revenue, profit and margin,
+a moving average and period-over-period growth of revenue, and the totals
+shown in the summary cards.
+
+Usage:
+    python -m benchmarks.analytics_summary [--sales 1000000] [--cache-dir DIR] [--budget 2.0]
+"""
+import argparse
+import os
+import tempfile
+from datetime import timedelta
+
+from app import db
+from app.models.analytics import MOVING_AVERAGE_WINDOWS, get_period_summary, summary_totals
+from app.models.sales import get_summary
+from benchmarks.suite import END_DATE, YEARS, cached_database, measure, skus_for
+
+
+def python_summary(period_type, start_date, end_date):
+    """The per-row computation the Summary tab did before, extended to the same columns."""
+    summaries = get_summary(period_type, start_date, end_date)
+    sales = [s[1] for s in summaries]
+    profits = [s[2] for s in summaries]
+    margins = [(p / s * 100) if s > 0 else 0 for p, s in zip(profits, sales)]
+    window = MOVING_AVERAGE_WINDOWS[period_type]
+    moving = [sum(sales[max(0, i - window + 1):i + 1]) / (i - max(0, i - window + 1) + 1)
+              for i in range(len(sales))]
+    growth = [None] + [((s - prev) / abs(prev) * 100) if prev else None for prev, s in zip(sales, sales[1:])]
+    total_sales = sum(summary[1] for summary in summaries) if summaries else 0
+    total_profit = sum(summary[2] for summary in summaries) if summaries else 0
+    avg_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
+    return summaries, margins, moving, growth, avg_margin
+
+
+def vectorized_summary(period_type, start_date, end_date):
+    summary = get_period_summary(period_type, start_date, end_date)
+    return summary, summary_totals(summary)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds spent timing each case")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        db.set_db_path(cached_database(cache_dir, args.sales))
+
+        end = END_DATE.isoformat()
+        ranges = {
+            "full history": ((END_DATE - timedelta(days=365 * YEARS - 1)).isoformat(), end),
+            "last 30 days": ((END_DATE - timedelta(days=29)).isoformat(), end),
+        }
+        print(f"{args.sales} sales, {skus_for(args.sales)} items")
+        print(f"{'case':<30}{'python (ms)':>14}{'vectorized (ms)':>18}{'speedup':>10}")
+        for label, (start, stop) in ranges.items():
+            for period_type in ("daily", "weekly", "monthly"):
+                before = measure(lambda: python_summary(period_type, start, stop), args.budget)
+                after = measure(lambda: vectorized_summary(period_type, start, stop), args.budget)
+                print(f"{period_type + ', ' + label:<30}{before['median_ms']:>14.2f}"
+                      f"{after['median_ms']:>18.2f}{before['median_ms'] / after['median_ms']:>9.1f}x")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Benchmark: online backups with backup_database() against database size, and
+what they cost the till while they run.
+
+For each size the generated database is copied and backed up twice: in steps
+of --pages pages (the default the app uses) and in a single step. A till
+thread records sales with add_sale() throughout; its commit latency during
+each backup is compared with the latency while no backup runs. The
+snapshot's integrity check (part of every backup) and a restore are timed
+on their own, and a plain file copy (which is not safe while the till
+writes) is the lower bound.
+
+Usage:
+    python -m benchmarks.backup [--sales 1000 100000 1000000] [--pages 1024] [--cache-dir DIR]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from datetime import date
+
+from app import db
+from app.models.backup import PAGES_PER_STEP, backup_database, restore_database, verify_backup
+from app.models.sales import add_sale
+from benchmarks.suite import cached_database
+
+
+class Till(threading.Thread):
+    """Records one-unit sales of an item back to back, timing each add_sale()."""
+
+    def __init__(self, item_id):
+        super().__init__(daemon=True)
+        self.item_id = item_id
+        self.latencies = []
+        self.recording = False
+        self._stopping = threading.Event()
+
+    def run(self):
+        sale = {'date': date.today().isoformat(), 'item_id': self.item_id, 'quantity': 1,
+                'unit_price': 10.0, 'payment_method': 'Cash', 'expense_notes': ''}
+        while not self._stopping.is_set():
+            started = time.perf_counter()
+            add_sale(dict(sale))
+            if self.recording:
+                self.latencies.append((time.perf_counter() - started) * 1000)
+            time.sleep(0.002)
+        db.close_connection()
+
+    def measure(self, fn):
+        """Runs fn() while recording latencies; returns (fn's result, seconds, latencies in ms)."""
+        self.latencies = []
+        self.recording = True
+        started = time.perf_counter()
+        result = fn()
+        seconds = time.perf_counter() - started
+        self.recording = False
+        return result, seconds, self.latencies
+
+    def stop(self):
+        self._stopping.set()
+        self.join()
+
+
+def latency(latencies):
+    if not latencies:
+        return "no sales"
+    latencies = sorted(latencies)
+    return (f"{len(latencies)} sales, median {statistics.median(latencies):.1f} ms, "
+            f"max {latencies[-1]:.1f} ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, nargs="+", default=[1_000, 100_000, 1_000_000],
+                        help="Sizes of the generated databases, in sales")
+    parser.add_argument("--pages", type=int, default=PAGES_PER_STEP, help="Pages per backup step")
+    parser.add_argument("--cache-dir", help="Keep the generated databases here between runs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        for sales in args.sales:
+            path = os.path.join(tmp, f"live-{sales}.db")
+            shutil.copy(cached_database(cache_dir, sales), path)
+            db.set_db_path(path)
+            size = os.path.getsize(path) / 1e6
+            item_id = db.get_connection().execute("SELECT MIN(id) FROM clothing_items").fetchone()[0]
+            with db.transaction() as cursor:
+                cursor.execute("UPDATE clothing_items SET quantity = 1000000 WHERE id = ?", (item_id,))
+
+            till = Till(item_id)
+            till.start()
+            _, _, idle = till.measure(lambda: time.sleep(1.0))
+            stepped, stepped_s, during_stepped = till.measure(lambda: backup_database(pages=args.pages))
+            single, single_s, during_single = till.measure(lambda: backup_database(pages=-1))
+            till.stop()
+
+            started = time.perf_counter()
+            problems = verify_backup(single.path)
+            verified = time.perf_counter() - started
+            assert not problems, problems
+            started = time.perf_counter()
+            shutil.copy(path, os.path.join(tmp, "copy.db"))
+            copied = time.perf_counter() - started
+            started = time.perf_counter()
+            restore_database(stepped.path, backup_first=False)
+            restored = time.perf_counter() - started
+            db.close_all_connections()
+            shutil.rmtree(os.path.join(tmp, "backups"))
+
+            print(f"{sales} sales, {size:.0f} MB ({stepped.pages} pages):")
+            for label, seconds in ((f"backup, {args.pages} pages per step", stepped_s),
+                                   ("backup, one step", single_s), ("integrity check alone", verified),
+                                   ("restore", restored), ("plain file copy", copied)):
+                print(f"  {label + ':':<32}{seconds:7.2f}s")
+            for label, latencies in (("till while idle", idle), ("till during stepped backup", during_stepped),
+                                     ("till during one-step backup", during_single)):
+                print(f"  {label + ':':<32}{latency(latencies)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: typical item lookups in the UI with and without the item
+catalogue (app.models.catalogue).
+
+Each flow is what the dialogs do: the Add Sale dialog loads every item and
+looks up the selected item as the user browses the combo box, and the edit
+dialog fetches one item by ID. Without the catalogue every open queries the
+database; with it only the first open does. Reports the median time per
+flow and the SQL statements issued over all runs.
+
+Usage:
+    python -m benchmarks.catalogue_cache [--sales 100000] [--cache-dir DIR] [--budget 2.0]
+"""
+import argparse
+import os
+import random
+import tempfile
+
+from app import db
+from app.instrumentation import capture_statements
+from app.models.catalogue import catalogue
+from app.models.inventory import get_all_items, get_item_by_id
+from benchmarks.suite import cached_database, measure, skus_for
+
+BROWSED = 10  # Items selected in the combo box per dialog
+
+
+def sale_dialog_uncached(ids):
+    items = get_all_items()
+    for item_id in ids:
+        get_item_by_id(item_id)
+    return items
+
+
+def sale_dialog_cached(ids):
+    items = catalogue.all_items()
+    for item_id in ids:
+        catalogue.get(item_id)
+    return items
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=2.0, help="Seconds spent timing each case")
+    args = parser.parse_args(argv)
+    rng = random.Random(42)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        db.set_db_path(cached_database(cache_dir, args.sales))
+        items = skus_for(args.sales)
+        ids = [rng.randint(1, items) for _ in range(BROWSED)]
+        print(f"{items} items")
+        print(f"{'flow':<28}{'uncached (ms)':>15}{'cached (ms)':>13}{'statements':>22}")
+
+        cases = [
+            ("open Add Sale dialog", lambda: sale_dialog_uncached(ids), lambda: sale_dialog_cached(ids)),
+            ("open edit dialog", lambda: get_item_by_id(ids[0]), lambda: catalogue.get(ids[0])),
+        ]
+        for label, uncached, cached in cases:
+            catalogue.clear()
+            with capture_statements() as before:
+                slow = measure(uncached, args.budget)
+            with capture_statements() as after:
+                fast = measure(cached, args.budget)
+            print(f"{label:<28}{slow['median_ms']:>15.3f}{fast['median_ms']:>13.4f}"
+                  f"{len(before):>8} -> {len(after):<4}({slow['runs'] + 1}/{fast['runs'] + 1} runs)")
+        print("catalogue:", catalogue.snapshot())
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: time to refresh the Profit & Loss charts with the old
+update_charts (clear the figure, one bar and one annotation per period)
+versus SummaryChartCanvas (artists updated in place, bars switched to
+downsampled lines for long ranges, rendered images cached).
+
+Runs Qt with the offscreen platform when there is no display.
+
+Usage:
+    python -m benchmarks.chart_render [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+if sys.platform.startswith("linux") and "DISPLAY" not in os.environ:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import numpy as np
+import pandas as pd
+from PySide6.QtWidgets import QApplication
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
+from matplotlib.figure import Figure
+
+from app.ui.charts import SummaryChartCanvas
+
+COLORS = {
+    'primary': '#4A6FA5', 'accent': '#D28A7A', 'background': '#F4F1ED',
+    'background_light': '#FAF8F5', 'text_primary': '#2D3142', 'text_secondary': '#6B717E',
+    'border': '#D5CEC8', 'profit': '#508569', 'loss': '#B95C50',
+}
+
+
+def make_summary(periods, seed):
+    """A get_period_summary()-shaped frame with `periods` daily rows."""
+    rng = np.random.default_rng(seed)
+    revenue = rng.uniform(100, 900, periods)
+    profit = revenue * rng.uniform(-0.1, 0.4, periods)
+    labels = pd.date_range("2024-01-01", periods=periods).strftime("%Y-%m-%d")
+    return pd.DataFrame({
+        "period": labels.to_numpy(dtype=object), "revenue": revenue, "profit": profit,
+        "revenue_ma": pd.Series(revenue).rolling(7, min_periods=1).mean().to_numpy(),
+    })
+
+
+def legacy_update_charts(figure, canvas, summary):
+    """update_charts as it was before the chart cache, on a get_period_summary() frame."""
+    figure.clear()
+    periods = list(summary["period"])
+    sales = list(summary["revenue"])
+    profits = list(summary["profit"])
+    ax1 = figure.add_subplot(121)
+    ax2 = figure.add_subplot(122)
+    for ax in [ax1, ax2]:
+        ax.spines['top'].set_visible(False)
+        ax.spines['right'].set_visible(False)
+        ax.tick_params(axis='x', rotation=45)
+    bars = ax1.bar(periods, sales, color=COLORS['primary'])
+    for bar in bars:
+        height = bar.get_height()
+        ax1.annotate(f'${height:.0f}', xy=(bar.get_x() + bar.get_width() / 2, height),
+                     xytext=(0, 3), textcoords="offset points", ha='center', va='bottom', fontsize=8)
+    margins = [(p / s * 100) if s > 0 else 0 for p, s in zip(profits, sales)]
+    colors = [COLORS['profit'] if m >= 0 else COLORS['loss'] for m in margins]
+    bars2 = ax2.bar(periods, margins, color=colors)
+    for bar in bars2:
+        height = bar.get_height()
+        ax2.annotate(f'{height:.1f}%', xy=(bar.get_x() + bar.get_width() / 2, height),
+                     xytext=(0, 3), textcoords="offset points", ha='center', va='bottom', fontsize=8)
+    canvas.draw()
+
+
+def timed(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return float(np.median(timings))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication([])
+    legacy_figure = Figure(figsize=(10, 5))
+    legacy = FigureCanvasQTAgg(legacy_figure)
+    legacy.resize(1000, 400)
+    canvas = SummaryChartCanvas(COLORS)
+    canvas.resize(1000, 400)
+
+    print(f"{'periods':>8}{'old (ms)':>12}{'first (ms)':>12}{'in place (ms)':>15}{'cached (ms)':>13}")
+    for periods in (7, 30, 90, 365, 730):
+        summaries = [make_summary(periods, seed) for seed in range(args.repeat + 1)]
+        key = ("daily", "2024-01-01", str(periods))
+        old = timed(lambda: legacy_update_charts(legacy_figure, legacy, summaries[0]), args.repeat)
+
+        canvas.clear_cache()
+        canvas.chart.reset()
+        started = time.perf_counter()
+        canvas.show_summary(summaries[0], key)
+        first = (time.perf_counter() - started) * 1000
+        # New data each time, same layout: artists are updated, not recreated
+        updates = iter(summaries[1:])
+        in_place = timed(lambda: canvas.show_summary(next(updates), key), args.repeat)
+        cached = timed(lambda: canvas.show_summary(summaries[0], key), args.repeat)
+        print(f"{periods:>8}{old:>12.1f}{first:>12.1f}{in_place:>15.1f}{cached:>13.1f}")
+        app.processEvents()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: sales/sec recording baskets line by line with add_sale() (one
+transaction and commit per line) versus add_sales_batch() (one transaction
+per basket).
+
+Usage:
+    python -m benchmarks.checkout_throughput [--baskets 500] [--lines 10] [--synchronous NORMAL]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date
+
+from app import db
+from app.models.sales import add_sale, add_sales_batch
+
+ITEM_COUNT = 200
+
+
+def build_database(path):
+    """Creates the schema at path with ITEM_COUNT well-stocked items."""
+    db.set_db_path(path)
+    db.init_db()
+    with db.transaction() as cursor:
+        cursor.executemany("""
+            INSERT INTO clothing_items (name, category, size, description, quantity, price,
+                                        supplier, entry_date, notes)
+            VALUES (?, 'Clothing', 'M', ?, 10000000, 10.0, 'Supplier', ?, '')
+        """, [(f"Item {i}", f"Description {i}", date.today().isoformat()) for i in range(ITEM_COUNT)])
+
+
+def make_baskets(count, lines, seed=7):
+    rng = random.Random(seed)
+    today = date.today().isoformat()
+    return [[{'date': today, 'item_id': rng.randrange(1, ITEM_COUNT + 1), 'quantity': rng.randint(1, 3),
+              'unit_price': 13.0, 'payment_method': 'Cash', 'expense_notes': ''}
+             for _ in range(lines)] for _ in range(count)]
+
+
+def single_row(baskets):
+    for basket in baskets:
+        for line in basket:
+            add_sale(dict(line))
+
+
+def batched(baskets):
+    for basket in baskets:
+        add_sales_batch(basket)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--baskets", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=10, help="lines per basket")
+    parser.add_argument("--synchronous", default=db.PERFORMANCE_PROFILE["synchronous"],
+                        help="PRAGMA synchronous level to run with (e.g. NORMAL, FULL)")
+    args = parser.parse_args()
+
+    db.set_performance_profile(synchronous=args.synchronous)
+    baskets = make_baskets(args.baskets, args.lines)
+    sales = args.baskets * args.lines
+
+    print(f"{args.baskets} baskets x {args.lines} lines, synchronous={args.synchronous}")
+    for name, run in [("add_sale per line", single_row), ("add_sales_batch per basket", batched)]:
+        with tempfile.TemporaryDirectory() as tmp:
+            build_database(os.path.join(tmp, "bench.db"))
+            started = time.perf_counter()
+            run(baskets)
+            elapsed = time.perf_counter() - started
+            db.close_all_connections()
+        print(f"{name:<28}{sales / elapsed:>12.0f} sales/sec{elapsed:>10.2f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark: per-call latency of model functions with a fresh sqlite3.connect()
+per call (the old behaviour) versus the shared per-thread connection from
+app.db.
+
+Builds a throwaway database with 100k sales rows, then times a point lookup,
+a narrow date-range read and a single-sale write both ways.
+
+Usage:
+    python -m benchmarks.connection_overhead [--rows 100000] [--calls 2000]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app import db
+from app.models.inventory import get_item_by_id
+from app.models.sales import add_sale, get_all_sales
+
+
+def build_database(path, sales_rows, item_count=1000):
+    """Creates the schema at path and fills it with synthetic items and sales."""
+    db.set_db_path(path)
+    db.init_db()
+    rng = random.Random(42)
+    start = date.today() - timedelta(days=730)
+    with db.transaction() as cursor:
+        cursor.executemany("""
+            INSERT INTO clothing_items (name, category, size, description, quantity, price,
+                                        supplier, entry_date, notes)
+            VALUES (?, 'Clothing', ?, ?, 1000000, ?, 'Supplier', ?, '')
+        """, [(f"Item {i}", rng.choice("SML"), f"Description {i}", round(rng.uniform(5, 80), 2),
+               start.isoformat()) for i in range(item_count)])
+        cursor.executemany("""
+            INSERT INTO sales (date, item_id, quantity, unit_price, total_amount,
+                               payment_method, profit, expense_notes)
+            VALUES (?, ?, ?, ?, ?, 'Cash', ?, '')
+        """, ((
+            (start + timedelta(days=rng.randrange(730))).isoformat(),
+            rng.randrange(1, item_count + 1), 1, 20.0, 20.0, 5.0,
+        ) for _ in range(sales_rows)))
+
+
+def legacy_get_item_by_id(path, item_id):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT * FROM clothing_items WHERE id=?", (item_id,))
+    item = cursor.fetchone()
+    conn.close()
+    return item
+
+
+def legacy_get_all_sales(path, start_date, end_date):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("""
+        SELECT s.id, s.date, i.name, s.quantity, s.unit_price,
+               s.total_amount, s.payment_method, s.profit, s.expense_notes
+        FROM sales s
+        JOIN clothing_items i ON s.item_id = i.id
+        WHERE s.date BETWEEN ? AND ? ORDER BY s.date DESC
+    """, (start_date, end_date))
+    sales = cursor.fetchall()
+    conn.close()
+    return sales
+
+
+def legacy_add_sale(path, sale):
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT price FROM clothing_items WHERE id = ?", (sale['item_id'],))
+    cursor.fetchone()
+    cursor.execute("""
+        INSERT INTO sales (date, item_id, quantity, unit_price, total_amount,
+                           payment_method, profit, expense_notes)
+        VALUES (:date, :item_id, :quantity, :unit_price, :total_amount,
+                :payment_method, :profit, :expense_notes)
+    """, sale)
+    cursor.execute("UPDATE clothing_items SET quantity = quantity - ? WHERE id = ?",
+                   (sale['quantity'], sale['item_id']))
+    conn.commit()
+    conn.close()
+
+
+def time_per_call(fn, calls):
+    """Returns the mean wall time of fn() in microseconds."""
+    started = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        build_database(path, args.rows)
+
+        today = date.today()
+        week = ((today - timedelta(days=7)).isoformat(), today.isoformat())
+        sale = {'date': today.isoformat(), 'item_id': 1, 'quantity': 1, 'unit_price': 20.0,
+                'total_amount': 20.0, 'payment_method': 'Cash', 'profit': 5.0, 'expense_notes': ''}
+
+        cases = [
+            ("get_item_by_id",
+             lambda: legacy_get_item_by_id(path, 500),
+             lambda: get_item_by_id(500),
+             args.calls),
+            ("get_all_sales (7 days)",
+             lambda: legacy_get_all_sales(path, *week),
+             lambda: get_all_sales(*week),
+             max(args.calls // 20, 10)),
+            ("add_sale",
+             lambda: legacy_add_sale(path, dict(sale)),
+             lambda: add_sale(dict(sale)),
+             max(args.calls // 10, 10)),
+        ]
+
+        print(f"{args.rows} sales rows, SQLite {sqlite3.sqlite_version}")
+        print(f"{'call':<26}{'connect/call (us)':>20}{'shared (us)':>14}{'speedup':>10}")
+        for name, legacy, pooled, calls in cases:
+            before = time_per_call(legacy, calls)
+            after = time_per_call(pooled, calls)
+            print(f"{name:<26}{before:>20.1f}{after:>14.1f}{before / after:>9.1f}x")
+
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
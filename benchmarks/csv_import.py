@@ -0,0 +1,117 @@
+"""
+Benchmark: CSV bulk import throughput. Importing items with
+app.models.importer.import_items_csv() (batched executemany upserts) is
+compared with calling add_item_to_db() once per row, then historic sales are
+imported with import_sales_csv(). A share of the rows are duplicates (merged
+into existing items) and a few are invalid (rejected).
+
+Usage:
+    python -m benchmarks.csv_import [--items 100000] [--sales 500000] [--per-row 5000]
+"""
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app import db
+from app.models.importer import import_items_csv, import_sales_csv, _validate_item
+from app.models.inventory import add_item_to_db
+
+SEED = 42
+
+
+def write_items_csv(path, rows, rng):
+    """Writes rows items; about 10% repeat an earlier identity and 0.1% are invalid."""
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Category", "Size", "Description", "Quantity", "Price",
+                         "Supplier", "Entry_Date", "Notes"])
+        for i in range(rows):
+            n = rng.randrange(i) if i and rng.random() < 0.1 else i
+            quantity = "many" if rng.random() < 0.001 else rng.randint(0, 50)
+            writer.writerow([f"Item {n}", "Tops", "M", f"Style {n % 97}", quantity,
+                             f"{rng.uniform(5, 80):.2f}", "Supplier", "2025-01-01", ""])
+
+
+def write_sales_csv(path, rows, items, rng):
+    """Writes rows sales of the (id, name, description, size) items over 2025;
+    half name the item by ID, half by identity."""
+    start = date(2025, 1, 1)
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["date", "item_id", "name", "description", "size", "quantity",
+                         "unit_price", "payment_method"])
+        for _ in range(rows):
+            item_id, name, description, size = rng.choice(items)
+            day = (start + timedelta(days=rng.randrange(365))).isoformat()
+            if rng.random() < 0.5:
+                item = [item_id, "", "", ""]
+            else:
+                item = ["", name, description, size]
+            writer.writerow([day] + item + [rng.randint(1, 3), f"{rng.uniform(10, 120):.2f}",
+                                             rng.choice(["Cash", "Card", "Mobile"])])
+
+
+def fresh_database(directory, name):
+    db.close_all_connections()
+    path = os.path.join(directory, name)
+    db.set_db_path(path)
+    db.init_db()
+    return path
+
+
+def per_row_import(path, limit):
+    """The alternative to the importer: validate each row and call add_item_to_db()."""
+    started = time.perf_counter()
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for count, row in enumerate(reader):
+            if count == limit:
+                break
+            try:
+                item = _validate_item({key.lower(): value for key, value in row.items()})
+            except ValueError:
+                continue
+            add_item_to_db(item)
+    return count, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=100_000)
+    parser.add_argument("--sales", type=int, default=500_000)
+    parser.add_argument("--per-row", type=int, default=5_000,
+                        help="Rows imported with add_item_to_db() for comparison")
+    args = parser.parse_args(argv)
+    rng = random.Random(SEED)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        items_csv = os.path.join(tmp, "items.csv")
+        sales_csv = os.path.join(tmp, "sales.csv")
+        write_items_csv(items_csv, args.items, rng)
+
+        fresh_database(tmp, "per_row.db")
+        rows, seconds = per_row_import(items_csv, args.per_row)
+        print(f"add_item_to_db per row: {rows} rows in {seconds:.2f}s ({rows / seconds:,.0f} rows/s)")
+
+        fresh_database(tmp, "bulk.db")
+        result = import_items_csv(items_csv, rejects_path=os.path.join(tmp, "items.rejects.csv"))
+        print(f"import_items_csv:       {result.rows_read} rows in {result.seconds:.2f}s "
+              f"({result.rows_per_second:,.0f} rows/s), {result.inserted} inserted, "
+              f"{result.merged} merged, {result.rejected} rejected")
+
+        items = db.get_connection().execute(
+            "SELECT id, name, description, size FROM clothing_items").fetchall()
+        write_sales_csv(sales_csv, args.sales, items, rng)
+        result = import_sales_csv(sales_csv)
+        print(f"import_sales_csv:       {result.rows_read} rows in {result.seconds:.2f}s "
+              f"({result.rows_per_second:,.0f} rows/s), {result.inserted} inserted, "
+              f"{result.rejected} rejected")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
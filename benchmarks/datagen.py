@@ -0,0 +1,171 @@
+"""
+Reproducible synthetic data for benchmarking the models layer.
+
+Fills a database with a catalogue of SKUs and several years of sales whose
+volume follows a seasonal pattern (monthly and weekday weights), whose item
+popularity is skewed (a few best sellers, a long tail) and whose payment
+methods follow a configurable mix. The same parameters and seed always
+produce the same rows.
+
+Usage:
+    python -m benchmarks.datagen --db bench.db [--skus 2000] [--sales 100000] [--years 2]
+                                 [--seed 42] [--payment-mix Cash=45,Card=35,...]
+"""
+import argparse
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+
+from app import db
+
+# Relative sales volume per calendar month (Jan..Dec): holiday peak, summer bump
+MONTH_WEIGHTS = (0.8, 0.7, 0.9, 1.0, 1.0, 1.1, 1.2, 1.1, 0.9, 1.0, 1.3, 1.8)
+# Relative sales volume per weekday (Mon..Sun)
+WEEKDAY_WEIGHTS = (0.8, 0.8, 0.9, 1.0, 1.2, 1.5, 1.1)
+
+PAYMENT_MIX = {"Cash": 45, "Card": 35, "Mobile Money": 15, "Bank Transfer": 4, "Other": 1}
+
+CATEGORIES = {
+    "Tops": ["T-shirt", "Shirt", "Blouse", "Polo", "Tank top", "Sweater", "Hoodie"],
+    "Bottoms": ["Jeans", "Trousers", "Shorts", "Skirt", "Chinos", "Joggers"],
+    "Outerwear": ["Jacket", "Coat", "Blazer", "Raincoat", "Vest"],
+    "Footwear": ["Sneakers", "Boots", "Sandals", "Loafers"],
+    "Accessories": ["Cap", "Scarf", "Belt", "Socks", "Gloves"],
+}
+SIZES = ["XS", "S", "M", "L", "XL", "XXL"]
+COLORS = ["Black", "White", "Navy", "Grey", "Red", "Green", "Beige", "Blue", "Brown", "Olive"]
+MATERIALS = ["cotton", "denim", "wool", "linen", "polyester", "leather", "fleece"]
+SUPPLIERS = [f"Supplier {letter}" for letter in "ABCDEFGH"]
+
+
+def parse_payment_mix(text):
+    """Parses 'Cash=45,Card=35' into {'Cash': 45.0, 'Card': 35.0}."""
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if not name.strip() or not weight:
+            raise ValueError(f"Invalid payment mix entry: {part!r}")
+        mix[name.strip()] = float(weight)
+    return mix
+
+
+def generate_items(rng, count, entry_date):
+    """
+    Returns `count` distinct catalogue rows shaped for clothing_items.
+    Every item gets a large stock so benchmarks can keep selling it.
+    """
+    items = []
+    for i in range(count):
+        category = rng.choice(list(CATEGORIES))
+        name = rng.choice(CATEGORIES[category])
+        # The SKU number keeps (name, description, size) unique at any count
+        description = f"{rng.choice(COLORS)} {rng.choice(MATERIALS)} #{i + 1}"
+        price = round(rng.lognormvariate(3.0, 0.6), 2)  # Purchase price, median ~$20
+        items.append((name, category, rng.choice(SIZES), description, 1_000_000, price,
+                      rng.choice(SUPPLIERS), entry_date, ""))
+    return items
+
+
+def day_weights(start, days):
+    """Seasonal sales weight of each of the `days` days from start."""
+    weights = []
+    for offset in range(days):
+        day = start + timedelta(days=offset)
+        weights.append(MONTH_WEIGHTS[day.month - 1] * WEEKDAY_WEIGHTS[day.weekday()])
+    return weights
+
+
+def generate_sales(rng, count, start, days, prices, payment_mix):
+    """
+    Yields `count` sales rows in date order, shaped for the sales table.
+
+    :param prices: Purchase price per item, index i being item ID i + 1
+    :param payment_mix: Dictionary of payment method -> relative weight
+    """
+    # Skewed popularity: item k sells roughly 1/k as often as the best seller
+    popularity = [1.0 / (rank + 1) for rank in range(len(prices))]
+    rng.shuffle(popularity)
+    item_ids = rng.choices(range(1, len(prices) + 1), weights=popularity, k=count)
+    methods = rng.choices(list(payment_mix), weights=list(payment_mix.values()), k=count)
+    day_offsets = sorted(rng.choices(range(days), weights=day_weights(start, days), k=count))
+
+    opening = datetime.combine(start, datetime.min.time()) + timedelta(hours=9)
+    for offset, item_id, method in zip(day_offsets, item_ids, methods):
+        # Sales happen between 09:00 and 20:00
+        when = opening + timedelta(days=offset, seconds=rng.randrange(11 * 3600))
+        quantity = 1 if rng.random() < 0.7 else rng.randint(2, 4)
+        cost = prices[item_id - 1]
+        unit_price = round(cost * rng.uniform(1.2, 1.8), 2)
+        yield (when.strftime('%Y-%m-%d %H:%M:%S'), item_id, quantity, unit_price,
+               round(unit_price * quantity, 2), method,
+               round((unit_price - cost) * quantity, 2), "")
+
+
+def generate(path, skus=2000, sales=100_000, years=2, seed=42, payment_mix=None, end=None):
+    """
+    Creates the schema at path and fills it with synthetic items and sales,
+    including the daily sales rollup. The database should be new or empty.
+
+    :param skus: Number of catalogue items
+    :param sales: Number of sales rows
+    :param years: Length of the sales history, ending at `end`
+    :param seed: Random seed; the same arguments always produce the same data
+    :param payment_mix: Dictionary of payment method -> relative weight
+    :param end: Last day of the history (default: today)
+    :return: Dictionary describing what was generated
+    """
+    if skus < 1 or sales < 0 or years <= 0:
+        raise ValueError("skus must be positive, sales non-negative and years positive")
+    rng = random.Random(seed)
+    end = end or date.today()
+    days = max(1, round(365 * years))
+    start = end - timedelta(days=days - 1)
+    payment_mix = payment_mix or PAYMENT_MIX
+
+    db.set_db_path(path)
+    db.init_db()
+    items = generate_items(rng, skus, start.isoformat())
+    with db.transaction() as cursor:
+        cursor.executemany("""
+            INSERT INTO clothing_items (name, category, size, description, quantity, price,
+                                        supplier, entry_date, notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, items)
+        cursor.executemany("""
+            INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
+            VALUES (?, 'in', ?, ?, 'Opening stock')
+        """, [(item_id, item[4], start.isoformat()) for item_id, item in enumerate(items, 1)])
+        cursor.executemany("""
+            INSERT INTO sales (date, item_id, quantity, unit_price, total_amount,
+                               payment_method, profit, expense_notes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        """, generate_sales(rng, sales, start, days, [item[5] for item in items], payment_mix))
+        rollup_rows = db.fill_sales_rollup(cursor)
+
+    return {"skus": skus, "sales": sales, "years": years, "seed": seed,
+            "start": start.isoformat(), "end": end.isoformat(),
+            "payment_mix": payment_mix, "rollup_rows": rollup_rows}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", required=True, help="Database file to create")
+    parser.add_argument("--skus", type=int, default=2000)
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--years", type=float, default=2)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--payment-mix", type=parse_payment_mix, default=None,
+                        help="Comma separated METHOD=WEIGHT pairs")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    info = generate(args.db, args.skus, args.sales, args.years, args.seed, args.payment_mix)
+    db.close_all_connections()
+    print(f"Generated {info['skus']} items and {info['sales']} sales "
+          f"({info['start']} .. {info['end']}) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+"""
+Benchmark: exporting every sale of a generated database to CSV, comparing
+the streaming exporter (app.utils.export.export_sales()) with writing the
+materialized get_all_sales() list. Reports rows/s and the peak Python heap
+(tracemalloc) of each; the streaming exporter's peak should not grow with
+the number of sales.
+
+Usage:
+    python -m benchmarks.export_memory [--sales 1000000] [--cache-dir DIR]
+"""
+import argparse
+import csv
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app import db
+from app.models.sales import get_all_sales
+from app.utils.export import SALES_COLUMNS, export_sales
+from benchmarks.suite import cached_database
+
+
+def materialized_export(path):
+    """Export the way the tables load data: fetch the whole result, then write it."""
+    rows = get_all_sales()
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow([name for name, _ in SALES_COLUMNS])
+        writer.writerows(rows)
+    return len(rows)
+
+
+def run(label, fn, path):
+    tracemalloc.start()
+    started = time.perf_counter()
+    rows = fn(path)
+    seconds = time.perf_counter() - started
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"{label:<14}{rows:>10}{seconds:>10.2f}{rows / seconds:>12,.0f}{peak / 2**20:>14.1f}"
+          f"{os.path.getsize(path) / 2**20:>12.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        db.set_db_path(cached_database(cache_dir, args.sales))
+        print(f"{'export':<14}{'rows':>10}{'seconds':>10}{'rows/s':>12}{'peak heap MB':>14}{'file MB':>12}")
+        run("materialized", materialized_export, os.path.join(tmp, "materialized.csv"))
+        run("streaming", export_sales, os.path.join(tmp, "streaming.csv"))
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
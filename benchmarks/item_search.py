@@ -0,0 +1,80 @@
+"""
+Benchmark: search-as-you-type over a large catalogue with search_items()
+(FTS5 index, prefix matching, bm25 ranking) versus LIKE '%word%' filters
+over the same five columns.
+
+Each query is typed one character at a time, as the debounced search boxes
+would send it in the worst case, and every prefix is timed.
+
+Usage:
+    python -m benchmarks.item_search [--skus 100000] [--cache-dir DIR] [--budget 0.5]
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from app import db
+from app.models.inventory import search_items
+from benchmarks import datagen
+from benchmarks.suite import END_DATE, SEED, measure
+
+QUERIES = ["jeans navy", "wool coat", "supplier c boots", "#4242", "grey linen blazer"]
+SEARCH_COLUMNS = ("name", "category", "description", "supplier", "notes")
+
+
+def like_search(query, limit=50):
+    """The straightforward alternative: every word somewhere in one of the columns."""
+    words = query.split()
+    conditions = " AND ".join(
+        "(" + " OR ".join(f"{column} LIKE ?" for column in SEARCH_COLUMNS) + ")" for _ in words)
+    params = [f"%{word}%" for word in words for _ in SEARCH_COLUMNS]
+    return db.get_connection().execute(
+        f"SELECT * FROM clothing_items WHERE {conditions} ORDER BY id LIMIT ?", params + [limit]).fetchall()
+
+
+def catalogue_database(cache_dir, skus):
+    path = os.path.join(cache_dir, f"search-{skus}-{SEED}.db")
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        datagen.generate(path + ".part", skus=skus, sales=1000, years=1, seed=SEED, end=END_DATE)
+        db.close_all_connections()
+        os.replace(path + ".part", path)
+        print(f"  generated {skus} items in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=0.5, help="Seconds spent timing each prefix")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        db.set_db_path(catalogue_database(cache_dir, args.skus))
+        db.migrate()  # Databases generated before the search index get it here
+
+        print(f"{args.skus} items")
+        print(f"{'typed':<26}{'fts p95 (ms)':>14}{'like p95 (ms)':>15}{'hits':>6}  first hit")
+        worst = {"fts": 0.0, "like": 0.0}
+        for query in QUERIES:
+            for end in range(1, len(query) + 1):
+                typed = query[:end]
+                if typed.endswith(" "):
+                    continue
+                fts = measure(lambda: search_items(typed), args.budget)
+                like = measure(lambda: like_search(typed), args.budget / 5, max_runs=50)
+                worst["fts"] = max(worst["fts"], fts["p95_ms"])
+                worst["like"] = max(worst["like"], like["p95_ms"])
+                hits = search_items(typed)
+                first = f"{hits[0][1]} - {hits[0][4]}" if hits else ""
+                print(f"{typed!r:<26}{fts['p95_ms']:>14.2f}{like['p95_ms']:>15.2f}{len(hits):>6}  {first}")
+        print(f"worst p95: fts {worst['fts']:.2f} ms, like {worst['like']:.2f} ms")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
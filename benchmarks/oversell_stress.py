@@ -0,0 +1,106 @@
+"""
+Stress test: several processes sell the same SKU at once until it runs out.
+
+Each worker process opens its own connection to one shared database file and
+calls add_sale() for a single unit in a loop. More units are requested than
+exist, so many calls must fail with InsufficientStockError. At the end the
+script checks that stock never went negative and that no update was lost:
+final quantity == initial quantity - units sold, and the sales table holds
+exactly one row per successful call. Exits non-zero if either check fails.
+
+Usage:
+    python -m benchmarks.oversell_stress [--workers 8] [--attempts 200] [--stock 500]
+"""
+import argparse
+import multiprocessing
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import date
+
+from app import db
+from app.models.sales import InsufficientStockError, add_sale
+
+
+def build_database(path, stock):
+    """Creates the schema at path with a single item holding `stock` units."""
+    db.set_db_path(path)
+    db.init_db()
+    with db.transaction() as cursor:
+        cursor.execute("""
+            INSERT INTO clothing_items (name, category, size, description, quantity, price,
+                                        supplier, entry_date, notes)
+            VALUES ('Hot item', 'Clothing', 'M', 'Contended SKU', ?, 10.0, 'Supplier', ?, '')
+        """, (stock, date.today().isoformat()))
+        return cursor.lastrowid
+
+
+def worker(path, item_id, attempts, results):
+    """Tries to sell one unit `attempts` times; reports (sold, refused, busy)."""
+    db.set_db_path(path)
+    sold = refused = busy = 0
+    sale = {'date': date.today().isoformat(), 'item_id': item_id, 'quantity': 1,
+            'unit_price': 13.0, 'payment_method': 'Cash', 'expense_notes': ''}
+    for _ in range(attempts):
+        try:
+            add_sale(dict(sale))
+            sold += 1
+        except InsufficientStockError:
+            refused += 1
+        except sqlite3.OperationalError:
+            # Still busy after every retry: nothing was written
+            busy += 1
+    db.close_all_connections()
+    results.put((sold, refused, busy))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--attempts", type=int, default=200, help="Sales attempted per worker")
+    parser.add_argument("--stock", type=int, default=500, help="Units in stock at the start")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "stress.db")
+        item_id = build_database(path, args.stock)
+        db.close_all_connections()
+
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=worker, args=(path, item_id, args.attempts, results))
+                     for _ in range(args.workers)]
+        for process in processes:
+            process.start()
+        totals = [results.get() for _ in processes]
+        for process in processes:
+            process.join()
+
+        sold = sum(t[0] for t in totals)
+        refused = sum(t[1] for t in totals)
+        busy = sum(t[2] for t in totals)
+
+        conn = sqlite3.connect(path)
+        quantity = conn.execute("SELECT quantity FROM clothing_items WHERE id = ?", (item_id,)).fetchone()[0]
+        sale_rows, units = conn.execute("SELECT COUNT(*), IFNULL(SUM(quantity), 0) FROM sales "
+                                        "WHERE item_id = ?", (item_id,)).fetchone()
+        conn.close()
+
+    print(f"{args.workers} workers x {args.attempts} attempts on {args.stock} units")
+    print(f"  sold={sold} refused={refused} busy={busy}")
+    print(f"  final quantity={quantity} sales rows={sale_rows} units recorded={units}")
+
+    checks = [
+        ("stock never negative", quantity >= 0),
+        ("no lost stock updates", quantity == args.stock - sold),
+        ("one sale row per success", sale_rows == sold and units == sold),
+        ("sold out when demand exceeds stock",
+         sold == args.stock if args.workers * args.attempts - busy >= args.stock else True),
+    ]
+    for name, ok in checks:
+        print(f"[{'ok' if ok else 'FAIL'}] {name}")
+    return 0 if all(ok for _, ok in checks) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Benchmark: time to write the PDF sales report (app.models.reports) for the
+last 30 days, 90 days and a full year of a generated database, with the
+pages per second and the peak Python heap of the one-year report.
+
+Usage:
+    python -m benchmarks.pdf_report [--sales 100000] [--cache-dir DIR]
+"""
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+
+from app import db
+from app.models.reports import build_sales_report
+from benchmarks.suite import END_DATE, cached_database
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        db.set_db_path(cached_database(cache_dir, args.sales))
+        path = os.path.join(tmp, "report.pdf")
+        end = END_DATE.isoformat()
+
+        print(f"{'range':<10}{'ledger rows':>12}{'pages':>8}{'seconds':>10}{'pages/s':>10}{'file MB':>10}")
+        for days in (30, 90, 365):
+            start = (END_DATE - timedelta(days=days - 1)).isoformat()
+            started = time.perf_counter()
+            result = build_sales_report(path, "monthly", start, end)
+            seconds = time.perf_counter() - started
+            print(f"{str(days) + ' days':<10}{result['ledger_rows']:>12}{result['pages']:>8}"
+                  f"{seconds:>10.2f}{result['pages'] / seconds:>10.1f}{os.path.getsize(path) / 2**20:>10.1f}")
+
+        # Heap profile of the one-year report (tracemalloc slows it down several times)
+        tracemalloc.start()
+        build_sales_report(path, "monthly", (END_DATE - timedelta(days=364)).isoformat(), end)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"peak Python heap for the one-year report: {peak / 2**20:.1f} MB")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
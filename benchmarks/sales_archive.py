@@ -0,0 +1,100 @@
+"""
+Benchmark: the sales queries before and after moving the closed fiscal
+years into archive files with archive_sales_year().
+
+The generated database covers three years ending at END_DATE; the two
+earlier years are archived (END_DATE's year stays open) and the live file
+vacuumed. Ranges within the open year, like the Sales Book's default of the
+last 30 days, should cost about the same from a live file a third of the
+size; ranges reaching into archived years pay for one query per archive.
+Results are checked to be the same before and after. Works on a copy of the
+generated database.
+
+Usage:
+    python -m benchmarks.sales_archive [--sales 1000000] [--cache-dir DIR] [--budget 1.0]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from app import db
+from app.models.archive import archive_sales_year, closed_years_with_live_sales
+from app.models.sales import get_sales_page, get_sales_totals, get_summary
+from benchmarks.suite import END_DATE, cached_database, measure
+
+RANGES = {
+    "last 30 days": ((END_DATE - timedelta(days=30)).isoformat(), END_DATE.isoformat()),
+    "open year": (END_DATE.replace(month=1, day=1).isoformat(), END_DATE.isoformat()),
+    "all history": (None, None),
+}
+QUERIES = {
+    "get_sales_page": lambda start, end: get_sales_page(start, end, 200),
+    "get_sales_totals": get_sales_totals,
+    "get_summary monthly": lambda start, end: get_summary("monthly", start, end),
+}
+
+
+def run_queries(budget):
+    timings, results = {}, {}
+    for (label, (start, end)) in RANGES.items():
+        for name, query in QUERIES.items():
+            timings[name, label] = measure(lambda: query(start, end), budget)["median_ms"]
+            results[name, label] = query(start, end)
+    return timings, results
+
+
+def same(a, b):
+    """Equal up to floating point noise from summing in a different order."""
+    if isinstance(a, float) and isinstance(b, float):
+        return abs(a - b) <= 1e-6 * max(1.0, abs(a))
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds spent timing each query")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(tmp, "live.db")
+        shutil.copy(cached_database(cache_dir, args.sales), path)
+        db.set_db_path(path)
+
+        size_before = os.path.getsize(path)
+        before, expected = run_queries(args.budget)
+
+        started = time.perf_counter()
+        years = closed_years_with_live_sales(today=END_DATE)
+        for year in years:
+            archive_sales_year(year, today=END_DATE)
+        archived = time.perf_counter() - started
+        started = time.perf_counter()
+        db.get_connection().execute("VACUUM")
+        vacuumed = time.perf_counter() - started
+        # Fresh connections, which attach the archives as queries need them
+        db.close_all_connections()
+        size_after = os.path.getsize(path)
+
+        after, results = run_queries(args.budget)
+        for key in expected:
+            assert same(expected[key], results[key]), f"{key} changed after archiving"
+
+        print(f"archived {', '.join(map(str, years))} in {archived:.1f}s, vacuum {vacuumed:.1f}s; "
+              f"live database {size_before / 1e6:.0f} MB -> {size_after / 1e6:.0f} MB")
+        print(f"{'query':<22}{'range':<15}{'before (ms)':>13}{'after (ms)':>12}")
+        for name, label in before:
+            print(f"{name:<22}{label:<15}{before[name, label]:>13.3f}{after[name, label]:>12.3f}")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Startup measurement: import time per module and time to first paint.
+
+Two reports, each taken in fresh interpreter processes so nothing is cached
+in memory:
+
+  imports      Runs `python -X importtime -c "import main"` and lists the
+               slowest modules (self and cumulative time), the total, and
+               whether heavy optional packages (matplotlib, numpy, pandas)
+               were pulled in at startup.
+  first paint  Starts the app the way main.py does against a generated
+               database and reports, from when the app code starts running:
+               imports done, main window built, first paint, event loop idle
+               after the first paint and (with --open-sales) the Sales Book
+               tab painted, plus the wall time of the whole process.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--top 15] [--sales 10000] [--open-sales]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_PACKAGES = ("matplotlib", "numpy", "pandas", "pyarrow", "openpyxl", "reportlab")
+
+
+def parse_importtime(stderr):
+    """
+    Parses -X importtime output into (module, self_us, cumulative_us) tuples.
+    Lines look like 'import time:       412 |       1032 |   app.db'.
+    Module names keep their leading indentation.
+    """
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # Header line
+        # Keep the indentation: nested imports are indented under their importer
+        modules.append((parts[2][1:].rstrip(), int(parts[0]), int(parts[1])))
+    return modules
+
+
+def import_report(statement, top):
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=ROOT,
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr.strip().splitlines()[-1])
+        return None
+    modules = parse_importtime(result.stderr)
+    # Top-level imports are the least indented entries
+    total_us = sum(cumulative for name, _, cumulative in modules if not name.startswith(" "))
+
+    print(f"Imports for {statement!r}: {len(modules)} modules, {total_us / 1000:.1f} ms total")
+    print(f"\n  {'slowest self time':<48}{'self (ms)':>10}{'cumul (ms)':>12}")
+    for name, self_us, cumulative in sorted(modules, key=lambda m: m[1], reverse=True)[:top]:
+        print(f"  {name.strip():<48}{self_us / 1000:>10.1f}{cumulative / 1000:>12.1f}")
+
+    loaded = {name.strip().split(".")[0] for name, _, _ in modules}
+    heavy = [package for package in HEAVY_PACKAGES if package in loaded]
+    print(f"\n  heavy packages imported at startup: {', '.join(heavy) or 'none'}")
+    return {"modules": len(modules), "total_ms": total_us / 1000, "heavy": heavy}
+
+
+def probe(db_path, open_sales):
+    """
+    Runs inside the child process: starts the app like main.py and prints the
+    milestones (ms since the probe started) as JSON on the last line.
+    """
+    started = time.perf_counter()
+    marks = {}
+
+    def mark(name):
+        marks.setdefault(name, (time.perf_counter() - started) * 1000)
+
+    from PySide6.QtWidgets import QApplication
+    from PySide6.QtCore import QObject, QEvent, QTimer
+    from app.db import init_db, set_db_path, close_all_connections
+    from app.ui.main_window import MainWindow
+    mark("imports")
+
+    set_db_path(db_path)
+    init_db()
+    app = QApplication([])
+    window = MainWindow()
+    mark("window_built")
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                if "first_paint" not in marks:
+                    mark("first_paint")
+                    QTimer.singleShot(0, after_first_paint)
+                elif "sales_requested" in marks and "sales_paint" not in marks:
+                    mark("sales_paint")
+                    QTimer.singleShot(0, app.quit)
+            return False
+
+    def after_first_paint():
+        mark("idle_after_paint")
+        if not open_sales:
+            app.quit()
+            return
+        mark("sales_requested")
+        window.tabs.setCurrentIndex(1)
+
+    watcher = PaintWatcher()
+    app.installEventFilter(watcher)
+    window.show()
+    QTimer.singleShot(30000, app.quit)  # Never hang the harness
+    app.exec()
+    close_all_connections()
+    print(json.dumps(marks))
+
+
+def paint_report(runs, db_path, open_sales):
+    env = dict(os.environ, PYTHONPATH=ROOT, INVENTOLEE_SLOW_LOG="")
+    if sys.platform.startswith("linux") and "DISPLAY" not in env and "WAYLAND_DISPLAY" not in env:
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+    samples = []
+    for _ in range(runs):
+        command = [sys.executable, "-m", "benchmarks.startup", "--probe", db_path]
+        if open_sales:
+            command.append("--open-sales")
+        spawned = time.perf_counter()
+        result = subprocess.run(command, cwd=ROOT, env=env, capture_output=True, text=True)
+        wall_ms = (time.perf_counter() - spawned) * 1000
+        if result.returncode != 0 or not result.stdout.strip():
+            print("  probe failed:", (result.stderr.strip().splitlines() or ["no output"])[-1])
+            return None
+        marks = json.loads(result.stdout.strip().splitlines()[-1])
+        marks["process_wall"] = wall_ms
+        samples.append(marks)
+
+    print(f"\nTime to first paint (median of {runs} cold starts, ms):")
+    summary = {}
+    for name in ("imports", "window_built", "first_paint", "idle_after_paint", "sales_paint", "process_wall"):
+        values = [sample[name] for sample in samples if name in sample]
+        if values:
+            summary[name] = statistics.median(values)
+            print(f"  {name:<20}{summary[name]:>10.1f}")
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="Modules listed in the import report")
+    parser.add_argument("--sales", type=int, default=10_000, help="Sales rows in the generated database")
+    parser.add_argument("--open-sales", action="store_true", help="Also time opening the Sales Book tab")
+    parser.add_argument("--json", help="Write the results to this file")
+    parser.add_argument("--probe", metavar="DB", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        probe(args.probe, args.open_sales)
+        return 0
+
+    results = {"imports": import_report("import main", args.top)}
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "startup.db")
+        from app import db
+        from benchmarks import datagen
+        datagen.generate(db_path, skus=max(args.sales // 50, 100), sales=args.sales)
+        db.close_all_connections()
+        results["paint"] = paint_report(args.runs, db_path, args.open_sales)
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Benchmark: statement preparation on the hot model paths with the sqlite3
+statement cache at its default size of 128 statements versus
+STATEMENT_CACHE_SIZE, and disabled for reference (every call prepares its
+statements again). Each path is timed alone, and then all of them
+interleaved, the way the app's threads issue them, where the cache must
+hold every path's statements at once to avoid preparing them again. All
+runs make the same calls. Works on a copy of the generated database.
+
+Usage:
+    python -m benchmarks.statement_cache [--sales 100000] [--cache-dir DIR] [--budget 1.0]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from app import db
+from app.models.inventory import get_item_by_id, get_items_by_ids, search_items
+from app.models.sales import (add_sale, add_sales_batch, get_sales_by_ids,
+                              get_sales_totals, get_summary)
+from benchmarks.suite import END_DATE, SEED, cached_database, measure
+
+SQLITE_DEFAULT = 128  # sqlite3.connect()'s cached_statements
+
+
+def set_cache_size(size):
+    """Reopen every connection with a statement cache of `size` statements."""
+    db.STATEMENT_CACHE_SIZE = size
+    db.close_all_connections()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=100_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds spent timing each case")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(tmp, "statements.db")
+        shutil.copy(cached_database(cache_dir, args.sales), path)
+        db.set_db_path(path)
+
+        conn = db.get_connection()
+        item_ids = [row[0] for row in conn.execute("SELECT id FROM clothing_items")]
+        sale_ids = [row[0] for row in conn.execute("SELECT id FROM sales")]
+        conn.execute("UPDATE clothing_items SET quantity = 1000000000")
+        rng = random.Random(SEED)
+        today = date.today().isoformat()
+        month_ago = (END_DATE - timedelta(days=30)).isoformat()
+
+        def sale():
+            return {'date': today, 'item_id': rng.choice(item_ids), 'quantity': 1,
+                    'unit_price': 10.0, 'payment_method': 'Cash', 'expense_notes': ''}
+
+        cases = {
+            "add_sale": lambda: add_sale(sale()),
+            "add_sales_batch, 1-8 lines": lambda: add_sales_batch([sale() for _ in range(rng.randint(1, 8))]),
+            "get_item_by_id": lambda: get_item_by_id(rng.choice(item_ids)),
+            "get_items_by_ids, 1-20 IDs": lambda: get_items_by_ids(rng.sample(item_ids, rng.randint(1, 20))),
+            "get_sales_by_ids, 1-20 IDs": lambda: get_sales_by_ids(rng.sample(sale_ids, rng.randint(1, 20))),
+            "get_sales_totals, 30 days": lambda: get_sales_totals(month_ago, END_DATE.isoformat()),
+            "get_summary, 30 days": lambda: get_summary(rng.choice(("daily", "weekly", "monthly")),
+                                                       month_ago, END_DATE.isoformat()),
+            "search_items": lambda: search_items(rng.choice(("blu jea", "shirt", "red dress", "wool"))),
+        }
+        paths = list(cases.values())
+        cases["all of the above, interleaved"] = lambda: rng.choice(paths)()
+        sizes = (0, SQLITE_DEFAULT, db.STATEMENT_CACHE_SIZE)
+        timings = {}
+        for size in sizes:
+            set_cache_size(size)
+            for name, case in cases.items():
+                rng.seed(SEED)  # The same calls at every cache size
+                timings[name, size] = measure(case, args.budget)["median_ms"] * 1000
+
+        print(f"{'per call (us)':<32}" + "".join(f"{f'cache {size}':>12}" for size in sizes)
+              + f"{f'{sizes[2]} vs {sizes[1]}':>14}")
+        for name in cases:
+            row = [timings[name, size] for size in sizes]
+            print(f"{name:<32}" + "".join(f"{t:>12.1f}" for t in row) + f"{row[2] - row[1]:>+14.1f}")
+
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Benchmark: stock on hand as of a date from the month-end snapshots plus a
+short ledger scan, versus replaying the whole ledger up to that date.
+
+The generated database's sales are written to the ledger as 'out' entries
+(as add_sale() would have), then the month-end snapshots are taken with
+refresh_stock_snapshots(). Both ways of answering are timed for every item at
+once and for a single item, at dates spread over the history, and checked to
+agree. Works on a copy of the generated database.
+
+Usage:
+    python -m benchmarks.stock_as_of [--sales 1000000] [--cache-dir DIR] [--budget 1.0]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import timedelta
+
+from app import db
+from app.models.stock import (SIGNED_QUANTITY, get_item_stock_as_of, get_stock_as_of,
+                              refresh_stock_snapshots)
+from benchmarks.suite import END_DATE, YEARS, cached_database, measure
+
+
+def replay_all(as_of):
+    """Every item's balance summed from the first ledger entry."""
+    return db.get_connection().execute(f"""
+        SELECT clothing_item_id, SUM({SIGNED_QUANTITY}) FROM transactions
+        WHERE transaction_date < date(?, '+1 day')
+        GROUP BY clothing_item_id
+        HAVING SUM({SIGNED_QUANTITY}) <> 0
+        ORDER BY clothing_item_id
+    """, (as_of,)).fetchall()
+
+
+def replay_item(item_id, as_of):
+    return db.get_connection().execute(f"""
+        SELECT IFNULL(SUM({SIGNED_QUANTITY}), 0) FROM transactions
+        WHERE clothing_item_id = ? AND transaction_date < date(?, '+1 day')
+    """, (item_id, as_of)).fetchone()[0]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--budget", type=float, default=1.0, help="Seconds spent timing each query")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(tmp, "stock.db")
+        shutil.copy(cached_database(cache_dir, args.sales), path)
+        db.set_db_path(path)
+        db.migrate()
+
+        started = time.perf_counter()
+        with db.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
+                SELECT item_id, 'out', quantity, date, 'Sale #' || id FROM sales ORDER BY date, id
+            """)
+            entries = cursor.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        print(f"{entries} ledger entries written in {time.perf_counter() - started:.1f}s")
+        started = time.perf_counter()
+        taken = refresh_stock_snapshots(END_DATE + timedelta(days=1))
+        print(f"{len(taken)} month-end snapshots taken in {time.perf_counter() - started:.1f}s")
+        # The best-selling item has the longest ledger
+        item_id = db.get_connection().execute(
+            "SELECT item_id FROM sales GROUP BY item_id ORDER BY COUNT(*) DESC LIMIT 1").fetchone()[0]
+
+        days = [END_DATE - timedelta(days=offset) for offset in (365 * YEARS - 20, 365 * YEARS // 2 + 15, 10, 0)]
+        print(f"{'as of':<12}{'all: replay (ms)':>18}{'all: snapshot (ms)':>20}"
+              f"{'item: replay (ms)':>19}{'item: snapshot (ms)':>21}")
+        for day in (d.isoformat() for d in days):
+            assert get_stock_as_of(day) == replay_all(day)
+            assert get_item_stock_as_of(item_id, day) == replay_item(item_id, day)
+            timings = [measure(fn, args.budget)["median_ms"] for fn in (
+                lambda: replay_all(day), lambda: get_stock_as_of(day),
+                lambda: replay_item(item_id, day), lambda: get_item_stock_as_of(item_id, day))]
+            print(f"{day:<12}{timings[0]:>18.2f}{timings[1]:>20.2f}{timings[2]:>19.3f}{timings[3]:>21.3f}")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: reconciling every SKU's quantity against the stock ledger and the
+sales table with reconcile_stock() (one set-based query) versus checking the
+items one by one, and valuing the stock with get_stock_value_totals().
+
+The generated database's sales are written to the ledger (as add_sale()
+would have) and the quantities brought in line with it; then --drift items
+are knocked out of line in known ways, which both methods must find.
+
+Usage:
+    python -m benchmarks.stock_reconcile [--skus 100000] [--sales 1000000] [--drift 50]
+                                         [--cache-dir DIR]
+"""
+import argparse
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from app import db
+from app.models.sales import _update_rollup
+from app.models.stock import SIGNED_QUANTITY, refresh_stock_snapshots
+from app.models.valuation import get_stock_value_totals, get_stock_valuation, reconcile_stock
+from benchmarks import datagen
+from benchmarks.suite import END_DATE, SEED, YEARS
+
+
+def generated_database(cache_dir, skus, sales):
+    path = os.path.join(cache_dir, f"reconcile-{skus}-{sales}-{SEED}.db")
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        datagen.generate(path + ".part", skus=skus, sales=sales, years=YEARS, seed=SEED, end=END_DATE)
+        db.close_all_connections()
+        os.replace(path + ".part", path)
+        print(f"  generated {sales} sales / {skus} items in {time.perf_counter() - started:.1f}s")
+    return path
+
+
+def reconcile_per_item():
+    """The loop reconcile_stock() replaces: a few indexed queries per item."""
+    conn = db.get_connection()
+    problems = []
+    for item_id, name, quantity in conn.execute("SELECT id, name, IFNULL(quantity, 0) FROM clothing_items"):
+        balance, ledger_sold, since = conn.execute(f"""
+            SELECT IFNULL(SUM({SIGNED_QUANTITY}), 0),
+                   IFNULL(SUM(CASE WHEN reason LIKE 'Sale #%' THEN -({SIGNED_QUANTITY}) ELSE 0 END), 0),
+                   substr(MIN(transaction_date), 1, 10)
+            FROM transactions WHERE clothing_item_id = ?
+        """, (item_id,)).fetchone()
+        sales_sold = conn.execute("SELECT IFNULL(SUM(quantity), 0) FROM sales WHERE item_id = ? AND date >= ?",
+                                  (item_id, since)).fetchone()[0] if since else 0
+        if quantity != balance or ledger_sold != sales_sold:
+            problems.append((item_id, name, quantity, balance, ledger_sold, sales_sold))
+    return problems
+
+
+def timed(fn):
+    started = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - started
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--drift", type=int, default=50, help="Items knocked out of line")
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(tmp, "reconcile.db")
+        shutil.copy(generated_database(cache_dir, args.skus, args.sales), path)
+        db.set_db_path(path)
+        db.migrate()
+
+        with db.transaction() as cursor:
+            cursor.execute("""
+                INSERT INTO transactions (clothing_item_id, transaction_type, quantity, transaction_date, reason)
+                SELECT item_id, 'out', quantity, date, 'Sale #' || id FROM sales ORDER BY date, id
+            """)
+            cursor.execute(f"""
+                UPDATE clothing_items SET quantity = (
+                    SELECT SUM({SIGNED_QUANTITY}) FROM transactions WHERE clothing_item_id = clothing_items.id)
+            """)
+        refresh_stock_snapshots(END_DATE)
+
+        # Known drift: quantities edited around the models, and sales deleted
+        # without restoring their stock
+        rng = random.Random(SEED)
+        sold = [row[0] for row in db.get_connection().execute("SELECT DISTINCT item_id FROM sales")]
+        drifted = rng.sample(sold, args.drift)
+        with db.transaction() as cursor:
+            cursor.executemany("UPDATE clothing_items SET quantity = quantity + 1 WHERE id = ?",
+                               [(item_id,) for item_id in drifted[:args.drift // 2]])
+            deleted = [cursor.execute("""
+                SELECT id, date, item_id, total_amount, profit, quantity FROM sales
+                WHERE item_id = ? ORDER BY id DESC LIMIT 1
+            """, (item_id,)).fetchone() for item_id in drifted[args.drift // 2:]]
+            cursor.executemany("DELETE FROM sales WHERE id = ?", [(sale[0],) for sale in deleted])
+            _update_rollup(cursor, [sale[1:] for sale in deleted], sign=-1)
+
+        problems, set_based = timed(reconcile_stock)
+        looped, per_item = timed(reconcile_per_item)
+        found = sorted(p[0] for p in problems)
+        assert found == sorted(p[0] for p in looped), "the two methods disagree"
+        missed = set(drifted) - set(found)
+        print(f"{args.skus} items, {args.sales} sales: {len(problems)} discrepancies found, "
+              f"{len(missed)} of {args.drift} injected missed")
+        print(f"reconcile_stock() (set-based): {set_based:.2f}s")
+        print(f"per-item queries:              {per_item:.2f}s")
+
+        for as_of in (None, END_DATE.isoformat(), "2024-06-30"):
+            totals, seconds = timed(lambda: get_stock_value_totals(as_of))
+            _, listed = timed(lambda: get_stock_valuation(as_of))
+            print(f"stock value as of {as_of or 'now'}: {totals[2]:,.2f} ({totals[1]} units) "
+                  f"totals {seconds * 1000:.0f} ms, per-item list {listed * 1000:.0f} ms")
+        db.close_all_connections()
+
+
+if __name__ == "__main__":
+    main()
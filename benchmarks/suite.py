@@ -0,0 +1,229 @@
+"""
+Benchmark suite for the models layer at several data scales.
+
+For each scale a synthetic database is generated with benchmarks.datagen
+(same seed every run), then the model functions the UI relies on are timed:
+get_all_items, get_all_sales over a wide and a narrow range, get_summary
+daily/weekly/monthly, get_period_summary, add_sale and add_item_to_db. Results are written as
+JSON, and a previous results file can be given to flag regressions.
+
+Generated databases can be kept with --cache-dir; each run works on a fresh
+copy, so writes from one run never leak into the next.
+
+Usage:
+    python -m benchmarks.suite [--scales 1k,100k,1m] [--output results.json]
+                               [--compare baseline.json] [--threshold 1.25]
+                               [--cache-dir DIR] [--budget 2.0]
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from app import db
+from app.models.inventory import add_item_to_db, get_all_items
+from app.models.analytics import get_period_summary
+from app.models.sales import add_sale, get_all_sales, get_summary
+from benchmarks import datagen
+
+# Scale name -> number of sales rows; the catalogue grows with it
+SCALES = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+YEARS = 3
+SEED = 42
+# Fixed end date so every run benchmarks exactly the same rows
+END_DATE = date(2025, 12, 31)
+
+
+def skus_for(rows):
+    return min(max(rows // 50, 100), 20_000)
+
+
+def cached_database(cache_dir, rows):
+    """
+    Returns the path of a generated database for `rows` sales in cache_dir,
+    generating it first if it is not there yet.
+    """
+    skus = skus_for(rows)
+    path = os.path.join(cache_dir, f"bench-{rows}-{skus}-{YEARS}-{SEED}.db")
+    if not os.path.exists(path):
+        started = time.perf_counter()
+        partial = path + ".part"
+        if os.path.exists(partial):
+            os.remove(partial)
+        datagen.generate(partial, skus=skus, sales=rows, years=YEARS, seed=SEED, end=END_DATE)
+        # Closing the last connection checkpoints and removes the WAL
+        db.close_all_connections()
+        os.replace(partial, path)
+        print(f"  generated {rows} sales / {skus} items in {time.perf_counter() - started:.1f}s")
+    else:
+        # Databases cached before later schema migrations get them here
+        db.set_db_path(path)
+        db.migrate()
+        db.close_all_connections()
+    return path
+
+
+def measure(fn, budget, min_runs=3, max_runs=1000):
+    """
+    Calls fn() after one warm-up call until `budget` seconds have passed
+    (at least min_runs, at most max_runs times) and summarises the timings.
+    """
+    result = fn()
+    timings = []
+    deadline = time.perf_counter() + budget
+    while len(timings) < min_runs or (len(timings) < max_runs and time.perf_counter() < deadline):
+        started = time.perf_counter()
+        result = fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        "runs": len(timings),
+        "min_ms": round(timings[0], 4),
+        "median_ms": round(statistics.median(timings), 4),
+        "mean_ms": round(statistics.fmean(timings), 4),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 4),
+        "rows": len(result) if isinstance(result, list) else None,
+    }
+
+
+def benchmark_cases():
+    """Returns (name, zero-argument callable) pairs to time against the current database."""
+    start = (END_DATE - timedelta(days=365 * YEARS - 1)).isoformat()
+    end = END_DATE.isoformat()
+    week = (END_DATE - timedelta(days=6)).isoformat()
+    new_items = iter(range(1, sys.maxsize))
+
+    def sell():
+        return add_sale({'date': f"{end} 12:00:00", 'item_id': 1, 'quantity': 1, 'unit_price': 25.0,
+                         'payment_method': 'Cash', 'profit': None, 'expense_notes': ''})
+
+    def add_new_item():
+        n = next(new_items)
+        return add_item_to_db({'name': 'Benchmark item', 'category': 'Tops', 'size': 'M',
+                               'description': f"Benchmark #{n}", 'quantity': 10, 'price': 12.5,
+                               'supplier': 'Supplier A', 'entry_date': end, 'notes': ''})
+
+    return [
+        ("get_all_items", get_all_items),
+        ("get_all_sales wide", lambda: get_all_sales(start, end)),
+        ("get_all_sales narrow", lambda: get_all_sales(week, end)),
+        ("get_summary daily", lambda: get_summary("daily", start, end)),
+        ("get_summary weekly", lambda: get_summary("weekly", start, end)),
+        ("get_summary monthly", lambda: get_summary("monthly", start, end)),
+        ("get_period_summary daily", lambda: get_period_summary("daily", start, end)),
+        ("get_period_summary monthly", lambda: get_period_summary("monthly", start, end)),
+        ("add_sale", sell),
+        ("add_item_to_db", add_new_item),
+    ]
+
+
+def run_scale(name, rows, workdir, cache_dir, budget):
+    source = cached_database(cache_dir, rows)
+    path = os.path.join(workdir, f"run-{name}.db")
+    shutil.copyfile(source, path)
+    db.set_db_path(path)
+    results = {}
+    for case, fn in benchmark_cases():
+        results[case] = measure(fn, budget)
+        print(f"  {case:<28}{results[case]['median_ms']:>12.3f} ms median"
+              f"{results[case]['p95_ms']:>12.3f} ms p95  ({results[case]['runs']} runs)")
+    db.close_all_connections()
+    os.remove(path)
+    return {"sales_rows": rows, "skus": skus_for(rows), "cases": results}
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the median ratio against a baseline results file per case and
+    returns the number of cases slower than `threshold` times the baseline.
+    """
+    regressions = 0
+    print(f"\nComparison with {baseline['meta'].get('revision') or 'baseline'} "
+          f"({baseline['meta'].get('timestamp')}):")
+    for scale, current in results.items():
+        before = baseline["scales"].get(scale)
+        if before is None:
+            continue
+        for case, stats in current["cases"].items():
+            old = before["cases"].get(case)
+            if old is None or not old["median_ms"]:
+                continue
+            ratio = stats["median_ms"] / old["median_ms"]
+            flag = "REGRESSION" if ratio > threshold else ""
+            regressions += ratio > threshold
+            print(f"  {scale:<6}{case:<28}{old['median_ms']:>12.3f} -> {stats['median_ms']:>10.3f} ms"
+                  f"{ratio:>8.2f}x {flag}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scales", default="1k,100k",
+                        help=f"Comma separated subset of {', '.join(SCALES)} (default: %(default)s)")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    parser.add_argument("--threshold", type=float, default=1.25,
+                        help="Slowdown ratio reported as a regression (default: %(default)s)")
+    parser.add_argument("--cache-dir", help="Keep generated databases here between runs")
+    parser.add_argument("--budget", type=float, default=2.0,
+                        help="Seconds spent timing each case (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    scales = [scale.strip().lower() for scale in args.scales.split(",")]
+    unknown = [scale for scale in scales if scale not in SCALES]
+    if unknown:
+        parser.error(f"Unknown scale(s): {', '.join(unknown)}")
+
+    output = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "profile": dict(db.PERFORMANCE_PROFILE),
+            "seed": SEED,
+            "budget_s": args.budget,
+        },
+        "scales": {},
+    }
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        for scale in scales:
+            print(f"[{scale}]")
+            output["scales"][scale] = run_scale(scale, SCALES[scale], tmp, cache_dir, args.budget)
+
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(output["scales"], baseline, args.threshold)
+        if regressions:
+            print(f"{regressions} case(s) slower than {args.threshold}x the baseline")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,127 @@
+"""
+Benchmark: cost of refreshing the inventory and sales tables after one
+change, with a full reload versus patching the changed row.
+
+Before change events the views reloaded their model after every edit or
+sale: the loaded rows were discarded, the first page read again, and a user
+who had scrolled had to page everything back in. refresh_rows() re-reads
+only the changed row and updates or inserts it in place. Both are timed with
+more and more rows loaded (as after scrolling) to show that the patch does
+not depend on the table size.
+
+Runs Qt with the offscreen platform when there is no display; works on a
+copy of the generated database.
+
+Usage:
+    python -m benchmarks.table_refresh [--sales 1000000] [--loaded 200,2000,20000]
+                                       [--cache-dir DIR] [--repeat 20]
+"""
+import argparse
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+if sys.platform.startswith("linux") and "DISPLAY" not in os.environ:
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication, QTableView
+
+from app import db
+from app.models.inventory import get_item_by_id, update_item_in_db
+from app.models.sales import add_sale
+from app.ui.table_models import InventoryTableModel, SalesTableModel
+from benchmarks.suite import END_DATE, cached_database
+
+COLORS = {'profit': '#508569', 'loss': '#B95C50'}
+ITEM_FIELDS = ["id", "name", "category", "size", "description", "quantity", "price",
+               "supplier", "entry_date", "notes"]
+
+
+def load(model, rows):
+    """Reload the model and page in `rows` rows, as a user scrolling down would."""
+    model.reload()
+    while model.rowCount() < rows and model.canFetchMore():
+        model.fetchMore()
+
+
+def median_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sales", type=int, default=1_000_000)
+    parser.add_argument("--loaded", default="200,2000,20000", help="Comma separated numbers of loaded rows")
+    parser.add_argument("--cache-dir", help="Keep the generated database here between runs")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_dir = args.cache_dir or tmp
+        os.makedirs(cache_dir, exist_ok=True)
+        path = os.path.join(tmp, "refresh.db")
+        shutil.copy(cached_database(cache_dir, args.sales), path)
+        db.set_db_path(path)
+
+        # Synchronous models (no executor) so the timings cover the whole refresh
+        inventory = InventoryTableModel()
+        sales = SalesTableModel(COLORS)
+        sales.start_date, sales.end_date = "2000-01-01", END_DATE.isoformat()
+        views = []
+        for model in (inventory, sales):
+            view = QTableView()
+            view.setModel(model)
+            views.append(view)
+
+        item = dict(zip(ITEM_FIELDS, get_item_by_id(1)))
+
+        def edit_item():
+            item["price"] += 0.01
+            update_item_in_db(1, item)
+            return 1
+
+        def record_sale():
+            # Newest sale: inserted at the top of the log
+            return add_sale({'date': END_DATE.isoformat(), 'item_id': 1, 'quantity': 0, 'unit_price': 1.0,
+                             'payment_method': 'Cash', 'profit': None, 'expense_notes': ''})
+
+        print(f"{'change':<14}{'loaded rows':>12}{'reload (ms)':>13}{'reload + rescroll (ms)':>24}"
+              f"{'patch (ms)':>12}")
+        for label, model, change in (("edit item", inventory, edit_item), ("record sale", sales, record_sale)):
+            for rows in (int(n) for n in args.loaded.split(",")):
+                load(model, rows)
+                loaded = model.rowCount()
+
+                def patch():
+                    model.refresh_rows([change()])
+
+                def full_reload():
+                    change()
+                    model.reload()
+
+                def reload_and_rescroll():
+                    change()
+                    load(model, loaded)
+
+                write = median_ms(change, args.repeat)
+                patched = median_ms(patch, args.repeat) - write
+                assert model.rowCount() >= loaded
+                reloaded = median_ms(full_reload, args.repeat) - write
+                rescrolled = median_ms(reload_and_rescroll, args.repeat) - write
+                print(f"{label:<14}{loaded:>12}{reloaded:>13.2f}{rescrolled:>24.2f}{patched:>12.3f}")
+        print("model stats:", inventory.stats, sales.stats)
+        db.close_all_connections()
+    del app
+
+
+if __name__ == "__main__":
+    main()
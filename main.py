@@ -1,11 +1,14 @@
 import sys
 from PySide6.QtWidgets import QApplication
 from app.ui.main_window import MainWindow
-from app.db import init_db
+from app.db import init_db, start_checkpoint_scheduler, stop_checkpoint_scheduler, close_all_connections
 
 if __name__ == "__main__":
     init_db()  # Ensure database is initialized
+    start_checkpoint_scheduler()  # Checkpoint the WAL while the app is idle
     app = QApplication(sys.argv)
+    app.aboutToQuit.connect(stop_checkpoint_scheduler)
+    app.aboutToQuit.connect(close_all_connections)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -0,0 +1,53 @@
+"""
+The item catalogue is patched after each commit. A load reading the
+committed row before the patch runs must not see the stock movement twice.
+"""
+import pytest
+
+from app import db
+from app.models import inventory, sales
+from app.models.catalogue import catalogue
+
+ITEM = {'name': 'Coat', 'category': 'Outerwear', 'size': 'M', 'description': 'wool',
+        'quantity': 10, 'price': 3.0, 'supplier': 'S', 'entry_date': '2025-01-01', 'notes': ''}
+
+
+@pytest.fixture
+def item_id(tmp_path):
+    db.set_db_path(str(tmp_path / "catalogue.db"))
+    db.init_db()
+    inventory.add_item_to_db(dict(ITEM))
+    yield inventory.search_items("coat")[0][0]
+    db.close_all_connections()
+
+
+@pytest.fixture
+def racing_load(monkeypatch):
+    """Reload the catalogue from the committed data before each patch runs."""
+    def after_commit(fn):
+        def reload_then_patch():
+            catalogue.clear()
+            catalogue.all_items()
+            fn()
+        db.after_commit(reload_then_patch)
+    for module in (sales, inventory):
+        monkeypatch.setattr(module, "after_commit", after_commit)
+
+
+def stored_quantity(item_id):
+    return inventory.get_item_by_id(item_id)[5]
+
+
+def test_patches_survive_a_racing_load(item_id, racing_load):
+    catalogue.all_items()
+    sale = {'date': '2025-02-01', 'item_id': item_id, 'quantity': 2, 'unit_price': 9.0,
+            'payment_method': 'Cash', 'profit': None, 'expense_notes': ''}
+
+    sales.add_sale(dict(sale))
+    assert catalogue.get(item_id).quantity == stored_quantity(item_id) == 8
+    sales.add_sales_batch([dict(sale, quantity=1), dict(sale, quantity=3)])
+    assert catalogue.get(item_id).quantity == stored_quantity(item_id) == 4
+    inventory.add_item_to_db(dict(ITEM, quantity=5))
+    assert catalogue.get(item_id).quantity == stored_quantity(item_id) == 9
+    sales.delete_last_sale()
+    assert catalogue.get(item_id).quantity == stored_quantity(item_id) == 12
@@ -0,0 +1,41 @@
+"""
+The slow-query log must not keep the bound values (customer and price data)
+unless asked to.
+"""
+import logging
+
+import pytest
+
+from app import db, instrumentation
+from app.models import inventory
+
+ITEM = {'name': 'Coat', 'category': 'Outerwear', 'size': 'M', 'description': 'Mrs Smith special order',
+        'quantity': 10, 'price': 123.45, 'supplier': 'S', 'entry_date': '2025-01-01', 'notes': ''}
+
+
+@pytest.fixture
+def slow_log(tmp_path, monkeypatch, caplog):
+    """Log every call as slow, captured in memory instead of the log file."""
+    db.set_db_path(str(tmp_path / "instrumentation.db"))
+    db.init_db()
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_LOG", "")
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_THRESHOLD_MS", 0.0)
+    with caplog.at_level(logging.INFO, logger=instrumentation.slow_query_logger.name):
+        yield caplog
+    db.close_all_connections()
+
+
+def test_slow_log_leaves_out_bound_values(slow_log):
+    inventory.add_item_to_db(dict(ITEM))
+
+    logged = "\n".join(record.getMessage() for record in slow_log.records)
+    assert "inventory.add_item_to_db" in logged
+    assert "WHERE name=? AND description=? AND size=?" in logged
+    assert "Mrs Smith" not in logged and "123.45" not in logged
+
+
+def test_slow_log_values_on_request(slow_log, monkeypatch):
+    monkeypatch.setattr(instrumentation, "SLOW_LOG_VALUES", True)
+    inventory.add_item_to_db(dict(ITEM))
+
+    assert "Mrs Smith" in "\n".join(record.getMessage() for record in slow_log.records)
@@ -0,0 +1,58 @@
+"""
+The hot model queries must be answered from an index.
+
+Each model function runs against a migrated throwaway database while the SQL
+it issues is captured through app.instrumentation; every SELECT is fed to
+EXPLAIN QUERY PLAN, which must show the expected index and no full table scan.
+"""
+import pytest
+
+from app import db
+from app.instrumentation import capture_statements
+from app.models.inventory import add_item_to_db, get_item_by_id
+from app.models.sales import get_all_sales, get_summary
+
+ITEM = {'name': 'T-shirt', 'category': 'Clothing', 'size': 'M', 'description': 'Cotton tee',
+        'quantity': 5, 'price': 9.99, 'supplier': 'Supplier A', 'entry_date': '2025-01-01',
+        'notes': ''}
+
+# (model call, index the SELECTs it issues must use), by description
+HOT_QUERIES = {
+    "get_all_sales by date range": (lambda: get_all_sales("2025-01-01", "2025-01-31"), "idx_sales_date"),
+    "get_all_sales unfiltered": (lambda: get_all_sales(), "idx_sales_date"),
+    "get_summary daily": (lambda: get_summary("daily", "2025-01-01", "2025-01-31"), "PRIMARY KEY"),
+    "get_summary monthly": (lambda: get_summary("monthly", "2024-01-01", "2025-12-31"), "PRIMARY KEY"),
+    "get_item_by_id": (lambda: get_item_by_id(1), "INTEGER PRIMARY KEY"),
+    "add_item_to_db identity lookup": (lambda: add_item_to_db(dict(ITEM)), "ux_clothing_items_identity"),
+}
+
+
+@pytest.fixture
+def database(tmp_path):
+    db.set_db_path(str(tmp_path / "plans.db"))
+    db.init_db()
+    db.seed_data()
+    yield
+    db.close_all_connections()
+
+
+def query_plan(sql):
+    """Returns the EXPLAIN QUERY PLAN detail lines for sql."""
+    rows = db.get_connection().execute("EXPLAIN QUERY PLAN " + sql).fetchall()
+    return [row[3] for row in rows]
+
+
+@pytest.mark.parametrize("name", HOT_QUERIES)
+def test_hot_query_uses_index(database, name):
+    call, index = HOT_QUERIES[name]
+    with capture_statements() as statements:
+        call()
+    # The archive registry lookup reads a table of a few rows
+    selects = [sql for sql in statements if sql.lstrip().upper().startswith("SELECT")
+               and "sales_archives" not in sql]
+    assert selects, f"{name} issued no SELECT"
+    for sql in selects:
+        plan = query_plan(sql)
+        full_scans = [line for line in plan if line.startswith("SCAN") and "INDEX" not in line]
+        assert any(index in line for line in plan), f"{index} not used:\n" + "\n".join(plan)
+        assert not full_scans, "full table scan:\n" + "\n".join(plan)
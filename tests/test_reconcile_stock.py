@@ -0,0 +1,36 @@
+"""
+reconcile_stock() must stay empty through the model functions that change
+sales without touching stock.
+"""
+import pytest
+
+from app import db
+from app.models import inventory, sales, stock
+from app.models.valuation import reconcile_stock
+
+ITEM = {'name': 'Coat', 'category': 'Outerwear', 'size': 'M', 'description': 'wool',
+        'quantity': 20, 'price': 3.0, 'supplier': 'S', 'entry_date': '2025-01-01', 'notes': ''}
+
+
+@pytest.fixture
+def item_id(tmp_path):
+    db.set_db_path(str(tmp_path / "reconcile.db"))
+    db.init_db()
+    inventory.add_item_to_db(dict(ITEM))
+    yield inventory.search_items("coat")[0][0]
+    db.close_all_connections()
+
+
+def test_reconciles_after_delete_all_sales(item_id):
+    for day, quantity in (("2025-02-01", 2), ("2025-03-01 12:00:00", 3), ("2025-04-01", 1)):
+        sales.add_sale({'date': day, 'item_id': item_id, 'quantity': quantity, 'unit_price': 9.0,
+                        'payment_method': 'Cash', 'profit': None, 'expense_notes': ''})
+    sales.delete_last_sale()
+    assert reconcile_stock() == []
+
+    sales.delete_all_sales()
+
+    assert reconcile_stock() == []
+    # The stock stays sold
+    assert inventory.get_item_by_id(item_id)[5] == 15
+    assert stock.get_item_stock_as_of(item_id, "2025-03-31") == 15
@@ -0,0 +1,45 @@
+"""
+The sales log (get_all_sales, get_sales_totals) reads timestamped rows from
+the sales table, the summary (get_summary) the daily rollup: for the same
+date range both must cover the same days, both ends included.
+"""
+import pytest
+
+from app import db
+from app.models import inventory, sales
+
+ITEM = {'name': 'Coat', 'category': 'Outerwear', 'size': 'M', 'description': 'wool',
+        'quantity': 100, 'price': 50.0, 'supplier': 'S', 'entry_date': '2026-01-01', 'notes': ''}
+# Sales just inside and just outside 2026-03-10 .. 2026-03-12
+SALES = ["2026-03-09 23:59:59", "2026-03-10", "2026-03-10 00:00:01", "2026-03-12",
+         "2026-03-12 18:30:00", "2026-03-12 23:59:59", "2026-03-13", "2026-03-13 00:00:01"]
+
+
+@pytest.fixture
+def database(tmp_path):
+    db.set_db_path(str(tmp_path / "sales.db"))
+    db.init_db()
+    inventory.add_item_to_db(dict(ITEM))
+    item_id = inventory.search_items("coat")[0][0]
+    for day in SALES:
+        sales.add_sale({'date': day, 'item_id': item_id, 'quantity': 1, 'unit_price': 80.0,
+                        'payment_method': 'Cash', 'profit': None, 'expense_notes': ''})
+    yield
+    db.close_all_connections()
+
+
+@pytest.mark.parametrize("start_date, end_date, expected", [
+    ("2026-03-10", "2026-03-12", 5),
+    ("2026-03-12", "2026-03-12", 3),
+    ("2026-03-10", None, 7),
+    (None, "2026-03-12", 6),
+])
+def test_summary_and_sales_log_agree_on_boundary_days(database, start_date, end_date, expected):
+    logged = sales.get_all_sales(start_date, end_date)
+    count, revenue, profit = sales.get_sales_totals(start_date, end_date)
+    summary = sales.get_summary("daily", start_date, end_date)
+
+    assert len(logged) == count == expected
+    assert sum(row[1] for row in summary) == pytest.approx(revenue) == expected * 80.0
+    assert sum(row[2] for row in summary) == pytest.approx(profit)
+    assert {row[0] for row in summary} == {row[1][:10] for row in logged}
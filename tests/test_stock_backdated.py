@@ -0,0 +1,52 @@
+"""
+A sale dated before the stock it was taken from came in (before the item's
+opening stock or a restock) must not leave negative stock in the ledger's
+history: stock as of a date, the valuation and the reconciliation all follow.
+"""
+import pytest
+
+from app import db
+from app.models import inventory, sales, stock
+from app.models.valuation import get_stock_value_totals, reconcile_stock
+
+ITEM = {'name': 'Coat', 'category': 'Outerwear', 'size': 'M', 'description': 'wool',
+        'quantity': 5, 'price': 3.0, 'supplier': 'S', 'entry_date': '2025-01-01', 'notes': ''}
+
+
+@pytest.fixture
+def item_id(tmp_path):
+    db.set_db_path(str(tmp_path / "stock.db"))
+    db.init_db()
+    inventory.add_item_to_db(dict(ITEM))
+    yield inventory.search_items("coat")[0][0]
+    db.close_all_connections()
+
+
+def sell(item_id, day, quantity):
+    sales.add_sale({'date': day, 'item_id': item_id, 'quantity': quantity, 'unit_price': 9.0,
+                    'payment_method': 'Cash', 'profit': None, 'expense_notes': ''})
+
+
+def test_sale_before_opening_stock(item_id):
+    sell(item_id, "2024-06-01 10:00:00", 2)
+
+    assert stock.get_stock_as_of("2024-05-31") == []
+    assert stock.get_stock_as_of("2024-06-01") == [(item_id, 3)]
+    assert stock.get_item_stock_as_of(item_id, "2025-01-01") == 3
+    assert get_stock_value_totals("2023-06-01") == (0, 0, 0)
+    assert get_stock_value_totals("2024-06-01") == (1, 3, 9.0)
+    assert reconcile_stock() == []
+
+
+def test_sale_backdated_into_a_restock(item_id):
+    stock.refresh_stock_snapshots()
+    inventory.add_item_to_db(dict(ITEM, quantity=10))  # Restocked today
+    # More than the opening stock: part of it came from the restock
+    sell(item_id, "2025-03-01", 12)
+
+    assert stock.get_item_stock_as_of(item_id, "2025-02-28") == 5
+    assert stock.get_item_stock_as_of(item_id, "2025-03-01") == 3
+    assert all(quantity >= 0 for _, quantity in stock.get_stock_as_of("2025-03-31"))
+    assert stock.get_stock_as_of("2025-03-31") == [(item_id, 3)]
+    assert inventory.get_item_by_id(item_id)[5] == 3
+    assert reconcile_stock() == []